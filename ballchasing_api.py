@@ -1,22 +1,19 @@
 # ballchasing_api.py
-import requests
 import os
 from dotenv import load_dotenv
 
+from discord_bot.utils.group_cache import fetch_group_payload
+
 load_dotenv()
 
 class BallchasingAPI:
-    BASE_URL = "https://ballchasing.com/api"
+    BASE_URL = os.getenv("BALLCHASING_BASE_URL", "https://ballchasing.com/api")
     TOKEN = os.getenv("TOKEN")
     CURRENT_GROUP_ID = os.getenv("CURRENT_GROUP_ID")
 
     @classmethod
     def get_group_data(cls):
-        url = f"{cls.BASE_URL}/groups/{cls.CURRENT_GROUP_ID}"
-        headers = {"Authorization": cls.TOKEN}
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return fetch_group_payload(cls.CURRENT_GROUP_ID, cls.TOKEN, base_url=cls.BASE_URL)
 
     @classmethod
     def get_player_data(cls):
@@ -44,6 +44,9 @@ def load_config():
         return None
 
 # --- Database Connection ---
+# One engine for the whole dashboard process; pool settings come from the config's database section
+_engine = None
+
 def get_database_url():
     """Gets the database URL from environment variables."""
     db_url = os.getenv('DATABASE_URL')
@@ -51,6 +54,26 @@ def get_database_url():
         db_url = db_url.replace('postgres://', 'postgresql://', 1)
     return db_url
 
+def get_engine(config, db_url):
+    """The dashboard's shared engine, created on first use"""
+    global _engine
+    if _engine is None:
+        pool = (config or {}).get('database', {})
+        _engine = create_engine(
+            db_url,
+            pool_size=int(pool.get('pool_size', 2)),
+            max_overflow=int(pool.get('max_overflow', 0)),
+            pool_recycle=int(pool.get('pool_recycle', 1800)),
+            pool_pre_ping=bool(pool.get('pool_pre_ping', True)),
+        )
+    return _engine
+
+def pool_status():
+    """Usage of the dashboard's connection pool, or None before the first query"""
+    if _engine is None:
+        return None
+    return _engine.pool.status()
+
 def get_data_from_db(config):
     """Fetches player statistics from the database using a JOIN."""
     db_url = get_database_url()
@@ -59,7 +82,7 @@ def get_data_from_db(config):
         return pd.DataFrame()
 
     try:
-        engine = create_engine(db_url)
+        engine = get_engine(config, db_url)
         stats_table = config['stats_table_name']
         player_mappings = config['player_mapping_table_name']
         columns = ", ".join([f"{col}" for col in config['columns']])
@@ -73,7 +96,7 @@ def get_data_from_db(config):
         ON s.player_id = p.ballchasing_player_id
         """
         df = pd.read_sql(query, engine)
-        print(f"Successfully fetched {len(df)} rows from the database.")
+        print(f"Successfully fetched {len(df)} rows from the database. Pool: {pool_status()}")
         
         # Ensure discord_username is string type and handle potential None values
         df['discord_username'] = df['discord_username'].astype(str)
@@ -0,0 +1,57 @@
+# tests/test_async_db.py
+import asyncio
+import threading
+import time
+import unittest
+from discord_bot.models.async_db import AsyncRepository, DBExecutor
+
+
+class Repository:
+    generation = 3
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def query(self, value, scale=1):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        return threading.get_ident(), value * scale
+
+
+class TestAsyncRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = DBExecutor(max_workers=2)
+        self.target = Repository()
+        self.repo = AsyncRepository(self.target, self.executor)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_calls_run_off_the_event_loop(self):
+        async def main():
+            return threading.get_ident(), await self.repo.query(4, scale=2)
+
+        loop_thread, (worker_thread, result) = asyncio.run(main())
+        self.assertEqual(result, 8)
+        self.assertNotEqual(worker_thread, loop_thread)
+        # Plain attributes aren't wrapped
+        self.assertEqual(self.repo.generation, 3)
+
+    def test_concurrency_is_bounded(self):
+        async def main():
+            return await asyncio.gather(*(self.repo.query(i) for i in range(6)))
+
+        results = asyncio.run(main())
+        self.assertEqual([value for _, value in results], list(range(6)))
+        self.assertEqual(self.target.peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+# tests/test_blcs_stats.py
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from sqlalchemy import event
+
+# The stats models import their siblings from the bot directory
+BOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "discord_bot"))
+if BOT_DIR not in sys.path:
+    sys.path.insert(0, BOT_DIR)
+
+from models import blcs_stats  # noqa: E402
+from models.blcs_stats import DatabaseManager  # noqa: E402
+
+
+def full_row(player_id, **stats):
+    row = {"player_id": player_id, "season_id": "BLCS4", "games_played": 10, "wins": 6, "losses": 4,
+           "avg_score": 400.0, "goals_per_game": 1.0, "saves_per_game": 2.0, "dominance_quotient": 50.0,
+           "percentile_rank": 50.0}
+    row.update(stats)
+    return row
+
+
+class StatsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(f"sqlite:///{os.path.join(self.tmp.name, 'stats.db')}")
+        self.assertTrue(self.db.use_db)
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def stored(self):
+        return {row["player_id"]: row for row in self.db.get_all_player_statistics()}
+
+
+class TestBulkUpsert(StatsTestCase):
+
+    def count_inserts(self):
+        inserts = []
+
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT"):
+                inserts.append(statement)
+        event.listen(self.db.engine, "before_cursor_execute", before_execute)
+        self.addCleanup(event.remove, self.db.engine, "before_cursor_execute", before_execute)
+        return inserts
+
+    def test_mixed_full_and_partial_rows(self):
+        self.db.bulk_upsert_player_statistics([full_row("steam:1"), full_row("steam:2")])
+        inserts = self.count_inserts()
+        written = self.db.bulk_upsert_player_statistics([
+            full_row("steam:3", avg_score=520.0),
+            {"player_id": "steam:1", "dominance_quotient": 71.5, "percentile_rank": 90.0},
+            full_row("steam:2", goals_per_game=1.4),
+            {"player_id": "steam:2", "dominance_quotient": 44.0, "percentile_rank": 10.0},
+        ])
+        self.assertEqual(written, 4)
+        # One statement per column set
+        self.assertEqual(len(inserts), 2)
+
+        stored = self.stored()
+        self.assertEqual(stored["steam:3"]["avg_score"], 520.0)
+        self.assertEqual((stored["steam:2"]["goals_per_game"], stored["steam:2"]["dominance_quotient"]), (1.4, 44.0))
+
+    def test_partial_rows_leave_other_columns_untouched(self):
+        self.db.bulk_upsert_player_statistics([full_row("steam:1", avg_score=455.5, shot_percentage=31.0)])
+        self.db.bulk_upsert_player_statistics([{"player_id": "steam:1", "dominance_quotient": 80.0,
+                                                "percentile_rank": 95.0}])
+        row = self.stored()["steam:1"]
+        self.assertEqual((row["dominance_quotient"], row["percentile_rank"]), (80.0, 95.0))
+        self.assertEqual((row["avg_score"], row["shot_percentage"], row["games_played"]), (455.5, 31.0, 10))
+
+    def test_chunks_stay_under_the_bind_limit(self):
+        rows = [{"player_id": f"steam:{i}", "dominance_quotient": float(i), "percentile_rank": float(i)}
+                for i in range(10)]
+        inserts = self.count_inserts()
+        # Three columns per row: at most four rows per statement
+        with mock.patch.object(blcs_stats, "MAX_BIND_PARAMS", 12):
+            self.assertEqual(self.db.bulk_upsert_player_statistics(rows), 10)
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(sorted(row["dominance_quotient"] for row in self.stored().values()),
+                         [float(i) for i in range(10)])
+
+    def test_empty_and_failed_writes(self):
+        self.assertEqual(self.db.bulk_upsert_player_statistics([]), 0)
+        # A failed transaction writes nothing and reports it
+        rows = [full_row("steam:1"), {"player_id": "steam:2", "no_such_column": 1}]
+        self.assertEqual(self.db.bulk_upsert_player_statistics(rows), 0)
+        self.assertEqual(self.stored(), {})
+
+
+class TestStatsCache(StatsTestCase):
+
+    def test_served_from_cache_until_a_write(self):
+        self.db.bulk_upsert_player_statistics([full_row("steam:1")])
+        writes = [
+            (lambda: self.db.update_player_statistics(full_row("steam:2")),
+             lambda stored: self.assertEqual(sorted(stored), ["steam:1", "steam:2"])),
+            (lambda: self.db.bulk_upsert_player_statistics([{"player_id": "steam:1", "dominance_quotient": 77.0}]),
+             lambda stored: self.assertEqual(stored["steam:1"]["dominance_quotient"], 77.0)),
+            (lambda: self.db.add_player_mapping(42, "someone", "steam:1", "steam"),
+             lambda stored: self.assertEqual(stored["steam:1"]["discord_username"], "someone")),
+            (lambda: self.db.clear_player_statistics(),
+             lambda stored: self.assertEqual(stored, {})),
+        ]
+        with mock.patch.object(self.db, "_query_all_player_statistics",
+                               wraps=self.db._query_all_player_statistics) as query:
+            self.stored()
+            self.stored()
+            self.assertEqual(query.call_count, 1)
+            for reads, (write, check) in enumerate(writes, start=2):
+                write()
+                check(self.stored())
+                self.stored()
+                self.assertEqual(query.call_count, reads)
+
+    def test_callers_get_copies(self):
+        self.db.bulk_upsert_player_statistics([full_row("steam:1")])
+        rows = self.db.get_all_player_statistics()
+        rows[0]["dominance_quotient"] = -1.0
+        rows.append(full_row("steam:2"))
+        self.assertEqual([row["dominance_quotient"] for row in self.db.get_all_player_statistics()], [50.0])
+
+    def test_memory_storage_rows_are_copies(self):
+        with mock.patch.object(blcs_stats, "SQLALCHEMY_AVAILABLE", False):
+            db = DatabaseManager("sqlite://")
+        self.assertFalse(db.use_db)
+        db.add_player_mapping(42, "someone", "steam:1", "steam")
+        db.bulk_upsert_player_statistics([full_row("steam:1")])
+
+        rows = db.get_all_player_statistics()
+        self.assertEqual(rows[0]["discord_username"], "someone")
+        rows[0]["dominance_quotient"] = -1.0
+        self.assertNotIn("discord_username", db.storage.player_stats["steam:1"])
+        self.assertEqual(db.get_all_player_statistics()[0]["dominance_quotient"], 50.0)
+
+
+class TestDiscordLookups(StatsTestCase):
+
+    def populate(self, db):
+        db.add_player_mapping(1, "linked", "steam:1", "steam")
+        db.add_player_mapping(2, "no_stats", "epic:2", "epic")
+        db.bulk_upsert_player_statistics([full_row("steam:1", avg_score=512.0), full_row("steam:9")])
+
+    def check_lookups(self, db):
+        players = db.get_players_by_discord_ids([1, 2, 3])
+        # Unlinked IDs are left out; a linked player without statistics gets None stats
+        self.assertEqual(sorted(players), [1, 2])
+        mapping, stats = players[1]
+        self.assertEqual((mapping["discord_username"], mapping["ballchasing_player_id"]), ("linked", "steam:1"))
+        self.assertEqual((stats["player_id"], stats["avg_score"]), ("steam:1", 512.0))
+        mapping, stats = players[2]
+        self.assertEqual(mapping["ballchasing_platform"], "epic")
+        self.assertIsNone(stats)
+
+        self.assertEqual(db.get_player_by_discord_id(1)[1]["avg_score"], 512.0)
+        self.assertEqual(db.get_player_by_discord_id(2)[0]["discord_username"], "no_stats")
+        self.assertIsNone(db.get_player_by_discord_id(2)[1])
+        self.assertEqual(db.get_player_by_discord_id(3), (None, None))
+        self.assertEqual(db.get_players_by_discord_ids([]), {})
+
+    def test_database_lookups(self):
+        self.populate(self.db)
+        self.check_lookups(self.db)
+
+    def test_memory_lookups(self):
+        with mock.patch.object(blcs_stats, "SQLALCHEMY_AVAILABLE", False):
+            db = DatabaseManager("sqlite://")
+        self.populate(db)
+        self.check_lookups(db)
+        # Lookups hand out copies, as the database path does
+        db.get_player_by_discord_id(1)[1]["avg_score"] = 0.0
+        self.assertEqual(db.storage.player_stats["steam:1"]["avg_score"], 512.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# tests/test_dominance_quotient.py
+import logging
+import os
+import random
+import tempfile
+import unittest
+from discord_bot.utils.dominance_quotient import (DEFAULT_DQ_CONFIG, DataDrivenDominanceQuotientCalculator,
+                                                  DQConfigWatcher, load_dq_config)
+
+
+def make_players(n, seed=0):
+    rng = random.Random(seed)
+    players = []
+    for i in range(n):
+        games = rng.choice([0, 8, 12, 14, 16, 18, 22, 26])
+        players.append({
+            "player_id": f"steam:{i}",
+            "games_played": games,
+            "wins": rng.randint(0, games),
+            "avg_score": rng.choice([300, 320, 380, 450, round(rng.uniform(200, 560), 1)]),
+            "goals_per_game": rng.choice([0.5, 1.1, round(rng.uniform(0, 1.6), 2)]),
+            "assists_per_game": rng.choice([1.0, round(rng.uniform(0, 1.4), 2)]),
+            "saves_per_game": rng.choice([2.2, round(rng.uniform(0.5, 3.0), 2)]),
+            "shots_per_game": round(rng.uniform(1, 5), 2),
+            "shot_percentage": rng.choice([None, float("nan"), round(rng.uniform(5, 60), 1)]),
+        })
+    return players
+
+
+class TestDominanceQuotient(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.calculator = DataDrivenDominanceQuotientCalculator()
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def assert_matches_per_player(self, players):
+        expected = [self.calculator.calculate_dominance_quotient(p, players) for p in players]
+        self.assertEqual(self.calculator.calculate_all(players), expected)
+
+    def test_calculate_all_matches_per_player_exactly(self):
+        for n, seed in ((2, 1), (7, 2), (60, 3), (300, 4)):
+            self.assert_matches_per_player(make_players(n, seed))
+
+    def test_small_and_sparse_pools(self):
+        self.assertEqual(self.calculator.calculate_all([]), [])
+        self.assert_matches_per_player(make_players(1))
+        players = make_players(5)
+        for p in players[1:]:
+            p["shot_percentage"] = None
+            del p["shots_per_game"]
+        self.assert_matches_per_player(players)
+
+    def test_league_context_matches_full_scan(self):
+        players = make_players(80, 5)
+        league_avg = sum(p["wins"] for p in players) / max(sum(p["games_played"] for p in players), 1)
+
+        def adjusted(p):
+            confidence = min(p["games_played"] / 16, 1.0)
+            return confidence * (p["wins"] / max(p["games_played"], 1)) + (1 - confidence) * league_avg
+
+        all_rates = [adjusted(p) for p in players]
+        context = self.calculator.league_context(players)
+        for p in players:
+            self.assertEqual(self.calculator.calculate_win_rate_with_context(p, players, context),
+                             self.calculator.calculate_percentile(adjusted(p), all_rates))
+
+    def test_default_path_logs_nothing(self):
+        logging.disable(logging.NOTSET)
+        players = make_players(10, 6)
+        with self.assertNoLogs("discord_bot.utils.dominance_quotient", level="INFO"):
+            self.calculator.calculate_dominance_quotient(players[0], players)
+
+    def test_explanation_adds_up(self):
+        players = make_players(30, 8)
+        for p in players:
+            explanation = self.calculator.explain_dominance_quotient(p, players)
+            self.assertEqual(explanation.dominance_quotient, self.calculator.calculate_dominance_quotient(p, players))
+            self.assertEqual(sum(e["contribution"] for e in explanation.stats.values()),
+                             explanation.base_dominance_quotient)
+            self.assertIn("Final DQ", str(explanation))
+        self.assertEqual(self.calculator.explain_dominance_quotient(players[0], []).lines(),
+                         ["Final DQ: 50.0 (no league data to compare against)"])
+
+    def test_calculate_percentiles_matches_calculate_percentile(self):
+        values = [3.0, 1.0, 2.0, 2.0, float("nan"), 5.0]
+        for higher_is_better in (True, False):
+            expected = [self.calculator.calculate_percentile(v, values, higher_is_better) for v in values]
+            self.assertEqual(self.calculator.calculate_percentiles(values, values, higher_is_better).tolist(),
+                             expected)
+
+
+class TestDQConfig(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        handle, self.path = tempfile.mkstemp(suffix=".yaml")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+        logging.disable(logging.NOTSET)
+
+    def write(self, text, mtime):
+        with open(self.path, "w") as f:
+            f.write(text)
+        os.utime(self.path, ns=(mtime, mtime))
+
+    def test_yaml_overrides_defaults(self):
+        self.write("dominance_quotient:\n  stat_weights: {avg_score: 0.7, saves_per_game: 0.3}\n"
+                   "  performance_benchmarks: {elite_assists_threshold: 1.3}\n", 1)
+        config = load_dq_config(self.path)
+        self.assertEqual(config["stat_weights"], {"avg_score": 0.7, "saves_per_game": 0.3})
+        self.assertEqual(config["performance_benchmarks"]["elite_assists_threshold"], 1.3)
+        self.assertEqual(config["tournament_config"], DEFAULT_DQ_CONFIG["tournament_config"])
+
+        calculator = DataDrivenDominanceQuotientCalculator(config)
+        self.assertEqual(calculator.ranked_stats, ("avg_score", "saves_per_game"))
+        players = make_players(60, seed=5)
+        self.assertEqual(calculator.calculate_all(players),
+                         [calculator.calculate_dominance_quotient(p, players) for p in players])
+
+    def test_old_weight_names_read_as_player_stats(self):
+        self.write("dominance_quotient:\n  stat_weights: {avg_score: 0.9, shooting_pct: 0.1}\n", 1)
+        self.assertEqual(load_dq_config(self.path)["stat_weights"], {"avg_score": 0.9, "shot_percentage": 0.1})
+        # The shipped config weights a stat the player rows actually have
+        self.assertIn("shot_percentage", load_dq_config()["stat_weights"])
+
+    def test_watcher_reloads_on_change_and_keeps_config_on_error(self):
+        self.write("dominance_quotient:\n  stat_weights: {avg_score: 1.0}\n", 1)
+        watcher = DQConfigWatcher(self.path)
+        self.assertIsNone(watcher.poll())
+
+        self.write("dominance_quotient:\n  stat_weights: {avg_score: 0.5, win_rate: 0.5}\n", 2)
+        self.assertEqual(watcher.poll()["stat_weights"], {"avg_score": 0.5, "win_rate": 0.5})
+        self.assertIsNone(watcher.poll())
+
+        self.write("dominance_quotient:\n  stat_weights: {avg_score: -1}\n", 3)
+        self.assertIsNone(watcher.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()
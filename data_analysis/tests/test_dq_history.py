@@ -0,0 +1,43 @@
+# tests/test_dq_history.py
+import unittest
+from datetime import datetime
+from discord_bot.utils.dq_history import biggest_movers, build_snapshots
+
+
+class TestDQHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.taken_at = datetime(2026, 3, 1, 20, 0)
+        self.players = [
+            {"player_id": "a", "season_id": "BLCS4", "games_played": 12, "dominance_quotient": 71.5, "percentile_rank": 90.0},
+            {"player_id": "b", "season_id": "BLCS4", "games_played": 10, "dominance_quotient": 40.0, "percentile_rank": 30.0},
+            {"player_id": "c", "season_id": "BLCS4", "games_played": 4, "dominance_quotient": 55.0, "percentile_rank": 60.0},
+            {"player_id": "d", "season_id": "BLCS4", "games_played": 9, "dominance_quotient": None, "percentile_rank": None},
+        ]
+        self.previous = {
+            "a": {"games_played": 9, "dominance_quotient": 65.0, "percentile_rank": 80.0},
+            "b": {"games_played": 10, "dominance_quotient": 48.0, "percentile_rank": 45.0},
+            "d": {"games_played": 6, "dominance_quotient": 50.0, "percentile_rank": 50.0},
+        }
+
+    def test_deltas_against_previous_snapshot(self):
+        rows = {row["player_id"]: row for row in build_snapshots(self.players, self.previous, self.taken_at)}
+        self.assertEqual((rows["a"]["dq_delta"], rows["a"]["percentile_delta"], rows["a"]["games_delta"]), (6.5, 10.0, 3))
+        self.assertEqual(rows["b"]["dq_delta"], -8.0)
+        # First snapshot of a player, or no DQ: no delta
+        self.assertIsNone(rows["c"]["dq_delta"])
+        self.assertIsNone(rows["d"]["dq_delta"])
+        self.assertEqual(rows["d"]["games_delta"], 3)
+        self.assertEqual(rows["a"]["snapshot_at"], self.taken_at)
+        self.assertNotIn("shots_per_game", rows["a"])
+
+    def test_biggest_movers(self):
+        rows = build_snapshots(self.players, self.previous, self.taken_at)
+        risers, fallers = biggest_movers(rows, limit=5)
+        self.assertEqual([row["player_id"] for row in risers], ["a"])
+        self.assertEqual([row["player_id"] for row in fallers], ["b"])
+        self.assertEqual(biggest_movers(rows, limit=0), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
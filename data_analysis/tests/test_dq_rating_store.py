@@ -0,0 +1,109 @@
+# tests/test_dq_rating_store.py
+import logging
+import random
+import unittest
+from discord_bot.utils.dominance_quotient import DataDrivenDominanceQuotientCalculator
+from discord_bot.utils.dq_rating_store import DQRatingStore, fold_replay_stats
+
+
+def random_player(rng, player_id):
+    games = rng.choice([8, 12, 16, 20, 24])
+    return {
+        "player_id": player_id,
+        "games_played": games,
+        "wins": rng.randint(0, games),
+        "avg_score": rng.choice([320, 380, 450, round(rng.uniform(200, 560), 1)]),
+        "goals_per_game": round(rng.uniform(0, 1.6), 2),
+        "assists_per_game": rng.choice([1.0, round(rng.uniform(0, 1.4), 2)]),
+        "saves_per_game": rng.choice([2.2, round(rng.uniform(0.5, 3.0), 2)]),
+        "shots_per_game": round(rng.uniform(1, 5), 1),
+        "shot_percentage": rng.choice([None, round(rng.uniform(5, 60), 1)]),
+    }
+
+
+class TestDQRatingStore(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.rng = random.Random(11)
+        self.calculator = DataDrivenDominanceQuotientCalculator()
+        self.players = {f"steam:{i}": random_player(self.rng, f"steam:{i}") for i in range(40)}
+        self.store = DQRatingStore(self.calculator)
+        self.store.load(list(self.players.values()))
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def assert_matches_full_recompute(self, previous, changed):
+        league = list(self.players.values())
+        expected = dict(zip((p["player_id"] for p in league), self.calculator.calculate_all(league)))
+        self.assertEqual(self.store.dominance_quotients, expected)
+        self.assertEqual(changed, {pid for pid, dq in expected.items() if previous.get(pid) != dq})
+
+    def test_updates_match_full_recompute(self):
+        for step in range(60):
+            previous = dict(self.store.dominance_quotients)
+            player_id = self.rng.choice(list(self.players))
+            player = dict(self.players[player_id])
+            if step % 3:
+                # A replay's worth of change: one more game and nudged averages
+                player["games_played"] += 1
+                player["wins"] += self.rng.randint(0, 1)
+                player["avg_score"] = round(player["avg_score"] + self.rng.uniform(-20, 20), 1)
+                player["saves_per_game"] = round(player["saves_per_game"] + self.rng.uniform(-0.2, 0.2), 2)
+            else:
+                player["goals_per_game"] = round(self.rng.uniform(0, 1.6), 2)
+            self.players[player_id] = player
+            self.assert_matches_full_recompute(previous, self.store.update(player))
+
+    def test_add_and_remove_players(self):
+        previous = dict(self.store.dominance_quotients)
+        newcomer = random_player(self.rng, "epic:new")
+        self.players[newcomer["player_id"]] = newcomer
+        self.assert_matches_full_recompute(previous, self.store.update(newcomer))
+
+        previous = dict(self.store.dominance_quotients)
+        del self.players["steam:3"]
+        self.assert_matches_full_recompute(previous, self.store.remove("steam:3"))
+        self.assertEqual(self.store.remove("steam:3"), set())
+
+    def test_live_updates_match_group_refresh(self):
+        # What the cog stores after a /blcs_update, then one replay's players at a time
+        stored = {row["player_id"]: row for row in self.store.load_rows(list(self.players.values()))}
+        for _ in range(30):
+            player_id = self.rng.choice(list(self.players))
+            replay_stats = {"score": self.rng.randint(100, 800), "goals": self.rng.randint(0, 3),
+                            "assists": self.rng.randint(0, 2), "saves": self.rng.randint(0, 4),
+                            "shots": self.rng.randint(0, 6), "won": self.rng.random() < 0.5}
+            player = fold_replay_stats(stored[player_id], replay_stats)
+            self.players[player_id] = player
+            for row in self.store.apply_update(player):
+                stored[row["player_id"]].update(row)
+
+        expected = DQRatingStore(self.calculator).load_rows(list(self.players.values()))
+        self.assertEqual(stored, {row["player_id"]: row for row in expected})
+
+    def test_callers_rows_are_not_modified(self):
+        league = [dict(player) for player in self.players.values()]
+        rows = DQRatingStore(self.calculator).load_rows(league)
+        self.assertNotIn("dominance_quotient", league[0])
+        self.assertIn("dominance_quotient", rows[0])
+
+        player = dict(league[0], games_played=league[0]["games_played"] + 1)
+        self.store.apply_update(player)
+        self.assertNotIn("percentile_rank", player)
+
+    def test_fold_replay_stats(self):
+        player = {"player_id": "steam:1", "season_id": "BLCS4", "games_played": 3, "wins": 2, "losses": 1,
+                  "avg_score": 400, "goals_per_game": 1.0, "shots_per_game": 2.0, "avg_speed": 1500,
+                  "discord_username": "someone"}
+        folded = fold_replay_stats(player, {"score": 200, "goals": 2, "shots": 6, "saves": 4, "won": False})
+        self.assertEqual((folded["games_played"], folded["wins"], folded["losses"]), (4, 2, 2))
+        self.assertEqual((folded["avg_score"], folded["goals_per_game"], folded["saves_per_game"]), (350, 1.25, 1.0))
+        self.assertEqual(folded["shot_percentage"], 1.25 / 3.0 * 100)
+        self.assertEqual(folded["avg_speed"], 1500)
+        self.assertNotIn("discord_username", folded)
+
+
+if __name__ == "__main__":
+    unittest.main()
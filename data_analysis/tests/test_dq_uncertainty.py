@@ -0,0 +1,52 @@
+# tests/test_dq_uncertainty.py
+import logging
+import unittest
+import numpy as np
+from discord_bot.utils.dominance_quotient import DataDrivenDominanceQuotientCalculator
+from discord_bot.utils.dq_uncertainty import DQBootstrap, batch_percentiles
+from data_analysis.tests.test_dominance_quotient import make_players
+
+
+class TestDQBootstrap(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.calculator = DataDrivenDominanceQuotientCalculator()
+        self.players = [p for p in make_players(60, seed=3) if p["games_played"]]
+        self.bootstrap = DQBootstrap(self.calculator, resamples=400)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_batch_percentiles_match_calculate_percentile(self):
+        rng = np.random.default_rng(1)
+        values = rng.choice([1.0, 2.0, 2.5, np.nan, 4.0], size=(5, 12))
+        in_pool = rng.random(12) > 0.2
+        expected = [[self.calculator.calculate_percentile(v, [x for x, ok in zip(row, in_pool) if ok])
+                     for v in row] for row in values]
+        np.testing.assert_array_equal(batch_percentiles(values, in_pool), expected)
+
+    def test_unresampled_league_reproduces_calculate_all(self):
+        stat_keys = ["avg_score", "wins", "goals_per_game", "assists_per_game", "saves_per_game", "shots_per_game"]
+        samples = {k: np.tile([float(p.get(k, 0)) for p in self.players], (3, 1)) for k in stat_keys}
+        dominance_quotients = self.bootstrap.dominance_quotients(self.players, samples)
+        for row in dominance_quotients:
+            np.testing.assert_allclose(row, self.calculator.calculate_all(self.players), rtol=1e-12)
+
+    def test_more_games_narrower_interval(self):
+        short = dict(self.players[0], player_id="short", games_played=8, wins=4)
+        long = dict(short, player_id="long", games_played=28, wins=14)
+        intervals = self.bootstrap.intervals(self.players + [short, long], generation=5)
+        short_low, short_high = intervals.get("short")
+        long_low, long_high = intervals.get("long")
+        self.assertLess(long_high - long_low, short_high - short_low)
+        self.assertEqual(intervals.generation, 5)
+        self.assertTrue(intervals.describe("long").startswith("90% CI "))
+        self.assertEqual(intervals.describe("nobody"), "")
+        # Same seed, same intervals
+        self.assertEqual(self.bootstrap.intervals(self.players).bounds,
+                         DQBootstrap(self.calculator, resamples=400).intervals(self.players).bounds)
+
+
+if __name__ == "__main__":
+    unittest.main()
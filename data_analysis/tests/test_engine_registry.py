@@ -0,0 +1,69 @@
+# tests/test_engine_registry.py
+import logging
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from sqlalchemy import text
+from discord_bot.models.engine_registry import DEFAULT_POOL_SETTINGS, EngineRegistry, load_pool_settings
+
+
+class TestEngineRegistry(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.registry = EngineRegistry(dict(DEFAULT_POOL_SETTINGS))
+
+    def tearDown(self):
+        self.registry.dispose_all()
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def test_pool_settings_from_config(self):
+        path = os.path.join(self.tmp.name, "config.yaml")
+        with open(path, "w") as f:
+            f.write("database:\n"
+                    "  pool_size: ${oc.env:TEST_DB_POOL_SIZE,5}\n"
+                    "  pool_pre_ping: 'false'\n"
+                    "  postgres_connect_args:\n"
+                    "    sslmode: disable\n")
+        with mock.patch.dict(os.environ, {"TEST_DB_POOL_SIZE": "3"}):
+            settings = load_pool_settings(path)
+        self.assertEqual(settings["pool_size"], 3)
+        self.assertIs(settings["pool_pre_ping"], False)
+        self.assertEqual(settings["postgres_connect_args"]["sslmode"], "disable")
+        self.assertEqual(settings["postgres_connect_args"]["connect_timeout"], 10)
+        self.assertEqual(settings["max_overflow"], DEFAULT_POOL_SETTINGS["max_overflow"])
+        # A missing file leaves the defaults
+        self.assertEqual(load_pool_settings(os.path.join(self.tmp.name, "missing.yaml")), DEFAULT_POOL_SETTINGS)
+
+    def test_one_engine_per_url_with_metrics(self):
+        url = f"sqlite:///{os.path.join(self.tmp.name, 'bot.db')}"
+        engine = self.registry.get_engine(url)
+        self.assertIs(self.registry.get_engine(url), engine)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            status = self.registry.pool_status()[url]
+            self.assertEqual(status["checked_out"], 1)
+        status = self.registry.pool_status()[url]
+        self.assertEqual((status["checked_out"], status["peak_checked_out"], status["checkouts"]), (0, 1, 1))
+
+    def test_in_memory_sqlite_is_shared_across_threads(self):
+        engine = self.registry.get_engine("sqlite:///:memory:")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        def count():
+            with engine.connect() as conn:
+                return conn.execute(text("SELECT COUNT(*) FROM t")).scalar()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            self.assertEqual(executor.submit(count).result(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
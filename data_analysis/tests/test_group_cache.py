@@ -0,0 +1,105 @@
+# tests/test_group_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# The cache imports its siblings from the bot directory
+BOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "discord_bot"))
+if BOT_DIR not in sys.path:
+    sys.path.insert(0, BOT_DIR)
+
+from scripts.fake_ballchasing import FakeBallchasingData, FakeBallchasingServer  # noqa: E402
+from utils import group_cache  # noqa: E402
+from utils.ballchasing_api import BallchasingClient  # noqa: E402
+from utils.group_cache import GroupCache, fetch_group_columns  # noqa: E402
+from utils.group_stream import PLAYER_FIELDS  # noqa: E402
+
+GROUP_ID = "blcs-test"
+FIELDS = {"players": PLAYER_FIELDS}
+TOKEN = "fake-ballchasing-key"
+
+
+class TestGroupColumnsCache(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = FakeBallchasingData(players=8, replays=4, seed=5)
+        self.server = FakeBallchasingServer(self.data, port=0).start_in_thread()
+
+    def tearDown(self):
+        self.server.stop_thread()
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def fetch(self, cache):
+        return fetch_group_columns(GROUP_ID, TOKEN, FIELDS, base_url=self.server.base_url, cache=cache)
+
+    def count_parses(self):
+        parse = mock.patch.object(group_cache, "parse_group_stream", wraps=group_cache.parse_group_stream)
+        self.addCleanup(parse.stop)
+        return parse.start()
+
+    def replace_group(self):
+        """The group changes on the server: new body, new ETag"""
+        body, _ = self.data.group(GROUP_ID)
+        payload = json.loads(body)
+        payload["players"] = payload["players"][:3]
+        body = json.dumps(payload).encode()
+        self.data._group_bodies[GROUP_ID] = body
+        self.data._group_etags[GROUP_ID] = f'"{hashlib.sha1(body).hexdigest()}"'
+
+    def test_304s_parse_the_cached_body_once(self):
+        fresh = self.fetch(GroupCache(self.tmp.name))
+
+        # A new process: the body is only on disk
+        cache = GroupCache(self.tmp.name)
+        parses = self.count_parses()
+        first, second = self.fetch(cache), self.fetch(cache)
+        self.assertEqual(self.server.stats["not_modified"], 2)
+        self.assertEqual(parses.call_count, 1)
+        self.assertIs(first, second)
+        self.assertEqual(first.records("players"), fresh.records("players"))
+
+        # Other fields are a separate parse
+        cache.load_columns(GROUP_ID, {"players": PLAYER_FIELDS[:2]})
+        self.assertEqual(parses.call_count, 2)
+
+    def test_new_body_replaces_memo(self):
+        cache = GroupCache(self.tmp.name)
+        self.assertEqual(self.fetch(cache).count("players"), 8)
+
+        self.replace_group()
+        parses = self.count_parses()
+        self.assertEqual(self.fetch(cache).count("players"), 3)
+        # The 304 that follows reuses the columns parsed while the body streamed in
+        self.assertEqual(self.fetch(cache).count("players"), 3)
+        self.assertEqual(self.server.stats["not_modified"], 1)
+        self.assertEqual(parses.call_count, 0)
+
+    def test_async_client_304s_parse_once(self):
+        self.fetch(GroupCache(self.tmp.name))
+        parses = self.count_parses()
+
+        async def main():
+            client = BallchasingClient(api_key=TOKEN, base_url=self.server.base_url)
+            try:
+                return [await client.get_group_columns(GROUP_ID, FIELDS) for _ in range(2)]
+            finally:
+                await client.close()
+
+        with mock.patch.object(group_cache, "group_cache", GroupCache(self.tmp.name)):
+            first, second = asyncio.run(main())
+        self.assertIs(first, second)
+        self.assertEqual(self.server.stats["not_modified"], 2)
+        self.assertEqual(parses.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
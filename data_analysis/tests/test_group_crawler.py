@@ -0,0 +1,151 @@
+# tests/test_group_crawler.py
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# The crawler imports its siblings from the bot directory
+BOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "discord_bot"))
+if BOT_DIR not in sys.path:
+    sys.path.insert(0, BOT_DIR)
+
+from scripts.fake_ballchasing import FakeBallchasingData, FakeBallchasingServer  # noqa: E402
+from utils import group_cache  # noqa: E402
+from utils.ballchasing_api import BallchasingClient  # noqa: E402
+from utils.group_cache import GroupCache  # noqa: E402
+from utils.group_crawler import CrawlResult, GroupCrawler, GroupNode  # noqa: E402
+
+TOKEN = "fake-ballchasing-key"
+
+
+def make_result(edges, root_ids=("root",)):
+    """A crawl result from (group, parent) pairs, without touching the network"""
+    result = CrawlResult(root_ids)
+    for group_id, parent_id in edges:
+        node = result.groups.get(group_id)
+        if node is None:
+            result.groups[group_id] = GroupNode(group_id, group_id, parent_id)
+        elif parent_id:
+            node.parent_ids.append(parent_id)
+    return result
+
+
+class TestCrawlResult(unittest.TestCase):
+
+    def test_longest_path_wins(self):
+        # "finals" is linked from the root and from a season
+        result = make_result([("root", None), ("s1", "root"), ("finals", "root"), ("finals", "s1")])
+        result.resolve_paths()
+        self.assertEqual(result.groups["finals"].path, ("root", "s1", "finals"))
+        self.assertEqual(result.groups["s1"].path, ("root", "s1"))
+
+    def test_cycles_terminate(self):
+        # b and c link to each other below the root, and the root links back to c
+        result = make_result([("root", None), ("b", "root"), ("c", "b"), ("b", "c"), ("root", "c")])
+        result.resolve_paths()
+        self.assertEqual(result.groups["root"].path, ("root",))
+        self.assertEqual(result.groups["b"].path, ("root", "b"))
+        self.assertEqual(result.groups["c"].path, ("root", "b", "c"))
+
+    def test_paths_do_not_depend_on_crawl_order(self):
+        edges = [("root", None), ("s1", "root"), ("finals", "root"), ("finals", "s1"), ("root", "finals")]
+        paths = set()
+        for ordered in (edges, edges[::-1]):
+            result = make_result(ordered)
+            result.resolve_paths()
+            paths.add(tuple(sorted((gid, node.path) for gid, node in result.groups.items())))
+        self.assertEqual(len(paths), 1)
+
+    def test_replay_counted_once_and_homed_deepest(self):
+        result = make_result([("root", None), ("s1", "root"), ("playoffs", "s1"), ("regular", "s1")])
+        result.resolve_paths()
+        summary = {"id": "r1"}
+        self.assertTrue(result.add_replay(result.groups["regular"], summary))
+        self.assertFalse(result.add_replay(result.groups["playoffs"], dict(summary)))
+        self.assertFalse(result.add_replay(result.groups["root"], dict(summary)))
+
+        self.assertEqual(list(result.replays), ["r1"])
+        self.assertEqual(result.replay_groups["r1"], ["regular", "playoffs", "root"])
+        # Equal depth: alphabetically first path
+        self.assertEqual(result.home_group("r1").id, "playoffs")
+
+
+class TestGroupCrawler(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(group_cache, "group_cache", GroupCache(self.tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # League -> Season 1 -> Regular / Playoffs; Playoffs is also linked from the root,
+        # and back up to the root, so the tree has both a shortcut and a cycle
+        self.data = FakeBallchasingData(players=6, replays=5, seed=3)
+        self.data.group_names.update({"league": "League", "s1": "Season 1",
+                                      "regular": "Regular", "playoffs": "Playoffs"})
+        self.data.subgroups.update({"league": ["s1", "playoffs"], "s1": ["regular", "playoffs"],
+                                    "playoffs": ["league"]})
+        replays = self.data.replay_order
+        self.shared = replays[2]
+        self.data.group_replays.update({"regular": replays[2:], "playoffs": replays[:3]})
+        self.server = FakeBallchasingServer(self.data, port=0, latency_ms=10).start_in_thread()
+
+    def tearDown(self):
+        self.server.stop_thread()
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def crawl(self, max_concurrency=8):
+        async def main():
+            client = BallchasingClient(api_key=TOKEN, base_url=self.server.base_url)
+            in_flight, peak = 0, 0
+            get = client._get
+
+            async def counted_get(*args, **kwargs):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                try:
+                    return await get(*args, **kwargs)
+                finally:
+                    in_flight -= 1
+            client._get = counted_get
+            try:
+                crawler = GroupCrawler(client=client, max_concurrency=max_concurrency)
+                return await crawler.crawl(["league"]), peak
+            finally:
+                await client.close()
+        return asyncio.run(main())
+
+    def test_shared_replay_tagged_once(self):
+        result, _ = self.crawl()
+        self.assertEqual(sorted(result.groups), ["league", "playoffs", "regular", "s1"])
+        self.assertEqual(result.groups["playoffs"].path_str, "League / Season 1 / Playoffs")
+        self.assertEqual(len(result.replays), 5)
+        self.assertEqual(sorted(result.replay_groups[self.shared]), ["playoffs", "regular"])
+        self.assertEqual(result.failed_replays, [])
+
+        replays = result.replay_frame()
+        self.assertEqual(len(replays), 5)
+        shared = replays[replays["replay_id"] == self.shared]
+        self.assertEqual(len(shared), 1)
+        self.assertEqual(shared["group_path"].iloc[0], "League / Season 1 / Playoffs")
+
+        # Each replay's players are flattened once, under its home group
+        rows = result.player_frame()
+        shared_rows = rows[rows["replay_id"] == self.shared]
+        self.assertEqual(len(shared_rows), 6)
+        self.assertEqual(set(shared_rows["group_path"]), {"League / Season 1 / Playoffs"})
+        self.assertEqual(len(rows), 5 * 6)
+
+    def test_concurrency_is_capped(self):
+        _, peak = self.crawl(max_concurrency=2)
+        self.assertEqual(peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# tests/test_group_stream.py
+import json
+import unittest
+import pandas as pd
+from discord_bot.utils.group_stream import parse_group_stream, PLAYER_FIELDS, TEAM_FIELDS
+
+GROUP = {
+    "id": "blcs-4-test",
+    "name": "BLCS 4 \"Regular\" [Season]",
+    "players": [
+        {"platform": "steam", "id": "1", "name": "Zé", "team": "Team A",
+         "cumulative": {"games": 10, "core": {"goals": 12}},
+         "game_average": {"core": {"score": 412.5, "goals": 1.2, "assists": 0.4, "saves": 1.1, "shots": 3.0,
+                                   "shooting_percentage": 40.0},
+                          "demo": {"inflicted": 0.9, "taken": 0.7},
+                          "boost": {"amount_stolen_big": 210.0, "amount_stolen_small": 95.5}}},
+        {"platform": "epic", "id": "2", "name": "B ]}", "team": "Team B",
+         "cumulative": {"games": 8},
+         "game_average": {"core": {"score": 300, "goals": 0.5}}},
+    ],
+    "teams": [
+        {"name": "Team A", "cumulative": {"games": 10, "wins": 6, "win_percentage": 60.0,
+                                          "core": {"goals": 30, "goals_against": 20, "shots": 90,
+                                                   "shots_against": 70},
+                                          "demo": {"inflicted": 20, "taken": 15}},
+         "game_average": {"core": {"goals": 3.0, "goals_against": 2.0, "shots": 9.0, "shots_against": 7.0},
+                          "demo": {"inflicted": 2.0, "taken": 1.5}}},
+    ],
+    "status": "ok",
+}
+
+
+def chunked(body, size):
+    return (body[i:i + size] for i in range(0, len(body), size))
+
+
+class TestGroupStream(unittest.TestCase):
+
+    def setUp(self):
+        self.body = json.dumps(GROUP, ensure_ascii=False).encode()
+
+    def test_matches_json_normalize_for_any_chunking(self):
+        expected_players = pd.json_normalize(GROUP, record_path=["players"]).reindex(columns=list(PLAYER_FIELDS))
+        expected_teams = pd.json_normalize(GROUP, record_path=["teams"]).reindex(columns=list(TEAM_FIELDS))
+        for size in (1, 3, 17, len(self.body)):
+            columns = parse_group_stream(chunked(self.body, size))
+            pd.testing.assert_frame_equal(columns.frame("players"), expected_players, check_dtype=False)
+            pd.testing.assert_frame_equal(columns.frame("teams"), expected_teams, check_dtype=False)
+
+    def test_keeps_top_level_scalars_only(self):
+        columns = parse_group_stream(chunked(self.body, 5), {"players": ("name",)})
+        self.assertEqual(columns.meta, {"id": "blcs-4-test", "name": GROUP["name"], "status": "ok"})
+        self.assertEqual(columns.columns["players"]["name"], ["Zé", "B ]}"])
+        self.assertNotIn("teams", columns.columns)
+
+    def test_records_rebuild_only_selected_paths(self):
+        columns = parse_group_stream([self.body], {"players": ("id", "cumulative.games", "game_average.demo.taken")})
+        self.assertEqual(columns.records("players"), [
+            {"id": "1", "cumulative": {"games": 10}, "game_average": {"demo": {"taken": 0.7}}},
+            {"id": "2", "cumulative": {"games": 8}},
+        ])
+
+    def test_truncated_payload_raises(self):
+        with self.assertRaises(ValueError):
+            parse_group_stream(chunked(self.body[:-40], 16))
+
+
+if __name__ == "__main__":
+    unittest.main()
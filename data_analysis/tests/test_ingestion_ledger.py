@@ -0,0 +1,165 @@
+# tests/test_ingestion_ledger.py
+import asyncio
+import copy
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+# The bot's services import their siblings from the bot directory
+BOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "discord_bot"))
+if BOT_DIR not in sys.path:
+    sys.path.insert(0, BOT_DIR)
+
+from models.database_config import db_config, get_session, initialize_database  # noqa: E402
+from models.ingestion import (ProcessedReplay, ReplayLedger, WATERMARK_OVERLAP,  # noqa: E402
+                              format_server_time, parse_server_time)
+from services.ballchasing_service import BallchasingService  # noqa: E402
+from utils.ballchasing_api import BallchasingAPIError  # noqa: E402
+
+GROUP_ID = "blcs-test"
+
+
+class FakeGroupClient:
+    """Lists a group's replays the way ballchasing does: newest first, paged, filtered by created-after"""
+
+    def __init__(self, replays, page_size=5):
+        self.replays = replays
+        self.order = list(replays)
+        self.bodies = {replay_id: copy.deepcopy(replay) for replay_id, replay in replays.items()}
+        self.page_size = page_size
+
+    async def iter_pages(self, endpoint, params=None, api_key=None):
+        since = parse_server_time((params or {}).get("created-after"))
+        listed = []
+        for replay_id in self.order:
+            created = parse_server_time(self.replays[replay_id].get("created"))
+            if since is None or created is None or created > since:
+                listed.append(self.replays[replay_id])
+        for start in range(0, len(listed), self.page_size):
+            yield [dict(replay) for replay in listed[start:start + self.page_size]]
+
+    async def get_json(self, endpoint, params=None, api_key=None):
+        replay_id = endpoint.rsplit("/", 1)[-1]
+        if replay_id not in self.bodies:
+            raise BallchasingAPIError(404, f"no replay {replay_id}")
+        return copy.deepcopy(self.bodies[replay_id])
+
+
+class TestReplayIngestion(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.tmp = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(self.tmp.name, 'ingest.db')}"
+        with mock.patch.dict(os.environ, {"DATABASE_URL": url}):
+            initialize_database()
+
+        # Twelve replays an hour apart, newest first
+        newest = datetime(2025, 3, 1, 20, 0, 0)
+        self.all_replays = [f"replay-{i:02d}" for i in range(12)]
+        self.client = FakeGroupClient({
+            replay_id: {"id": replay_id, "created": format_server_time(newest - timedelta(hours=i))}
+            for i, replay_id in enumerate(self.all_replays)
+        })
+        self.service = BallchasingService()
+        self.service.client = self.client
+
+    def tearDown(self):
+        db_config.engine.dispose()
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def ingest(self, ledger, group_id=GROUP_ID):
+        with mock.patch("builtins.print"):
+            return asyncio.run(self.service.ingest_new_replays(group_id, ledger))
+
+    def created(self, replay_id):
+        return parse_server_time(self.client.replays[replay_id]["created"])
+
+    def add_replay(self, replay_id, created):
+        """A replay that shows up on the server after an earlier pass"""
+        replay = {"id": replay_id, "created": format_server_time(created)}
+        self.client.replays[replay_id] = replay
+        self.client.bodies[replay_id] = dict(replay)
+        self.client.order.append(replay_id)
+
+    def ledger_rows(self):
+        session = get_session()
+        try:
+            return sorted(session.query(ProcessedReplay.group_id, ProcessedReplay.replay_id))
+        finally:
+            session.close()
+
+    def test_rerun_is_idempotent(self):
+        ledger = ReplayLedger(GROUP_ID)
+        self.assertCountEqual(self.ingest(ledger), self.all_replays)
+        self.assertEqual(ledger.watermark, self.created(self.all_replays[0]))
+
+        self.assertEqual(self.ingest(ledger), [])
+        self.assertEqual(len(self.ledger_rows()), len(self.all_replays))
+
+    def test_resume_after_restart(self):
+        newest, older = self.all_replays[:4], self.all_replays[4:]
+        self.client.order = list(older)
+        self.assertCountEqual(self.ingest(ReplayLedger(GROUP_ID)), older)
+
+        # The bot restarts; the new ledger picks up where the old one stopped
+        self.client.order = list(self.all_replays)
+        ledger = ReplayLedger(GROUP_ID)
+        self.assertEqual(ledger.watermark, self.created(older[0]))
+        self.assertEqual(ledger.resume_from(), ledger.watermark - WATERMARK_OVERLAP)
+        self.assertCountEqual(self.ingest(ledger), newest)
+        self.assertEqual(ledger.watermark, self.created(newest[0]))
+
+    def test_overlap_window(self):
+        ledger = ReplayLedger(GROUP_ID)
+        self.ingest(ledger)
+        watermark = ledger.watermark
+
+        # Indexed late: uploaded before the watermark, listed only after the pass that set it
+        self.add_replay("late", watermark - WATERMARK_OVERLAP / 2)
+        self.add_replay("too-late", watermark - WATERMARK_OVERLAP - timedelta(minutes=1))
+        self.assertEqual(self.ingest(ledger), ["late"])
+        self.assertEqual(ledger.watermark, watermark)
+
+    def test_undated_failure_holds_watermark(self):
+        broken = self.all_replays[5]
+        del self.client.replays[broken]["created"]
+        body = self.client.bodies.pop(broken)
+
+        ledger = ReplayLedger(GROUP_ID)
+        self.assertNotIn(broken, self.ingest(ledger))
+        self.assertIsNone(ledger.watermark)
+
+        self.client.bodies[broken] = body
+        self.assertEqual(self.ingest(ledger), [broken])
+        self.assertEqual(ledger.watermark, self.created(self.all_replays[0]))
+
+    def test_listeners_see_each_new_replay_once(self):
+        seen = []
+
+        async def listener(group_id, replay, uploaded_at):
+            seen.append((group_id, replay["id"], uploaded_at))
+        self.service.add_replay_listener(listener)
+
+        ledger = ReplayLedger(GROUP_ID)
+        self.ingest(ledger)
+        self.ingest(ledger)
+        self.assertCountEqual(seen, [(GROUP_ID, rid, self.created(rid)) for rid in self.all_replays])
+
+    def test_ledger_is_per_group(self):
+        shared = self.all_replays[0]
+        for group_id in (GROUP_ID, "blcs-test-playoffs"):
+            ReplayLedger(group_id).mark_processed(shared, self.created(shared))
+
+        self.assertEqual(self.ledger_rows(), [("blcs-test", shared), ("blcs-test-playoffs", shared)])
+        self.assertTrue(ReplayLedger(GROUP_ID).is_processed(shared))
+        self.assertTrue(ReplayLedger("blcs-test-playoffs").is_processed(shared))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# tests/test_parquet_archive.py
+import logging
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# The archive lives with the bot's utilities
+BOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "discord_bot"))
+if BOT_DIR not in sys.path:
+    sys.path.insert(0, BOT_DIR)
+
+from utils.parquet_archive import PART_NAME, ParquetArchive, frame_fingerprint  # noqa: E402
+
+SEASON = "BLCS 4"
+STAGES = ("Regular Season", "Playoffs")
+
+
+def season_frame():
+    return pd.DataFrame({
+        "stage": ["Regular Season"] * 3 + ["Playoffs"] * 2,
+        "player_name": ["Alpha", "Bravo", "Charlie", "Alpha", "Bravo"],
+        "goals": [4, 2, 7, 1, 3],
+        "avg_speed": [1510.5, 1488.0, 1602.25, 1533.0, None],
+    })
+
+
+class TestParquetArchive(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = ParquetArchive(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def write_season(self, archive, df):
+        """Write each stage of the season; returns the stages that were rewritten"""
+        written = []
+        for stage in STAGES:
+            rows = df[df["stage"] == stage].drop(columns="stage").reset_index(drop=True)
+            if archive.write(SEASON, stage, "players", rows):
+                written.append(stage)
+        archive.save_manifest()
+        return written
+
+    def part_path(self, stage):
+        return self.archive.root / ParquetArchive.partition_key(SEASON, stage, "players") / PART_NAME
+
+    def mtimes(self):
+        return {stage: os.stat(self.part_path(stage)).st_mtime_ns for stage in STAGES}
+
+    def test_unchanged_season_is_skipped(self):
+        df = season_frame()
+        self.assertEqual(self.write_season(self.archive, df), list(STAGES))
+        before = self.mtimes()
+
+        # A later run, with the manifest loaded from disk
+        archive = ParquetArchive(self.tmp.name)
+        playoffs = df[df["stage"] == "Playoffs"].drop(columns="stage").reset_index(drop=True)
+        self.assertTrue(archive.is_current(SEASON, "Playoffs", "players", frame_fingerprint(playoffs)))
+        self.assertEqual(self.write_season(archive, df), [])
+        self.assertEqual(self.mtimes(), before)
+
+    def test_changed_row_rewrites_one_partition(self):
+        df = season_frame()
+        self.write_season(self.archive, df)
+        before = self.mtimes()
+
+        df.loc[(df["stage"] == "Playoffs") & (df["player_name"] == "Bravo"), "goals"] = 4
+        archive = ParquetArchive(self.tmp.name)
+        self.assertEqual(self.write_season(archive, df), ["Playoffs"])
+        after = self.mtimes()
+        self.assertEqual(after["Regular Season"], before["Regular Season"])
+        self.assertNotEqual(after["Playoffs"], before["Playoffs"])
+        self.assertEqual(sorted(archive.read("players", stages=["Playoffs"])["goals"]), [1, 4])
+
+    def test_incomplete_partition_is_rewritten(self):
+        rows = season_frame().drop(columns="stage")
+        self.assertTrue(self.archive.write(SEASON, "Playoffs", "players", rows, complete=False))
+        self.assertFalse(self.archive.is_current(SEASON, "Playoffs", "players", frame_fingerprint(rows)))
+        self.assertTrue(self.archive.write(SEASON, "Playoffs", "players", rows))
+        self.assertFalse(self.archive.write(SEASON, "Playoffs", "players", rows))
+
+    def test_hive_partitions_read_back(self):
+        df = season_frame()
+        self.write_season(self.archive, df)
+        for stage in STAGES:
+            metadata = pq.ParquetFile(self.part_path(stage)).metadata
+            codecs = {metadata.row_group(0).column(i).compression for i in range(metadata.num_columns)}
+            self.assertEqual(codecs, {"ZSTD"})
+
+        read = self.archive.read("players", columns=["player_name", "goals"])
+        self.assertEqual(sorted(read.columns), ["goals", "player_name", "season", "stage"])
+        self.assertEqual(set(read["season"]), {"blcs-4"})
+        self.assertEqual(sorted(zip(read["stage"], read["player_name"], read["goals"])),
+                         [("playoffs", "Alpha", 1), ("playoffs", "Bravo", 3), ("regular-season", "Alpha", 4),
+                          ("regular-season", "Bravo", 2), ("regular-season", "Charlie", 7)])
+
+        # Plain Hive discovery sees the same partitions; the manifest is ignored
+        table = ds.dataset(self.tmp.name, format="parquet", partitioning="hive").to_table()
+        self.assertEqual(table.num_rows, len(df))
+        self.assertEqual(set(table.column("table").to_pylist()), {"players"})
+        self.assertEqual(len(self.archive.partitions("players", seasons=[SEASON], stages=["Playoffs"])), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+# tests/test_percentile_index.py
+import random
+import unittest
+from discord_bot.utils.dominance_quotient import DataDrivenDominanceQuotientCalculator
+from discord_bot.utils.percentile_index import PercentileIndex
+
+
+class TestPercentileIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.players = [{"avg_score": rng.choice([300.0, 350.0, 410.5, round(rng.uniform(200, 550), 1)]),
+                         "shot_percentage": rng.choice([None, float("nan"), 25.0, rng.uniform(5, 60)])}
+                        for _ in range(40)]
+        self.index = PercentileIndex(self.players)
+        self.calculator = DataDrivenDominanceQuotientCalculator()
+
+    def test_percentile_matches_calculate_percentile(self):
+        for stat_key in ("avg_score", "shot_percentage", "missing_stat"):
+            pool = [p.get(stat_key, 0) for p in self.players if p.get(stat_key) is not None]
+            for value in [p.get(stat_key, 0) for p in self.players] + [0, 999.0]:
+                if value is None:
+                    continue
+                for higher_is_better in (True, False):
+                    self.assertEqual(self.index.percentile(stat_key, value, higher_is_better),
+                                     self.calculator.calculate_percentile(value, pool, higher_is_better))
+
+    def test_rank_matches_sorted_list_position(self):
+        for higher_is_better in (True, False):
+            ordered = sorted((p["avg_score"] for p in self.players), reverse=higher_is_better)
+            for value in ordered:
+                self.assertEqual(self.index.rank("avg_score", value, higher_is_better), ordered.index(value) + 1)
+        self.assertIsNone(self.index.rank("avg_score", -1))
+        self.assertEqual(self.index.size("avg_score"), len(self.players))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# tests/test_rating_kernel.py
+import unittest
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+from discord_bot.utils.dominance_quotient import DataDrivenDominanceQuotientCalculator
+from discord_bot.utils.rating_kernel import (PIPELINE_PLAYER_WEIGHTS, RatingKernel, percentile,
+                                             pipeline_player_kernel)
+
+CONFIG = SimpleNamespace(avg_score=0.25, goals_per_game=0.22, saves_per_game=0.17, assists_per_game=0.16,
+                         shots_per_game=0.07, demos_per_games=0.05, demos_taken_per_game=0.05,
+                         count_big_pads_stolen_per_game=0.02, count_small_pads_stolen_per_game=0.01,
+                         dominance_quotient_multiplier=20)
+
+
+def make_frame(n=24, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({column: rng.gamma(4, 2, n).round(3) for column in PIPELINE_PLAYER_WEIGHTS})
+    frame.insert(0, "Player", [f"Player {i}" for i in range(n)])
+    return frame
+
+
+class TestRatingKernel(unittest.TestCase):
+
+    def legacy_dq(self, frame, scale, negate=()):
+        """The column-by-column pandas code the pipeline scripts used to run"""
+        columns = []
+        for column, key in PIPELINE_PLAYER_WEIGHTS.items():
+            weighted = np.round(scale(frame[column]) * getattr(CONFIG, key), 2)
+            columns.append(-weighted if column in negate else weighted)
+        contributions = pd.concat(columns, axis=1)
+        return contributions.to_numpy(), ((contributions.sum(axis=1) + 2) * CONFIG.dominance_quotient_multiplier)
+
+    def test_minmax_matches_pipeline(self):
+        frame = make_frame()
+        expected_contributions, expected = self.legacy_dq(
+            frame, lambda s: (s - np.min(s)) / (np.max(s) - np.min(s)), negate=("Demos Taken Per Game",))
+        contributions, ratings = pipeline_player_kernel(CONFIG, "minmax", negate=("Demos Taken Per Game",)
+                                                        ).rate_frame(frame)
+        np.testing.assert_array_equal(contributions.to_numpy(), expected_contributions)
+        np.testing.assert_array_equal(ratings.to_numpy(), expected.to_numpy())
+        self.assertEqual(list(contributions.columns)[0], "Avg Score Zscore")
+
+    def test_zscore_matches_pipeline(self):
+        frame = make_frame(seed=1)
+        _, expected = self.legacy_dq(frame, lambda s: (s - s.mean()) / s.std(ddof=0))
+        _, ratings = pipeline_player_kernel(CONFIG, "zscore").rate_frame(frame)
+        np.testing.assert_allclose(ratings.to_numpy(), expected.to_numpy(), rtol=0, atol=1e-9)
+
+    def test_percentile_matches_calculator(self):
+        calculator = DataDrivenDominanceQuotientCalculator()
+        matrix = make_frame(seed=2)[list(PIPELINE_PLAYER_WEIGHTS)[:3]].to_numpy(copy=True)
+        matrix[0, 1] = matrix[1, 1]  # a tie
+        for column in range(matrix.shape[1]):
+            values = matrix[:, column].tolist()
+            self.assertEqual(percentile(matrix)[:, column].tolist(),
+                             [calculator.calculate_percentile(v, values) for v in values])
+
+    def test_unknown_normalizer(self):
+        with self.assertRaises(ValueError):
+            RatingKernel({"Avg Score": 1.0}, "rank")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# tests/test_weight_tuning.py
+import logging
+import unittest
+import numpy as np
+import pandas as pd
+from discord_bot.utils.dominance_quotient import DataDrivenDominanceQuotientCalculator
+from discord_bot.utils.weight_tuning import (ArchivedSeason, DQTuningData, row_correlations,
+                                             sample_weight_sets)
+
+TEAMS = ["BANANAS", "NITROGEN", "VEGGIE TALES", "D-RAYS"]
+
+
+def make_season(name, seed, players=12):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "Player": [f"Player {i}" for i in range(players)],
+        "Team": [TEAMS[i % len(TEAMS)] for i in range(players)],
+        "Games": rng.integers(8, 28, players),
+        "Avg Score": rng.normal(360, 70, players).round(1),
+        "Goals Per Game": rng.uniform(0, 1.5, players).round(2),
+        "Assists Per Game": rng.uniform(0, 1.2, players).round(2),
+        "Saves Per Game": rng.uniform(0.5, 2.8, players).round(2),
+        "Shots Per Game": rng.uniform(1, 5, players).round(2),
+        "Shooting %": rng.uniform(0.1, 0.5, players).round(3),
+    })
+    teams = pd.DataFrame({"Team": TEAMS, "Win %": ["72%", "55%", "36%", "28%"]})
+    # Punctuation and case differ between archived tables
+    playoff_teams = pd.DataFrame({"Team": ["bananas", "Nitrogen", "VEGGIE TALES'", "SNACKATTACK"],
+                                  "Win %": ["80%", "54%", "33%", "20%"]})
+    return ArchivedSeason(name, frame, teams, playoff_teams)
+
+
+class TestWeightTuning(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.calculator = DataDrivenDominanceQuotientCalculator()
+        self.seasons = [make_season("season_3", 1), make_season("season_4", 2)]
+        self.data = DQTuningData(self.seasons, self.calculator)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_batch_scoring_matches_calculate_all(self):
+        dqs = self.data.dominance_quotients(np.vstack([self.data.base_weights, self.data.base_weights * 0.5]))
+        for season, season_dqs in zip(self.seasons, dqs):
+            expected = np.array(self.calculator.calculate_all(season.player_dicts()))
+            np.testing.assert_allclose(season_dqs[0], expected, rtol=1e-12)
+            np.testing.assert_allclose(season_dqs[1], np.clip(expected * 0.5, 0, 100), rtol=1e-12)
+
+    def test_objectives(self):
+        self.assertEqual(self.data.objective_names,
+                         ["playoff:season_3", "playoff:season_4", "stability:season_3->season_4"])
+        # Every weighted stat is in the player dicts, so every weight can be tuned
+        self.assertEqual([key for key, tunable in zip(self.data.stat_keys, self.data.tunable) if not tunable], [])
+        self.assertEqual(self.data.objectives(self.data.base_weights).shape, (1, 3))
+
+    def test_row_correlations_match_corrcoef(self):
+        rng = np.random.default_rng(3)
+        a, b = rng.normal(size=(5, 9)), rng.normal(size=(5, 9))
+        expected = [np.corrcoef(a[row], b[row])[0, 1] for row in range(5)]
+        np.testing.assert_allclose(row_correlations(a, b), expected)
+        np.testing.assert_allclose(row_correlations(a, b[0]), [np.corrcoef(row, b[0])[0, 1] for row in a])
+        self.assertEqual(row_correlations(np.ones((1, 4)), b[0, :4]).tolist(), [0.0])
+
+    def test_sampled_weight_sets_keep_total_and_frozen_weights(self):
+        base = self.data.base_weights
+        weight_sets = sample_weight_sets(np.random.default_rng(0), base, self.data.tunable, 100)
+        np.testing.assert_allclose(weight_sets.sum(axis=1), base.sum())
+        np.testing.assert_array_equal(weight_sets[:, ~self.data.tunable], np.tile(base[~self.data.tunable], (100, 1)))
+        self.assertTrue((weight_sets >= 0).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,6 +40,9 @@ from cogs.blcsx_stats import BLCSXStatsCog
 
 # Import ballchasing integration
 from services.ballchasing_stats_updater import initialize_ballchasing_updater
+from utils.ballchasing_api import close_ballchasing_client
+from models.async_db import db_executor, run_db
+from models.engine_registry import engine_registry
 
 class RocketLeagueBot(commands.Bot):
     def __init__(self):
@@ -107,10 +110,13 @@ async def health_check_server():
             db_type = "unknown"
             
             if engine:
-                try:
+                def ping():
                     with engine.connect() as conn:
                         from sqlalchemy import text
                         conn.execute(text("SELECT 1"))
+                
+                try:
+                    await run_db(ping)
                     
                     db_url = str(engine.url)
                     db_type = "PostgreSQL" if "postgresql" in db_url else "SQLite"
@@ -124,6 +130,7 @@ async def health_check_server():
                 "users": len(bot.users) if bot.is_ready() else 0,
                 "database_status": db_status,
                 "database_type": db_type,
+                "database_pools": engine_registry.pool_status(),
                 "blcsx_stats_enabled": BLCSX_STATS_AVAILABLE and os.getenv('BALLCHASING_API_KEY') is not None
             }
             return web.json_response(status)
@@ -253,6 +260,10 @@ async def main():
             logger.error("❌ Invalid Discord token! Please check your .env file")
         except Exception as e:
             logger.error(f"❌ Failed to start bot: {e}")
+        finally:
+            await close_ballchasing_client()
+            db_executor.shutdown(wait=False)
+            engine_registry.dispose_all()
 
 if __name__ == "__main__":
     print("🎮 Rocket League Discord Bot")
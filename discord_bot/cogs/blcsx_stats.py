@@ -1,7 +1,6 @@
 # cogs/blcsx_stats.py - Pure Py-cord Implementation
 import discord
-from discord.ext import commands
-import aiohttp
+from discord.ext import commands, tasks
 import asyncio
 import os
 import json
@@ -15,547 +14,72 @@ import pandas as pd
 from omegaconf import DictConfig, OmegaConf
 import hydra
 
+from utils.ballchasing_api import get_ballchasing_client, BallchasingAPIError
+from utils.group_stream import GroupColumns
+from utils.dominance_quotient import DataDrivenDominanceQuotientCalculator, DQConfigWatcher, dq_config_path
+from utils.percentile_index import PercentileIndex
+from utils.dq_rating_store import DQRatingStore, fold_replay_stats
+from utils.dq_uncertainty import DEFAULT_RESAMPLES, DQBootstrap, DQIntervals
+from models.async_db import AsyncRepository, run_db
+from models.blcs_stats import DatabaseManager
+from services.ballchasing_service import ballchasing_service
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-try:
-    from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, BigInteger
-    from sqlalchemy.ext.declarative import declarative_base
-    from sqlalchemy.orm import sessionmaker
-    from sqlalchemy.dialects.postgresql import insert
-    SQLALCHEMY_AVAILABLE = True
-    
-    Base = declarative_base()
-    
-    class PlayerMapping(Base):
-        __tablename__ = 'blcs_player_mappings'
-        
-        discord_id = Column(BigInteger, primary_key=True)
-        discord_username = Column(String(255))
-        ballchasing_player_id = Column(String(255))
-        ballchasing_platform = Column(String(50))
-        created_at = Column(DateTime, default=datetime.utcnow)
-        updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-
-    class PlayerStatistics(Base):
-        __tablename__ = 'blcs_player_statistics'
-        
-        player_id = Column(String(255), primary_key=True)
-        season_id = Column(String(255))
-        games_played = Column(Integer)
-        wins = Column(Integer)
-        losses = Column(Integer)
-        avg_score = Column(Float)
-        goals_per_game = Column(Float)
-        assists_per_game = Column(Float)
-        saves_per_game = Column(Float)
-        shots_per_game = Column(Float)
-        shot_percentage = Column(Float)
-        demos_inflicted_per_game = Column(Float)
-        demos_taken_per_game = Column(Float)
-        avg_speed = Column(Float)
-        dominance_quotient = Column(Float)
-        percentile_rank = Column(Float)
-        last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-
-except ImportError:
-    SQLALCHEMY_AVAILABLE = False
-    logger.warning("SQLAlchemy/psycopg2 not available - database features disabled")
-
 class BallchasingAPI:
     def __init__(self, api_token: str):
         self.api_token = api_token
-        self.base_url = "https://ballchasing.com/api"
-        self.headers = {"Authorization": api_token}
-        self.session = None
+        self.client = get_ballchasing_client()
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(headers=self.headers)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The pooled client outlives this context; it is closed on bot shutdown
+        pass
     
     async def get_group_data(self, group_id: str) -> Dict:
         """Get comprehensive group data including all players and teams"""
         try:
-            async with self.session.get(f"{self.base_url}/groups/{group_id}") as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    logger.error(f"Failed to get group data: {response.status}")
-                    return {}
+            return await self.client.get_group(group_id, api_key=self.api_token)
+        except BallchasingAPIError as e:
+            logger.error(f"Failed to get group data: {e.status}")
+            return {}
         except Exception as e:
             logger.error(f"Error fetching group data: {e}")
             return {}
 
-class SimpleMemoryStorage:
-    """Simple in-memory storage when database is not available"""
-    def __init__(self):
-        self.player_mappings = {}
-        self.player_stats = {}
-    
-    def add_player_mapping(self, discord_id: int, discord_username: str, 
-                          ballchasing_player_id: str, platform: str):
-        """Add or update player mapping"""
-        self.player_mappings[discord_id] = {
-            'discord_id': discord_id,
-            'discord_username': discord_username,
-            'ballchasing_player_id': ballchasing_player_id,
-            'ballchasing_platform': platform
-        }
-        logger.info(f"Stored mapping for {discord_username}")
-    
-    def get_player_mapping(self, discord_id: int) -> Optional[Dict]:
-        """Get player mapping by Discord ID"""
-        return self.player_mappings.get(discord_id)
-    
-    def update_player_statistics(self, player_stats: Dict):
-        """Update player statistics"""
-        player_id = player_stats['player_id']
-        self.player_stats[player_id] = player_stats
-        logger.info(f"Updated stats for {player_id}")
-    
-    def get_player_statistics(self, player_id: str) -> Optional[Dict]:
-        """Get player statistics"""
-        return self.player_stats.get(player_id)
-    
-    def get_all_player_statistics(self) -> List[Dict]:
-        """Get all player statistics for ranking calculations"""
-        return list(self.player_stats.values())
-
-class DatabaseManager:
-    def __init__(self, database_url: str):
-        if not SQLALCHEMY_AVAILABLE:
-            logger.warning("Using memory storage - data will not persist")
-            self.storage = SimpleMemoryStorage()
-            self.use_db = False
-            return
-        
-        try:
-            self.engine = create_engine(database_url)
-            Base.metadata.create_all(self.engine)
-            Session = sessionmaker(bind=self.engine)
-            self.Session = Session
-            self.use_db = True
-            logger.info("PostgreSQL database initialized for BLCS stats")
-        except Exception as e:
-            logger.warning(f"Database failed, using memory storage: {e}")
-            self.storage = SimpleMemoryStorage()
-            self.use_db = False
-    
-    def add_player_mapping(self, discord_id: int, discord_username: str, 
-                          ballchasing_player_id: str, platform: str):
-        """Add or update player mapping"""
-        if not self.use_db:
-            return self.storage.add_player_mapping(discord_id, discord_username, ballchasing_player_id, platform)
-        
-        try:
-            with self.Session() as session:
-                stmt = insert(PlayerMapping).values(
-                    discord_id=discord_id,
-                    discord_username=discord_username,
-                    ballchasing_player_id=ballchasing_player_id,
-                    ballchasing_platform=platform
-                )
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['discord_id'],
-                    set_=dict(
-                        discord_username=stmt.excluded.discord_username,
-                        ballchasing_player_id=stmt.excluded.ballchasing_player_id,
-                        ballchasing_platform=stmt.excluded.ballchasing_platform,
-                        updated_at=datetime.utcnow()
-                    )
-                )
-                session.execute(stmt)
-                session.commit()
-        except Exception as e:
-            logger.error(f"Error saving player mapping: {e}")
-    
-    def get_player_mapping(self, discord_id: int) -> Optional[Dict]:
-        """Get player mapping by Discord ID"""
-        if not self.use_db:
-            return self.storage.get_player_mapping(discord_id)
-        
+    async def get_group_columns(self, group_id: str, fields: Dict[str, Tuple[str, ...]]) -> Optional[GroupColumns]:
+        """Get only the given field paths of a group, parsed as the body streams in"""
         try:
-            with self.Session() as session:
-                mapping = session.query(PlayerMapping).filter_by(discord_id=discord_id).first()
-                if mapping:
-                    return {
-                        'discord_id': mapping.discord_id,
-                        'discord_username': mapping.discord_username,
-                        'ballchasing_player_id': mapping.ballchasing_player_id,
-                        'ballchasing_platform': mapping.ballchasing_platform
-                    }
-                return None
-        except Exception as e:
-            logger.error(f"Error getting player mapping: {e}")
+            return await self.client.get_group_columns(group_id, fields, api_key=self.api_token)
+        except BallchasingAPIError as e:
+            logger.error(f"Failed to get group data: {e.status}")
             return None
-    
-    def update_player_statistics(self, player_stats: Dict):
-        """Update player statistics"""
-        if not self.use_db:
-            return self.storage.update_player_statistics(player_stats)
-        
-        try:
-            with self.Session() as session:
-                logger.info(f"Attempting to update stats for player_id: {player_stats.get('player_id')}")
-                stmt = insert(PlayerStatistics).values(**player_stats)
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['player_id'],
-                    set_={k: stmt.excluded[k] for k in player_stats.keys() if k != 'player_id'}
-                )
-                session.execute(stmt)
-                session.commit()
-                logger.info(f"Successfully updated stats for player_id: {player_stats.get('player_id')}")
-        except Exception as e:
-            logger.error(f"Error updating player statistics for {player_stats.get('player_id')}: {e}")
-    
-    def get_player_statistics(self, player_id: str) -> Optional[Dict]:
-        """Get player statistics"""
-        if not self.use_db:
-            return self.storage.get_player_statistics(player_id)
-        
-        try:
-            with self.Session() as session:
-                logger.info(f"Attempting to retrieve stats for player_id: {player_id}")
-                stats = session.query(PlayerStatistics).filter_by(player_id=player_id).first()
-                if stats:
-                    logger.info(f"Successfully retrieved stats for player_id: {player_id}")
-                    return {
-                        'player_id': stats.player_id,
-                        'season_id': stats.season_id,
-                        'games_played': stats.games_played,
-                        'wins': stats.wins,
-                        'losses': stats.losses,
-                        'avg_score': stats.avg_score,
-                        'goals_per_game': stats.goals_per_game,
-                        'assists_per_game': stats.assists_per_game,
-                        'saves_per_game': stats.saves_per_game,
-                        'shots_per_game': stats.shots_per_game,
-                        'shot_percentage': stats.shot_percentage,
-                        'demos_inflicted_per_game': stats.demos_inflicted_per_game,
-                        'demos_taken_per_game': stats.demos_taken_per_game,
-                        'avg_speed': stats.avg_speed,
-                        'dominance_quotient': stats.dominance_quotient,
-                        'percentile_rank': stats.percentile_rank,
-                        'last_updated': stats.last_updated
-                    }
-                logger.warning(f"No stats found for player_id: {player_id}")
-                return None
         except Exception as e:
-            logger.error(f"Error getting player statistics for {player_id}: {e}")
+            logger.error(f"Error fetching group data: {e}")
             return None
-    
-    def get_all_player_statistics(self) -> List[Dict]:
-        """Get all player statistics for ranking, joined with player names."""
-        if not self.use_db:
-            # Fallback for memory storage (less efficient)
-            stats = self.storage.get_all_player_statistics()
-            mappings = self.storage.player_mappings
-            # Create a reverse map from ballchasing_id to discord_username
-            reverse_map = {v['ballchasing_player_id']: v['discord_username'] for k, v in mappings.items()}
-            for s in stats:
-                s['discord_username'] = reverse_map.get(s['player_id'])
-            return sorted(stats, key=lambda x: x.get('dominance_quotient', 0), reverse=True)
-
-        try:
-            with self.Session() as session:
-                # Efficiently join PlayerStatistics with PlayerMapping
-                results = (
-                    session.query(PlayerStatistics, PlayerMapping.discord_username)
-                    .outerjoin(PlayerMapping, PlayerStatistics.player_id == PlayerMapping.ballchasing_player_id)
-                    .order_by(PlayerStatistics.dominance_quotient.desc())
-                    .all()
-                )
-                
-                # Process results into a list of dictionaries
-                all_stats = []
-                for stats, discord_username in results:
-                    stat_dict = {
-                        c.name: getattr(stats, c.name) for c in stats.__table__.columns
-                    }
-                    stat_dict['discord_username'] = discord_username
-                    all_stats.append(stat_dict)
-                
-                return all_stats
-        except Exception as e:
-            logger.error(f"Error getting all player statistics: {e}")
-            return []
-    
-    def get_all_player_mappings(self) -> List[Dict]:
-        """Get all player mappings from the database"""
-        if not self.use_db:
-            return list(self.storage.player_mappings.values())
-
-        try:
-            with self.Session() as session:
-                all_mappings = session.query(PlayerMapping).all()
-                return [{
-                    'discord_id': mapping.discord_id,
-                    'discord_username': mapping.discord_username,
-                    'ballchasing_player_id': mapping.ballchasing_player_id,
-                    'ballchasing_platform': mapping.ballchasing_platform
-                } for mapping in all_mappings]
-        except Exception as e:
-            logger.error(f"Error getting all player mappings: {e}")
-            return []
-
 
+# Every field extract_player_stats reads from a group player
+PLAYER_STAT_FIELDS = (
+    "platform",
+    "id",
+    "cumulative.games",
+    "cumulative.wins",
+    "game_average.core.score",
+    "game_average.core.goals",
+    "game_average.core.assists",
+    "game_average.core.saves",
+    "game_average.core.shots",
+    "game_average.core.shooting_percentage",
+    "game_average.demo.inflicted",
+    "game_average.demo.taken",
+    "game_average.movement.avg_speed",
+)
 
 
-
-class DataDrivenDominanceQuotientCalculator:
-    def __init__(self):
-        """
-        Dominance Quotient calculator based on BLCS4 season analysis
-        Designed to identify individual skill regardless of team performance
-        """
-        
-        # Weights based on BLCS4 data analysis
-        # Key insight: Individual stats matter WAY more than team luck
-        self.stat_weights = {
-            # Core individual performance (90% total weight)
-            'avg_score': 0.40,              # Most important - overall game impact
-            'saves_per_game': 0.25,         # Defensive skill highly valued
-            'goals_per_game': 0.15,         # Offensive production
-            'assists_per_game': 0.10,       # Playmaking/team support
-            
-            # Secondary performance indicators (5% total weight)
-            'shooting_pct': 0.03,           # Efficiency over volume
-            'shots_per_game': 0.02,         # Offensive pressure
-            
-            # Team success (5% total weight) - MINIMAL impact
-            'win_rate': 0.05                # Proven to be mostly team luck
-        }
-        
-        # Tournament adjustments based on Bo7 double elimination
-        self.tournament_config = {
-            'min_games_threshold': 8,        # Minimum possible games (0-4, 0-4)
-            'early_elimination_threshold': 14,  # 8-14 games = early out
-            'deep_run_threshold': 22,        # 22+ games = finals/winner
-            'confidence_games': 16,          # Games needed for full win rate confidence
-            
-            # Opportunity adjustments
-            'early_elimination_boost': 0.12,  # 12% boost for early elimination
-            'deep_run_penalty': 0.06,        # 6% penalty for deep runs
-        }
-        
-        # Performance thresholds based on BLCS4 data
-        self.performance_benchmarks = {
-            'elite_score_threshold': 450,     # Top tier like JERID (543), DESI (488)
-            'good_score_threshold': 380,      # Above average performers
-            'average_score_threshold': 320,   # League average range
-            
-            'elite_saves_threshold': 2.2,     # Defensive specialists like who Drose (2.45)
-            'good_saves_threshold': 1.8,      # Above average defense
-            
-            'elite_goals_threshold': 1.1,     # Offensive threats like JERID (1.16)
-            'good_goals_threshold': 0.8,      # Above average offense
-        }
-    
-    def calculate_percentile(self, player_value: float, all_values: List[float], 
-                           higher_is_better: bool = True) -> float:
-        """Calculate what percentage of players this value beats"""
-        if not all_values or len(all_values) <= 1:
-            return 50.0
-        
-        # Filter out invalid values
-        valid_values = [v for v in all_values if not pd.isna(v) and v is not None]
-        if not valid_values:
-            return 50.0
-        
-        if higher_is_better:
-            better_count = sum(1 for v in valid_values if v < player_value)
-        else:
-            better_count = sum(1 for v in valid_values if v > player_value)
-        
-        return (better_count / len(valid_values)) * 100
-    
-    def get_tournament_adjustment_factor(self, games_played: int) -> float:
-        """Calculate opportunity adjustment based on games played"""
-        if games_played <= self.tournament_config['early_elimination_threshold']:
-            # Early elimination: Fewer opportunities to showcase skill
-            adjustment = 1.0 + self.tournament_config['early_elimination_boost']
-            adjustment_type = "early elimination boost"
-        elif games_played >= self.tournament_config['deep_run_threshold']:
-            # Deep run: More opportunities to accumulate stats
-            adjustment = 1.0 - self.tournament_config['deep_run_penalty']
-            adjustment_type = "deep run penalty"
-        else:
-            # Standard tournament run
-            adjustment = 1.0
-            adjustment_type = "no adjustment"
-        
-        logger.info(f"Games: {games_played}, adjustment: {adjustment:.3f} ({adjustment_type})")
-        return adjustment
-    
-    def calculate_skill_consistency_bonus(self, player_stats: Dict) -> float:
-        """Bonus for players who excel in multiple areas"""
-        score_tier = 0
-        if player_stats.get('avg_score', 0) >= self.performance_benchmarks['elite_score_threshold']:
-            score_tier = 3  # Elite
-        elif player_stats.get('avg_score', 0) >= self.performance_benchmarks['good_score_threshold']:
-            score_tier = 2  # Good
-        elif player_stats.get('avg_score', 0) >= self.performance_benchmarks['average_score_threshold']:
-            score_tier = 1  # Average
-        
-        # Check if player excels in multiple specific areas
-        specialties = 0
-        if player_stats.get('saves_per_game', 0) >= self.performance_benchmarks['elite_saves_threshold']:
-            specialties += 1  # Defensive specialist
-        if player_stats.get('goals_per_game', 0) >= self.performance_benchmarks['elite_goals_threshold']:
-            specialties += 1  # Offensive threat
-        if player_stats.get('assists_per_game', 0) >= 1.0:
-            specialties += 1  # Playmaker
-        
-        # Multi-skilled players get a small bonus
-        if score_tier >= 2 and specialties >= 2:
-            return 1.05  # 5% bonus for well-rounded elite players
-        elif score_tier >= 1 and specialties >= 1:
-            return 1.02  # 2% bonus for solid specialists
-        else:
-            return 1.0   # No bonus
-    
-    def calculate_win_rate_with_context(self, player_stats: Dict, all_players: List[Dict]) -> float:
-        """Calculate win rate percentile with heavy regression for small samples"""
-        player_games = player_stats.get('games_played', 0)
-        player_wins = player_stats.get('wins', 0)
-        player_win_rate = player_wins / max(player_games, 1)
-        
-        # Calculate league averages
-        total_wins = sum(p.get('wins', 0) for p in all_players)
-        total_games = sum(p.get('games_played', 0) for p in all_players)
-        league_avg_win_rate = total_wins / max(total_games, 1)
-        
-        # Heavy regression to mean for tournament play
-        confidence_factor = min(player_games / self.tournament_config['confidence_games'], 1.0)
-        
-        # Blend individual win rate with league average
-        adjusted_win_rate = (confidence_factor * player_win_rate) + \
-                           ((1 - confidence_factor) * league_avg_win_rate)
-        
-        # Calculate percentile among all adjusted win rates
-        all_adjusted_rates = []
-        for p in all_players:
-            p_games = p.get('games_played', 0)
-            p_wins = p.get('wins', 0)
-            p_win_rate = p_wins / max(p_games, 1)
-            p_confidence = min(p_games / self.tournament_config['confidence_games'], 1.0)
-            p_adjusted = (p_confidence * p_win_rate) + ((1 - p_confidence) * league_avg_win_rate)
-            all_adjusted_rates.append(p_adjusted)
-        
-        percentile = self.calculate_percentile(adjusted_win_rate, all_adjusted_rates, True)
-        
-        logger.info(f"Win rate: {player_win_rate:.3f} -> {adjusted_win_rate:.3f} "
-                   f"(confidence: {confidence_factor:.2f}, percentile: {percentile:.1f})")
-        
-        return percentile
-    
-    def calculate_dominance_quotient(self, player_stats: Dict, all_players: List[Dict]) -> float:
-        """
-        Calculate the Data-Driven Dominance Quotient
-        Based on BLCS4 analysis showing individual stats >> team success
-        """
-        if not all_players:
-            return 50.0
-        
-        player_name = player_stats.get('player_id', 'Unknown')
-        logger.info(f"\n=== Calculating DQ for {player_name} ===")
-        
-        # Extract stat values for percentile calculations
-        stat_lists = {}
-        for stat_key in ['avg_score', 'goals_per_game', 'assists_per_game', 'saves_per_game', 
-                        'shots_per_game', 'shot_percentage']: # Changed shooting_pct to shot_percentage
-            stat_lists[stat_key] = [p.get(stat_key, 0) for p in all_players if p.get(stat_key) is not None]
-        
-        # Calculate percentiles for each stat
-        percentiles = {}
-        weighted_contributions = {}
-        
-        for stat_key, weight in self.stat_weights.items():
-            if stat_key == 'win_rate':
-                # Special handling for win rate
-                percentiles[stat_key] = self.calculate_win_rate_with_context(player_stats, all_players)
-            elif stat_key in stat_lists and stat_lists[stat_key]:
-                player_value = player_stats.get(stat_key, 0)
-                percentiles[stat_key] = self.calculate_percentile(player_value, stat_lists[stat_key], True)
-            else:
-                percentiles[stat_key] = 50.0  # Default if no data
-            
-            # Calculate weighted contribution
-            weighted_contributions[stat_key] = percentiles[stat_key] * weight
-            
-            logger.info(f"{stat_key}: {player_stats.get(stat_key, 0):.2f} -> "
-                       f"{percentiles[stat_key]:.1f}th percentile x {weight:.3f} = "
-                       f"{weighted_contributions[stat_key]:.2f}")
-        
-        # Sum all weighted contributions
-        base_dominance_quotient = sum(weighted_contributions.values())
-        
-        # Apply tournament opportunity adjustment
-        games_played = player_stats.get('games_played', 0)
-        tournament_factor = self.get_tournament_adjustment_factor(games_played)
-        
-        # Apply skill consistency bonus
-        consistency_bonus = self.calculate_skill_consistency_bonus(player_stats)
-        
-        # Calculate final DQ
-        final_dq = base_dominance_quotient * tournament_factor * consistency_bonus
-        
-        # Clamp to 0-100 range
-        final_dq = max(0, min(100, final_dq))
-        
-        logger.info(f"Base DQ: {base_dominance_quotient:.2f}")
-        logger.info(f"Tournament factor: {tournament_factor:.3f}")
-        logger.info(f"Consistency bonus: {consistency_bonus:.3f}")
-        logger.info(f"Final DQ: {final_dq:.1f}")
-        
-        return final_dq
-    
-    def analyze_player_profile(self, player_stats: Dict, all_players: List[Dict]) -> Dict:
-        """Provide detailed analysis of a player's strengths and weaknesses"""
-        analysis = {
-            'dominance_quotient': self.calculate_dominance_quotient(player_stats, all_players),
-            'player_type': '',
-            'strengths': [],
-            'weaknesses': [],
-            'comparison_to_league': {}
-        }
-        
-        # Determine player type based on stats
-        avg_score = player_stats.get('avg_score', 0)
-        saves_per_game = player_stats.get('saves_per_game', 0)
-        goals_per_game = player_stats.get('goals_per_game', 0)
-        win_rate = player_stats.get('wins', 0) / max(player_stats.get('games_played', 1), 1) * 100
-        
-        # Player type classification
-        if avg_score >= self.performance_benchmarks['elite_score_threshold']:
-            if win_rate >= 55:
-                analysis['player_type'] = "Elite Carry (High skill + winning team)"
-            else:
-                analysis['player_type'] = "Elite Victim (High skill + bad team)"
-        elif avg_score >= self.performance_benchmarks['good_score_threshold']:
-            analysis['player_type'] = "Solid Contributor"
-        elif win_rate >= 55:
-            analysis['player_type'] = "Team Passenger (Carried by good team)"
-        else:
-            analysis['player_type'] = "Developing Player"
-        
-        # Identify strengths
-        if saves_per_game >= self.performance_benchmarks['elite_saves_threshold']:
-            analysis['strengths'].append("Elite Defender")
-        if goals_per_game >= self.performance_benchmarks['elite_goals_threshold']:
-            analysis['strengths'].append("Offensive Threat")
-        if player_stats.get('assists_per_game', 0) >= 1.0:
-            analysis['strengths'].append("Playmaker")
-        if avg_score >= self.performance_benchmarks['elite_score_threshold']:
-            analysis['strengths'].append("Overall Impact")
-        
-        return analysis
-
 class BLCSXStatsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -573,8 +97,27 @@ class BLCSXStatsCog(commands.Cog):
         
         self.ballchasing_token = ballchasing_token
         self.db = DatabaseManager(database_url)
+        # Awaitable DatabaseManager for handlers: queries run on the shared DB executor, not the event loop
+        self.repo = AsyncRepository(self.db)
         
         self.calculator = DataDrivenDominanceQuotientCalculator()
+        self._percentile_index: Optional[PercentileIndex] = None
+        # Every player's DQ, kept current for single-player (per-replay) updates.
+        # Loaded, updated and swapped on the event loop, only while holding the lock.
+        self.rating_store = DQRatingStore(self.calculator)
+        self._rating_lock = asyncio.Lock()
+        # Per group: when its totals were last read by /blcs_update, and its replay monitor
+        self._group_refreshed_at: Dict[str, datetime] = {}
+        self._replay_monitors: Dict[str, asyncio.Task] = {}
+        ballchasing_service.add_replay_listener(self.on_replay_ingested)
+        # DQ uncertainty from resampled games, bootstrapped once per data generation
+        self.dq_bootstrap = DQBootstrap(self.calculator,
+                                        resamples=int(os.getenv('DQ_BOOTSTRAP_RESAMPLES', DEFAULT_RESAMPLES)))
+        self._dq_intervals: Optional[DQIntervals] = None
+        # Weights live in the calculator YAML; edits are picked up without a restart
+        self.dq_config_watcher = DQConfigWatcher(dq_config_path())
+        self.watch_dq_config.change_interval(seconds=float(os.getenv('DQ_CONFIG_POLL_SECONDS', '30')))
+        self.watch_dq_config.start()
         
         # Performance indicators (emojis removed as requested)
         self.performance_indicators = {
@@ -588,6 +131,72 @@ class BLCSXStatsCog(commands.Cog):
         
         logger.info("BLCSX Stats Cog initialized")
 
+    async def cog_unload(self):
+        self.watch_dq_config.cancel()
+        for monitor in self._replay_monitors.values():
+            monitor.cancel()
+
+    @tasks.loop(seconds=30)
+    async def watch_dq_config(self):
+        """Apply edited DQ weights and re-rate every player in the background"""
+        config = self.dq_config_watcher.poll()
+        if config is None:
+            return
+        try:
+            written = await self.recompute_all_dominance_quotients(config)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"Ignoring DQ config from {self.dq_config_watcher.path}: {e}")
+            return
+        logger.info(f"DQ config reloaded from {self.dq_config_watcher.path}; "
+                    f"re-rated players with the new weights ({len(written)} rows updated)")
+
+    @watch_dq_config.before_loop
+    async def before_watch_dq_config(self):
+        await self.bot.wait_until_ready()
+
+    async def recompute_all_dominance_quotients(self, config: Optional[Dict] = None) -> List[str]:
+        """Re-rate every stored player with the calculator's current weights
+
+        A new config is applied under the rating lock first, so a live update never
+        rates with half-switched weights, and starts a new data generation so the
+        bootstrap intervals and percentile index are rebuilt. The fresh rating store is
+        built on the DB executor, then written and swapped in on the loop; returns the
+        IDs whose DQ or percentile rank changed.
+        """
+        async with self._rating_lock:
+            if config is not None:
+                self.calculator.apply_config(config)
+                self.db.mark_stats_changed()
+            rating_store, rows = await run_db(self._rate_all_players)
+            await self.repo.bulk_upsert_player_statistics(rows)
+            self.rating_store = rating_store
+        return [row['player_id'] for row in rows]
+
+    def _rate_all_players(self) -> Tuple[DQRatingStore, List[Dict]]:
+        """A rating store over every stored player, and the partial rows whose rating moved"""
+        rating_store = DQRatingStore(self.calculator)
+        all_players = self.db.get_all_player_statistics()
+        rows = []
+        for stats, rated in zip(all_players, rating_store.load_rows(all_players)):
+            if (stats.get('dominance_quotient') != rated['dominance_quotient']
+                    or stats.get('percentile_rank') != rated['percentile_rank']):
+                rows.append({key: rated[key] for key in ('player_id', 'dominance_quotient', 'percentile_rank')})
+        return rating_store, rows
+
+    def get_percentile_index(self, all_players: List[Dict]) -> PercentileIndex:
+        """Percentile index for the current data generation, rebuilt only after stats change"""
+        generation = self.db.stats_generation
+        if self._percentile_index is None or self._percentile_index.generation != generation:
+            self._percentile_index = PercentileIndex(all_players, generation=generation)
+        return self._percentile_index
+
+    def get_dq_intervals(self, all_players: List[Dict]) -> DQIntervals:
+        """Bootstrap DQ intervals for the current data generation, recomputed only after stats change"""
+        generation = self.db.stats_generation
+        if self._dq_intervals is None or self._dq_intervals.generation != generation:
+            self._dq_intervals = self.dq_bootstrap.intervals(all_players, generation)
+        return self._dq_intervals
+
     def get_performance_indicator(self, percentile: float) -> Dict:
         """Get performance indicator based on percentile"""
         for level, data in self.performance_indicators.items():
@@ -596,15 +205,15 @@ class BLCSXStatsCog(commands.Cog):
         return self.performance_indicators['terrible']
 
     @discord.slash_command(name="blcs_profile", description="Show comprehensive BLCSX player profile with rankings")
-    async def profile_command(self, ctx, player: discord.Member = None):
-        """Modern profile command with detailed rankings"""
+    async def profile_command(self, ctx, player: discord.Member = None, explain: bool = False):
+        """Modern profile command with detailed rankings; explain adds the DQ breakdown"""
         target_user = player or ctx.author
         
         await ctx.response.defer()
         
         try:
-            # Get player mapping
-            mapping = self.db.get_player_mapping(target_user.id)
+            # Get player mapping and statistics in one query
+            mapping, player_stats = await self.repo.get_player_by_discord_id(target_user.id)
             if not mapping:
                 embed = discord.Embed(
                     title="Player Not Found",
@@ -614,8 +223,6 @@ class BLCSXStatsCog(commands.Cog):
                 await ctx.followup.send(embed=embed)
                 return
             
-            # Get player statistics
-            player_stats = self.db.get_player_statistics(mapping['ballchasing_player_id'])
             if not player_stats:
                 embed = discord.Embed(
                     title="No Statistics",
@@ -626,10 +233,14 @@ class BLCSXStatsCog(commands.Cog):
                 return
             
             # Get all players for comparison
-            all_players = self.db.get_all_player_statistics()
+            all_players = await self.repo.get_all_player_statistics()
+            
+            # Bootstrapping can take a moment on a fresh data generation
+            intervals = await asyncio.to_thread(self.get_dq_intervals, all_players)
             
             # Generate modern profile embed
-            embed = self.create_profile_embed(target_user, player_stats, all_players)
+            embed = self.create_profile_embed(target_user, player_stats, all_players, explain=explain,
+                                              intervals=intervals)
             
             await ctx.followup.send(embed=embed)
             
@@ -642,7 +253,8 @@ class BLCSXStatsCog(commands.Cog):
             )
             await ctx.followup.send(embed=embed)
 
-    def create_profile_embed(self, user: discord.User, player_stats: Dict, all_players: List[Dict]) -> discord.Embed:
+    def create_profile_embed(self, user: discord.User, player_stats: Dict, all_players: List[Dict],
+                             explain: bool = False, intervals: Optional[DQIntervals] = None) -> discord.Embed:
         """Create modern profile embed with rankings and indicators"""
         
         # Calculate win rate and basic stats
@@ -653,13 +265,12 @@ class BLCSXStatsCog(commands.Cog):
                              self.calculator.calculate_dominance_quotient(player_stats, all_players))
         
         # Calculate ranking
-        all_dqs = [p.get('dominance_quotient', 50.0) for p in all_players]
-        dq_ranking = self.calculator.calculate_percentile(dq, all_dqs)
+        index = self.get_percentile_index(all_players)
+        dq_ranking = index.percentile('dominance_quotient', dq)
         dq_indicator = self.get_performance_indicator(dq_ranking)
         
         # Calculate overall rank for player name prefix
-        all_dqs_sorted = sorted(all_dqs, reverse=True)
-        overall_rank = all_dqs_sorted.index(dq) + 1 if dq in all_dqs_sorted else len(all_dqs) + 1
+        overall_rank = index.rank('dominance_quotient', dq) or len(all_players) + 1
 
         # Helper to get rank emoji prefix for player name
         def _get_player_name_prefix(rank: int) -> str:
@@ -684,10 +295,12 @@ class BLCSXStatsCog(commands.Cog):
         embed.set_thumbnail(url=user.display_avatar.url)
         
         # === DOMINANCE QUOTIENT (Most Important) ===
+        dq_interval = intervals.describe(player_stats['player_id']) if intervals else ""
         embed.add_field(
             name="PERFORMANCE SCORE (Overall Skill)",
             value=f"**DQ: {dq:.1f}** ({dq_indicator['name']})\n"
-                  f"Percentile: {dq_ranking:.1f}th",
+                  + (f"{dq_interval} over {player_stats['games_played']} games\n" if dq_interval else "")
+                  + f"Percentile: {dq_ranking:.1f}th",
             inline=False
         )
         
@@ -704,23 +317,18 @@ class BLCSXStatsCog(commands.Cog):
         
         # Helper to get rank display with emojis
         def _get_stat_rank_display(player_value, all_players_data, stat_key, higher_is_better=True):
-            all_values = sorted([p.get(stat_key, 0) for p in all_players_data if p.get(stat_key) is not None], reverse=higher_is_better)
-            if not all_values:
+            rank = index.rank(stat_key, player_value, higher_is_better)
+            if rank is None:
                 return ""
+            total = index.size(stat_key)
             
-            try:
-                rank = all_values.index(player_value) + 1
-                total = len(all_values)
-                
-                if rank <= 3: # Top 3
-                    if rank == 1: return " 🥇"
-                    if rank == 2: return " 🥈"
-                    if rank == 3: return " 🥉"
-                elif rank > total - 3: # Bottom 3
-                    return " 🔻"
-                return ""
-            except ValueError: 
-                return ""
+            if rank <= 3: # Top 3
+                if rank == 1: return " 🥇"
+                if rank == 2: return " 🥈"
+                if rank == 3: return " 🥉"
+            elif rank > total - 3: # Bottom 3
+                return " 🔻"
+            return ""
 
         key_stats.append(f"Average Score: {player_stats.get('avg_score', 0):.0f}{_get_stat_rank_display(player_stats.get('avg_score', 0), all_players, 'avg_score', higher_is_better=True)}")
         key_stats.append(f"Goals/Game: {player_stats.get('goals_per_game', 0):.2f}{_get_stat_rank_display(player_stats.get('goals_per_game', 0), all_players, 'goals_per_game', higher_is_better=True)}")
@@ -737,6 +345,14 @@ class BLCSXStatsCog(commands.Cog):
         
         
         
+        if explain:
+            explanation = self.calculator.explain_dominance_quotient(player_stats, all_players)
+            embed.add_field(
+                name="DQ Breakdown",
+                value="```\n" + "\n".join(explanation.lines()) + "\n```",
+                inline=False
+            )
+        
         embed.set_footer(text=f"BLCSX Season 4 | Last updated: {player_stats.get('last_updated', 'Unknown')}")
         
         return embed
@@ -749,11 +365,11 @@ class BLCSXStatsCog(commands.Cog):
         logger.info(f"Processing group data for {group_id}")
         
         async with BallchasingAPI(self.ballchasing_token) as api:
-            group_data = await api.get_group_data(group_id)
-            if not group_data:
+            group_columns = await api.get_group_columns(group_id, {'players': PLAYER_STAT_FIELDS})
+            if group_columns is None:
                 raise Exception("Failed to get group data")
             
-            players_data = group_data.get('players', [])
+            players_data = group_columns.records('players')
             logger.info(f"Found {len(players_data)} players")
             
             # Process individual player statistics
@@ -763,20 +379,60 @@ class BLCSXStatsCog(commands.Cog):
                 if player_stats:
                     processed_players.append(player_stats)
             
-            # Calculate dominance quotients for all players
-            for player_stats in processed_players:
-                player_stats['dominance_quotient'] = self.calculator.calculate_dominance_quotient(player_stats, processed_players)
-
-            # Now that all DQs are calculated, determine percentile ranks and update the database
-            all_dqs = [p['dominance_quotient'] for p in processed_players]
-            for player_stats in processed_players:
-                percentile_rank = self.calculator.calculate_percentile(player_stats['dominance_quotient'], all_dqs)
-                player_stats['percentile_rank'] = percentile_rank
+            # Replays uploaded from here on are not in these totals; live updates fold them in
+            refreshed_at = datetime.utcnow()
+            
+            async with self._rating_lock:
+                # Calculate dominance quotients and percentile ranks for all players in one pass
+                processed_players = self.rating_store.load_rows(processed_players)
                 
-                # Update database with the fully processed stats
-                self.db.update_player_statistics(player_stats)
+                # Every fully processed row in one transaction
+                await self.repo.bulk_upsert_player_statistics(processed_players)
+            self._group_refreshed_at[group_id] = refreshed_at
             
+            # Movers are read from these snapshots rather than recomputed
+            await self.repo.record_stat_snapshot(processed_players)
             logger.info(f"Processed {len(processed_players)} players successfully")
+
+    def start_live_updates(self, group_id: str):
+        """Monitor a group for new replays and fold each one into the stored ratings"""
+        monitor = self._replay_monitors.get(group_id)
+        if monitor is None or monitor.done():
+            self._replay_monitors[group_id] = asyncio.create_task(
+                ballchasing_service.monitor_group_for_updates(group_id))
+            logger.info(f"Live updates started for group {group_id}")
+
+    async def on_replay_ingested(self, group_id: str, replay: Dict, uploaded_at: Optional[datetime]):
+        """Replay listener: fold each known player's game into their stored stats and re-rate"""
+        refreshed_at = self._group_refreshed_at.get(group_id)
+        if refreshed_at is None or uploaded_at is None or uploaded_at <= refreshed_at:
+            # Already counted in the totals of the group's last /blcs_update (or not refreshed since a restart)
+            return
+        
+        async with self._rating_lock:
+            if not len(self.rating_store):
+                self.rating_store.load_rows(await self.repo.get_all_player_statistics())
+            for replay_stats in ballchasing_service.extract_player_stats(replay):
+                player_id = f"{replay_stats['platform'].lower()}:{replay_stats['player_id']}"
+                stored = self.rating_store.players.get(player_id)
+                if stored is None:
+                    # Not in the league table yet; the next /blcs_update adds them
+                    continue
+                await self.apply_player_update(fold_replay_stats(stored, replay_stats))
+
+    async def apply_player_update(self, player_stats: Dict) -> List[str]:
+        """Store one player's fresh stats and re-rate only the players that update moves
+
+        For live (per-replay) updates; call with self._rating_lock held. Returns the
+        IDs whose stored DQ or percentile rank changed.
+        """
+        rows = self.rating_store.apply_update(player_stats)
+        # The updated player's full row and everyone else's new rating, in one transaction
+        if await self.repo.bulk_upsert_player_statistics(rows) != len(rows):
+            # The store is now ahead of the database; reload it from what was stored next time
+            self.rating_store.clear()
+            return []
+        return [row['player_id'] for row in rows]
     
     def extract_player_stats(self, player_data: Dict, season_id: str) -> Dict:
         """Extract and calculate player statistics from API data"""
@@ -796,7 +452,6 @@ class BLCSXStatsCog(commands.Cog):
                 logger.error(f"Could not determine player_id from platform_info: {player_data}")
                 return None
             
-            logger.info(f"Extracted player_id from Ballchasing API: {player_id}")
             cumulative = player_data.get('cumulative', {})
             game_average = player_data.get('game_average', {})
             
@@ -823,7 +478,7 @@ class BLCSXStatsCog(commands.Cog):
                 'dominance_quotient': 0,
                 'percentile_rank': 0
             }
-            logger.info(f"Returning extracted stats for {player_id}: {extracted_stats}")
+            logger.debug("Extracted stats for %s: %s", player_id, extracted_stats)
             return extracted_stats
         except Exception as e:
             logger.error(f"Error extracting player stats: {e}")
@@ -832,15 +487,15 @@ class BLCSXStatsCog(commands.Cog):
     # === SLASH COMMANDS ===
 
     @discord.slash_command(name="blcs_profile", description="Show comprehensive BLCSX player profile with rankings")
-    async def profile_command(self, ctx, player: discord.Member = None):
-        """Modern profile command with detailed rankings"""
+    async def profile_command(self, ctx, player: discord.Member = None, explain: bool = False):
+        """Modern profile command with detailed rankings; explain adds the DQ breakdown"""
         target_user = player or ctx.author
         
         await ctx.response.defer()
         
         try:
-            # Get player mapping
-            mapping = self.db.get_player_mapping(target_user.id)
+            # Get player mapping and statistics in one query
+            mapping, player_stats = await self.repo.get_player_by_discord_id(target_user.id)
             if not mapping:
                 embed = discord.Embed(
                     title="Player Not Found",
@@ -850,8 +505,6 @@ class BLCSXStatsCog(commands.Cog):
                 await ctx.followup.send(embed=embed)
                 return
             
-            # Get player statistics
-            player_stats = self.db.get_player_statistics(mapping['ballchasing_player_id'])
             if not player_stats:
                 embed = discord.Embed(
                     title="No Statistics",
@@ -862,10 +515,14 @@ class BLCSXStatsCog(commands.Cog):
                 return
             
             # Get all players for comparison
-            all_players = self.db.get_all_player_statistics()
+            all_players = await self.repo.get_all_player_statistics()
+            
+            # Bootstrapping can take a moment on a fresh data generation
+            intervals = await asyncio.to_thread(self.get_dq_intervals, all_players)
             
             # Generate modern profile embed
-            embed = self.create_profile_embed(target_user, player_stats, all_players)
+            embed = self.create_profile_embed(target_user, player_stats, all_players, explain=explain,
+                                              intervals=intervals)
             
             await ctx.followup.send(embed=embed)
             
@@ -901,7 +558,7 @@ class BLCSXStatsCog(commands.Cog):
         
         try:
             # Add mapping to database
-            self.db.add_player_mapping(
+            await self.repo.add_player_mapping(
                 ctx.author.id,
                 ctx.author.display_name,
                 formatted_player_id,
@@ -931,27 +588,28 @@ class BLCSXStatsCog(commands.Cog):
         await ctx.response.defer()
 
         try:
+            # Both players' mappings and stats in one query
+            players = await self.repo.get_players_by_discord_ids([player1.id, player2.id])
+
             # Get stats for Player 1
-            mapping1 = self.db.get_player_mapping(player1.id)
+            mapping1, stats1 = players.get(player1.id, (None, None))
             if not mapping1 or not mapping1.get('ballchasing_player_id'):
                 await ctx.followup.send(f"❌ {player1.display_name} has not linked their ballchasing.com account.", ephemeral=True)
                 return
-            stats1 = self.db.get_player_statistics(mapping1['ballchasing_player_id'])
             if not stats1:
                 await ctx.followup.send(f"📊 No statistics found for {player1.display_name}.", ephemeral=True)
                 return
 
             # Get stats for Player 2
-            mapping2 = self.db.get_player_mapping(player2.id)
+            mapping2, stats2 = players.get(player2.id, (None, None))
             if not mapping2 or not mapping2.get('ballchasing_player_id'):
                 await ctx.followup.send(f"❌ {player2.display_name} has not linked their ballchasing.com account.", ephemeral=True)
                 return
-            stats2 = self.db.get_player_statistics(mapping2['ballchasing_player_id'])
             if not stats2:
                 await ctx.followup.send(f"📊 No statistics found for {player2.display_name}.", ephemeral=True)
                 return
 
-            all_players_data = self.db.get_all_player_statistics()
+            all_players_data = await self.repo.get_all_player_statistics()
 
             embed = discord.Embed(
                 title=f"📊 {player1.display_name} vs {player2.display_name}",
@@ -1174,8 +832,8 @@ class BLCSXStatsCog(commands.Cog):
 
         # Get overall DQ and its percentile
         dq = player_stats.get('dominance_quotient', 0)
-        all_dqs = [p.get('dominance_quotient', 0) for p in all_players_data]
-        dq_percentile = self.calculator.calculate_percentile(dq, all_dqs)
+        index = self.get_percentile_index(all_players_data)
+        dq_percentile = index.percentile('dominance_quotient', dq)
 
         # Overall performance summary
         if dq_percentile >= 90:
@@ -1211,10 +869,9 @@ class BLCSXStatsCog(commands.Cog):
 
         for stat_key, info in stats_to_check.items():
             player_value = player_stats.get(stat_key, 0)
-            all_values = [p.get(stat_key, 0) for p in all_players_data if p.get(stat_key) is not None]
-            if not all_values: continue
+            if not index.size(stat_key): continue
             
-            stat_percentile = self.calculator.calculate_percentile(player_value, all_values)
+            stat_percentile = index.percentile(stat_key, player_value)
 
             if stat_percentile >= 90:
                 stat_highlights.append(f"Their {info['name']} per game ({player_value:.2f}) was exceptional, ranking among the league's best.")
@@ -1238,16 +895,15 @@ class BLCSXStatsCog(commands.Cog):
         await ctx.response.defer()
 
         try:
-            mapping = self.db.get_player_mapping(target_user.id)
+            mapping, stats = await self.repo.get_player_by_discord_id(target_user.id)
             if not mapping or not mapping.get('ballchasing_player_id'):
                 await ctx.followup.send(f"❌ {target_user.display_name} has not linked their ballchasing.com account. Cannot generate summary.", ephemeral=True)
                 return
-            stats = self.db.get_player_statistics(mapping['ballchasing_player_id'])
             if not stats:
                 await ctx.followup.send(f"📊 No statistics found for {target_user.display_name}. Cannot generate summary.", ephemeral=True)
                 return
             
-            all_players = self.db.get_all_player_statistics()
+            all_players = await self.repo.get_all_player_statistics()
             summary_message = self._generate_player_summary(stats, all_players)
 
             embed = discord.Embed(
@@ -1287,7 +943,7 @@ class BLCSXStatsCog(commands.Cog):
             formatted_player_id = player_id
 
         try:
-            self.db.add_player_mapping(
+            await self.repo.add_player_mapping(
                 user.id,
                 user.display_name,
                 formatted_player_id,
@@ -1329,6 +985,7 @@ class BLCSXStatsCog(commands.Cog):
         
         try:
             await self.process_group_data(group_id)
+            self.start_live_updates(group_id)
             
             embed = discord.Embed(
                 title="Data Updated",
@@ -1362,9 +1019,7 @@ class BLCSXStatsCog(commands.Cog):
         await ctx.response.defer(ephemeral=True)
 
         try:
-            with self.db.Session() as session:
-                session.query(PlayerStatistics).delete()
-                session.commit()
+            await self.repo.clear_player_statistics()
             embed = discord.Embed(
                 title="✅ Player Statistics Cleared",
                 description="All player statistics have been successfully removed from the database.",
@@ -1400,7 +1055,7 @@ class BLCSXStatsCog(commands.Cog):
 
             
 
-            all_players = self.db.get_all_player_statistics()
+            all_players = await self.repo.get_all_player_statistics()
             df = pd.DataFrame(all_players)
             df = df[["player_id", "discord_username"]]
             df['player_id'] = df['player_id'].str.split(":").str[1]
@@ -1449,7 +1104,7 @@ class BLCSXStatsCog(commands.Cog):
                 logger.error("Can not find config yaml file for channel id")
                 logger.error(f"Error: {e}")
             
-            all_players = self.db.get_all_player_statistics()
+            all_players = await self.repo.get_all_player_statistics()
             df = pd.DataFrame(all_players)
             logger.info(df.columns)
             
@@ -1600,8 +1255,8 @@ class BLCSXStatsCog(commands.Cog):
         """Enhanced leaderboard with performance indicators"""
         
         try:
-            all_players = self.db.get_all_player_statistics()
-            all_mappings = self.db.get_all_player_mappings()
+            all_players = await self.repo.get_all_player_statistics()
+            all_mappings = await self.repo.get_all_player_mappings()
             
             # Create a lookup table for player names
             # This is no longer needed due to the JOIN in the query
@@ -1617,6 +1272,7 @@ class BLCSXStatsCog(commands.Cog):
             
             # The list is already sorted by the database query
             limited_players = all_players[:min(limit, len(all_players))]
+            intervals = await asyncio.to_thread(self.get_dq_intervals, all_players)
             
             # Create leaderboard embed
             embed = discord.Embed(
@@ -1646,7 +1302,9 @@ class BLCSXStatsCog(commands.Cog):
                     medal = f"{i}."
                 
                 leaderboard_text += f"{medal} **{player_name}** ({indicator['name']})\n"
-                leaderboard_text += f"    DQ: **{dq:.1f}** | Avg Score: **{player.get('avg_score', 0):.0f}** | {win_rate:.1f}% WR\n\n"
+                bounds = intervals.get(player['player_id'])
+                dq_range = f" ({bounds[0]:.0f}-{bounds[1]:.0f})" if bounds else ""
+                leaderboard_text += f"    DQ: **{dq:.1f}**{dq_range} | Avg Score: **{player.get('avg_score', 0):.0f}** | {win_rate:.1f}% WR\n\n"
             
             embed.add_field(
                 name="📊 Rankings",
@@ -1654,7 +1312,8 @@ class BLCSXStatsCog(commands.Cog):
                 inline=False
             )
             
-            embed.set_footer(text=f"Showing top {len(limited_players)} of {len(all_players)} players")
+            embed.set_footer(text=f"Showing top {len(limited_players)} of {len(all_players)} players"
+                                  f" | DQ ranges: {intervals.level * 100:.0f}% bootstrap intervals")
             
             await ctx.response.send_message(embed=embed)
             
@@ -1667,6 +1326,54 @@ class BLCSXStatsCog(commands.Cog):
             )
             await ctx.response.send_message(embed=embed)
 
+    @discord.slash_command(name="blcs_movers", description="Show the biggest DQ risers and fallers since the last update")
+    async def movers_command(self, ctx, limit: int = 5):
+        """Biggest DQ changes between the last two data updates, read from the stored snapshots"""
+        
+        try:
+            risers, fallers = await self.repo.get_dq_movers(limit=max(1, min(limit, 25)))
+            
+            if not risers and not fallers:
+                embed = discord.Embed(
+                    title="No Movement Yet",
+                    description="Movers need at least two data updates. Use `/blcs_update` to fetch them.",
+                    color=discord.Color.orange()
+                )
+                await ctx.response.send_message(embed=embed)
+                return
+            
+            def format_movers(rows):
+                lines = []
+                for i, row in enumerate(rows, 1):
+                    player_name = row.get('discord_username') or row['player_id']
+                    dq = row.get('dominance_quotient') or 0
+                    games = f" over {row['games_delta']:+d} games" if row.get('games_delta') else ""
+                    lines.append(f"{i}. **{player_name}** {dq - row['dq_delta']:.1f} → **{dq:.1f}** "
+                                 f"({row['dq_delta']:+.1f}){games}")
+                return "\n".join(lines) or "Nobody"
+            
+            embed = discord.Embed(
+                title="📈 BLCSX Movers",
+                description="Biggest Dominance Quotient changes since the previous update",
+                color=discord.Color.blue()
+            )
+            embed.add_field(name="Risers", value=format_movers(risers), inline=False)
+            embed.add_field(name="Fallers", value=format_movers(fallers), inline=False)
+            
+            taken_at = (risers or fallers)[0]['snapshot_at']
+            embed.set_footer(text=f"Snapshot taken {taken_at:%Y-%m-%d %H:%M} UTC")
+            
+            await ctx.response.send_message(embed=embed)
+            
+        except Exception as e:
+            logger.error(f"Error in movers command: {e}")
+            embed = discord.Embed(
+                title="Error",
+                description="An error occurred while finding the biggest movers.",
+                color=discord.Color.red()
+            )
+            await ctx.response.send_message(embed=embed)
+
     @discord.slash_command(name="roast", description="Get roasted based on your BLCSX stats!")
     async def roast_command(self, ctx, player: discord.Member = None):
         """Roasts a player based on their statistics."""
@@ -1674,16 +1381,15 @@ class BLCSXStatsCog(commands.Cog):
         await ctx.response.defer()
 
         try:
-            mapping = self.db.get_player_mapping(target_user.id)
+            mapping, stats = await self.repo.get_player_by_discord_id(target_user.id)
             if not mapping or not mapping.get('ballchasing_player_id'):
                 await ctx.followup.send(f"❌ {target_user.display_name} has not linked their ballchasing.com account. Can't roast what I can't see!", ephemeral=True)
                 return
-            stats = self.db.get_player_statistics(mapping['ballchasing_player_id'])
             if not stats:
                 await ctx.followup.send(f"📊 No statistics found for {target_user.display_name}. Can't roast what isn't there!", ephemeral=True)
                 return
             
-            all_players = self.db.get_all_player_statistics()
+            all_players = await self.repo.get_all_player_statistics()
             roast_message = self._generate_roast(stats, all_players)
 
             embed = discord.Embed(
@@ -1707,7 +1413,7 @@ class BLCSXStatsCog(commands.Cog):
         async def stat_leaderboard_command(self, ctx, limit: int = 10):
             """Generates a leaderboard for a specific statistic."""
             try:
-                all_players = self.db.get_all_player_statistics()
+                all_players = await self.repo.get_all_player_statistics()
                 
                 if not all_players:
                     embed = discord.Embed(
@@ -9,6 +9,8 @@ from typing import Dict, List, Tuple, NamedTuple
 from datetime import datetime, timedelta
 import discord.utils
 
+from models.async_db import run_db
+
 # Import database functions
 try:
     from models.scheduling import save_session, delete_session, get_all_active_sessions, load_session, SchedulingSession as DBSchedulingSession
@@ -45,7 +47,7 @@ class AskPlayerView(discord.ui.View):
     async def confirm(self, button: discord.ui.Button, interaction: discord.Interaction):
         user_id = str(interaction.user.id)
         self.session.confirmations[user_id] = True
-        save_session(self.session)
+        await run_db(save_session, self.session)
 
         await interaction.response.send_message("Thanks for confirming! The other players will now be asked to confirm this time.")
 
@@ -77,7 +79,7 @@ class ConfirmationView(discord.ui.View):
     async def confirm_game(self, button: discord.ui.Button, interaction: discord.Interaction):
         user_id = str(interaction.user.id)
 
-        session = load_session(self.session.channel_id)
+        session = await run_db(load_session, self.session.channel_id)
         if not session:
             await interaction.response.send_message("Error: Could not find the scheduling session.", ephemeral=True)
             return
@@ -87,7 +89,7 @@ class ConfirmationView(discord.ui.View):
             return
 
         session.confirmations[user_id] = True
-        updated_session = save_session(session)
+        updated_session = await run_db(save_session, session)
         if updated_session:
             self.cog.active_sessions[int(updated_session.channel_id)] = updated_session
             session = updated_session # Use the updated session for the rest of the logic
@@ -120,7 +122,7 @@ class ConfirmationView(discord.ui.View):
             await channel.send("@everyone")
             await channel.send(embed=final_embed)
 
-            delete_session(session.channel_id)
+            await run_db(delete_session, session.channel_id)
             if int(session.channel_id) in self.cog.active_sessions:
                 del self.cog.active_sessions[int(session.channel_id)]
 
@@ -129,7 +131,7 @@ class ConfirmationView(discord.ui.View):
     async def decline_game(self, button: discord.ui.Button, interaction: discord.Interaction):
         user_id = str(interaction.user.id)
 
-        session = load_session(self.session.channel_id)
+        session = await run_db(load_session, self.session.channel_id)
         if not session:
             await interaction.response.send_message("Error: Could not find the scheduling session.", ephemeral=True)
             return
@@ -139,7 +141,7 @@ class ConfirmationView(discord.ui.View):
             return
 
         session.confirmations[user_id] = False
-        updated_session = save_session(session)
+        updated_session = await run_db(save_session, session)
         if updated_session:
             self.cog.active_sessions[int(updated_session.channel_id)] = updated_session
             session = updated_session
@@ -282,7 +284,7 @@ class DraftLotteryCog(commands.Cog):
             await self.bot.wait_until_ready()
             print("DEBUG: Bot is ready, proceeding to load sessions.")
             
-            active_sessions = get_all_active_sessions()
+            active_sessions = await run_db(get_all_active_sessions)
             print(f"DEBUG: Found {len(active_sessions)} active sessions in database.")
 
             for db_session in active_sessions:
@@ -305,14 +307,14 @@ class DraftLotteryCog(commands.Cog):
         now = datetime.now()
         # Sunday at 12:00 PM
         if now.weekday() == 6 and now.hour == 12:
-            active_sessions = get_all_active_sessions()
+            active_sessions = await run_db(get_all_active_sessions)
             for session in active_sessions:
                 # --- FIX: Update session for the new week ---
                 session.schedule_dates = session.generate_next_week()  # Generate new dates
                 session.player_schedules = {} # Clear all submitted schedules
                 session.proposed_times = []   # Clear old proposals
                 session.confirmations = {}    # Clear old confirmations
-                save_session(session)         # Save changes to the database
+                await run_db(save_session, session)         # Save changes to the database
                 # --- END FIX ---
 
                 channel = self.bot.get_channel(int(session.channel_id))
@@ -326,7 +328,7 @@ class DraftLotteryCog(commands.Cog):
     @tasks.loop(hours=4)
     async def dm_unconfirmed_players(self):
         """Periodically sends a DM reminder to players who haven't confirmed a proposed game time."""
-        active_sessions = get_all_active_sessions()
+        active_sessions = await run_db(get_all_active_sessions)
         for session in active_sessions:
             if not session.proposed_times:
                 continue  # Skip if no time has been proposed yet
@@ -827,8 +829,8 @@ class DraftLotteryCog(commands.Cog):
         
         new_session_obj = DBSchedulingSession(channel_id=str(channel_id), team1=team1, team2=team2)
         
-        save_session(new_session_obj)
-        session = load_session(channel_id)
+        await run_db(save_session, new_session_obj)
+        session = await run_db(load_session, channel_id)
 
         if not session:
             await ctx.respond("❌ **Error:** Could not save the new scheduling session to the database. Please check the logs.", ephemeral=True)
@@ -859,7 +861,7 @@ class DraftLotteryCog(commands.Cog):
     async def my_schedule(self, ctx):
         user_id = ctx.author.id
         
-        session = load_session(ctx.channel.id)
+        session = await run_db(load_session, ctx.channel.id)
         if not session:
             await ctx.respond("No active scheduling session found in this channel. Please ask an admin to start one with `/schedule_game`.", ephemeral=True)
             return
@@ -939,7 +941,7 @@ class DraftLotteryCog(commands.Cog):
                     'day': best_day,
                     'time': best_time
                 })
-                save_session(session)
+                await run_db(save_session, session)
                 
                 embed = discord.Embed(
                     title="��� Proposed Game Time (6/6 Match!)",
@@ -1007,7 +1009,7 @@ class DraftLotteryCog(commands.Cog):
                         'day': best_day_5_of_6,
                         'time': best_time
                     })
-                    save_session(session)
+                    await run_db(save_session, session)
 
                     embed = discord.Embed(
                         title="Flexible Game Time Proposal",
@@ -1034,7 +1036,7 @@ class DraftLotteryCog(commands.Cog):
         channel_id = ctx.channel.id
         session = self.active_sessions.get(channel_id)
         if not session:
-            session = load_session(channel_id)
+            session = await run_db(load_session, channel_id)
             if not session:
                 await ctx.respond("No active scheduling session in this channel.", ephemeral=True)
                 return
@@ -1081,7 +1083,7 @@ class DraftLotteryCog(commands.Cog):
         
         if channel_id in self.active_sessions:
             del self.active_sessions[channel_id]
-            delete_session(channel_id)
+            await run_db(delete_session, channel_id)
             await ctx.respond("❌ Scheduling session cancelled.")
         else:
             await ctx.respond("No active scheduling session to cancel.", ephemeral=True)
@@ -1092,7 +1094,7 @@ class DraftLotteryCog(commands.Cog):
         
         session = self.active_sessions.get(channel_id)
         if not session:
-            session = load_session(channel_id)
+            session = await run_db(load_session, channel_id)
             if not session:
                 await ctx.respond("No active scheduling session in this channel.", ephemeral=True)
                 return
@@ -1308,7 +1310,7 @@ class DraftLotteryCog(commands.Cog):
         try:
             from models.scheduling import get_all_active_sessions
             
-            active_sessions = get_all_active_sessions()
+            active_sessions = await run_db(get_all_active_sessions)
             
             if not active_sessions:
                 await ctx.followup.send("No active scheduling sessions found.")
@@ -1388,7 +1390,7 @@ class DraftLotteryCog(commands.Cog):
         channel_id = ctx.channel.id
         session = self.active_sessions.get(channel_id)
         if not session:
-            session = load_session(channel_id)
+            session = await run_db(load_session, channel_id)
             if not session:
                 await ctx.respond("No active scheduling session in this channel.", ephemeral=True)
                 return
@@ -1499,19 +1501,19 @@ class DraftLotteryCog(commands.Cog):
             from sqlalchemy import text
             import time
             
-            start_time = time.time()
-            
-            with engine.connect() as conn:
-                result = conn.execute(text("SELECT 1"))
-                result.fetchone()
+            def ping():
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1")).fetchone()
             
+            start_time = time.time()
+            await run_db(ping)
             connection_time = (time.time() - start_time) * 1000
             
             db_url = str(engine.url)
             db_type = "PostgreSQL" if "postgresql" in db_url else "SQLite"
             
             try:
-                active_sessions = get_all_active_sessions()
+                active_sessions = await run_db(get_all_active_sessions)
                 session_count = len(active_sessions)
             except Exception as e:
                 session_count = f"Error: {e}"
@@ -1526,6 +1528,14 @@ class DraftLotteryCog(commands.Cog):
             embed.add_field(name="Active Sessions", value=str(session_count), inline=True)
             embed.add_field(name="Memory Sessions", value=str(len(self.active_sessions)), inline=True)
             
+            from models.engine_registry import engine_registry
+            pool_lines = [
+                f"{pool.get('checked_out', 0)}/{pool.get('size', 1) + pool.get('max_overflow', 0)} in use, "
+                f"peak {pool['peak_checked_out']}, {pool['connects']} connects"
+                for pool in engine_registry.pool_status().values()
+            ]
+            embed.add_field(name="Connection Pools", value="\n".join(pool_lines) or "None", inline=False)
+            
             masked_url = db_url.split('@')[0] + '@***' if '@' in db_url else db_url
             embed.add_field(name="Database URL", value=f"`{masked_url}`", inline=False)
             
@@ -1564,7 +1574,7 @@ class DraftLotteryCog(commands.Cog):
                 }
             
             try:
-                db_sessions = get_all_active_sessions()
+                db_sessions = await run_db(get_all_active_sessions)
                 for db_session in db_sessions:
                     if str(db_session.channel_id) not in sessions_data:
                         sessions_data[str(db_session.channel_id)] = {
@@ -1608,7 +1618,7 @@ class DraftLotteryCog(commands.Cog):
         try:
             from models.scheduling import get_all_active_sessions
             
-            db_sessions = get_all_active_sessions()
+            db_sessions = await run_db(get_all_active_sessions)
             
             embed = discord.Embed(
                 title="🔍 Session Debug",
@@ -1652,7 +1662,7 @@ class DraftLotteryCog(commands.Cog):
             old_count = len(self.active_sessions)
             self.active_sessions.clear()
             
-            db_sessions = get_all_active_sessions()
+            db_sessions = await run_db(get_all_active_sessions)
             loaded_count = 0
             
             for db_session in db_sessions:
@@ -1677,7 +1687,7 @@ class DraftLotteryCog(commands.Cog):
     async def cleanup_duplicate_players(self, ctx):
         await ctx.defer(ephemeral=True)
         
-        active_sessions = get_all_active_sessions()
+        active_sessions = await run_db(get_all_active_sessions)
         cleaned_sessions = 0
         
         for session in active_sessions:
@@ -1757,7 +1767,7 @@ class DraftLotteryCog(commands.Cog):
         channel_id = ctx.channel.id
         session = self.active_sessions.get(channel_id)
         if not session:
-            session = load_session(channel_id)
+            session = await run_db(load_session, channel_id)
             if not session:
                 await ctx.respond("No active scheduling session in this channel.", ephemeral=True)
                 return
@@ -1765,7 +1775,7 @@ class DraftLotteryCog(commands.Cog):
 
         if user_id in session.player_schedules:
             del session.player_schedules[user_id]
-            save_session(session)
+            await run_db(save_session, session)
             await ctx.respond(f"✅ Schedule for user ID {user_id} removed from this session.", ephemeral=True)
         else:
             await ctx.respond(f"User ID {user_id} does not have a submitted schedule in this session.", ephemeral=True)
@@ -1866,7 +1876,7 @@ class CalendarScheduleView(discord.ui.View):
                 await interaction.response.send_message("This is not your schedule!", ephemeral=True)
                 return
 
-            session = load_session(self.channel_id)
+            session = await run_db(load_session, self.channel_id)
             if not session:
                 await interaction.response.send_message("Error: Could not find the scheduling session.", ephemeral=True)
                 return
@@ -1888,9 +1898,9 @@ class CalendarScheduleView(discord.ui.View):
 
             session.player_schedules[str(self.user_id)] = player_schedule_for_db
 
-            save_session(session)
+            await run_db(save_session, session)
             # Reload the session from the database to ensure the cache is updated with the latest data
-            updated_session = load_session(session.channel_id)
+            updated_session = await run_db(load_session, session.channel_id)
             if updated_session:
                 self.cog.active_sessions[int(updated_session.channel_id)] = updated_session
                 session = updated_session # Use the reloaded session for subsequent operations
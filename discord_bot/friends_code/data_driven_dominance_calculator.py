@@ -3,56 +3,26 @@ import pandas as pd
 from typing import Dict, List, Optional
 import logging
 
+from utils.dominance_quotient import DQWeights, load_dq_config
+
 logger = logging.getLogger(__name__)
 
 class DataDrivenDominanceQuotientCalculator:
-    def __init__(self):
+    def __init__(self, config: Optional[Dict] = None):
         """
         Dominance Quotient calculator based on BLCS4 season analysis
         Designed to identify individual skill regardless of team performance
+
+        Weights, tournament adjustments and performance benchmarks are the bot's:
+        the dominance_quotient section of shared/config/conf/blcsx_calculator_config.yaml
+        (key insight from BLCS4: individual stats matter WAY more than team success).
         """
-        
-        # Weights based on BLCS4 data analysis
-        # Key insight: Individual stats matter WAY more than team success
-        self.stat_weights = {
-            # Core individual performance (90% total weight)
-            'avg_score': 0.40,              # Most important - overall game impact
-            'saves_per_game': 0.25,         # Defensive skill highly valued (who Drose had 2.45!)
-            'goals_per_game': 0.15,         # Offensive production
-            'assists_per_game': 0.10,       # Playmaking/team support
-            
-            # Secondary performance indicators (5% total weight)
-            'shooting_pct': 0.03,           # Efficiency over volume
-            'shots_per_game': 0.02,         # Offensive pressure
-            
-            # Team success (5% total weight) - MINIMAL impact
-            'win_rate': 0.05                # Proven to be mostly team luck
-        }
-        
-        # Tournament adjustments based on Bo7 double elimination
-        self.tournament_config = {
-            'min_games_threshold': 8,        # Minimum possible games (0-4, 0-4)
-            'early_elimination_threshold': 14,  # 8-14 games = early out
-            'deep_run_threshold': 22,        # 22+ games = finals/winner
-            'confidence_games': 16,          # Games needed for full win rate confidence
-            
-            # Opportunity adjustments
-            'early_elimination_boost': 0.12,  # 12% boost for early elimination
-            'deep_run_penalty': 0.06,        # 6% penalty for deep runs
-        }
-        
-        # Performance thresholds based on BLCS4 data
-        self.performance_benchmarks = {
-            'elite_score_threshold': 450,     # Top tier like JERID (543), DESI (488)
-            'good_score_threshold': 380,      # Above average performers
-            'average_score_threshold': 320,   # League average range
-            
-            'elite_saves_threshold': 2.2,     # Defensive specialists like who Drose (2.45)
-            'good_saves_threshold': 1.8,      # Above average defense
-            
-            'elite_goals_threshold': 1.1,     # Offensive threats like JERID (1.16)
-            'good_goals_threshold': 0.8,      # Above average offense
-        }
+        config = config if config is not None else load_dq_config()
+        # Validates the config, and fixes which stats are ranked by league percentile
+        self.weights = DQWeights(config)
+        self.stat_weights = dict(config['stat_weights'])
+        self.tournament_config = dict(config['tournament_config'])
+        self.performance_benchmarks = dict(config['performance_benchmarks'])
     
     def calculate_percentile(self, player_value: float, all_values: List[float], 
                            higher_is_better: bool = True) -> float:
@@ -64,6 +34,8 @@ class DataDrivenDominanceQuotientCalculator:
         valid_values = [v for v in all_values if not pd.isna(v) and v is not None]
         if not valid_values:
             return 50.0
+        if player_value is None:
+            return 0.0  # Missing, like NaN, beats nobody
         
         if higher_is_better:
             better_count = sum(1 for v in valid_values if v < player_value)
@@ -106,7 +78,7 @@ class DataDrivenDominanceQuotientCalculator:
             specialties += 1  # Defensive specialist
         if player_stats.get('goals_per_game', 0) >= self.performance_benchmarks['elite_goals_threshold']:
             specialties += 1  # Offensive threat
-        if player_stats.get('assists_per_game', 0) >= 1.0:
+        if player_stats.get('assists_per_game', 0) >= self.performance_benchmarks['elite_assists_threshold']:
             specialties += 1  # Playmaker
         
         # Multi-skilled players get a small bonus
@@ -165,8 +137,7 @@ class DataDrivenDominanceQuotientCalculator:
         
         # Extract stat values for percentile calculations
         stat_lists = {}
-        for stat_key in ['avg_score', 'goals_per_game', 'assists_per_game', 'saves_per_game', 
-                        'shots_per_game', 'shooting_pct']:
+        for stat_key in self.weights.ranked_stats:
             stat_lists[stat_key] = [p.get(stat_key, 0) for p in all_players if p.get(stat_key) is not None]
         
         # Calculate percentiles for each stat
@@ -247,7 +218,7 @@ class DataDrivenDominanceQuotientCalculator:
             analysis['strengths'].append("Elite Defender")
         if goals_per_game >= self.performance_benchmarks['elite_goals_threshold']:
             analysis['strengths'].append("Offensive Threat")
-        if player_stats.get('assists_per_game', 0) >= 1.0:
+        if player_stats.get('assists_per_game', 0) >= self.performance_benchmarks['elite_assists_threshold']:
             analysis['strengths'].append("Playmaker")
         if avg_score >= self.performance_benchmarks['elite_score_threshold']:
             analysis['strengths'].append("Overall Impact")
@@ -272,35 +243,35 @@ def test_data_driven_algorithm():
         {
             'player_id': 'Elite_Winner', 'games_played': 24, 'wins': 18, 'losses': 6,
             'avg_score': 520, 'goals_per_game': 1.2, 'assists_per_game': 1.1,
-            'saves_per_game': 2.1, 'shots_per_game': 4.5, 'shooting_pct': 27
+            'saves_per_game': 2.1, 'shots_per_game': 4.5, 'shot_percentage': 27
         },
         
         # Elite player on bad team (like who Drose, Paperclip94)
         {
             'player_id': 'Elite_Victim', 'games_played': 12, 'wins': 3, 'losses': 9,
             'avg_score': 480, 'goals_per_game': 1.0, 'assists_per_game': 1.3,
-            'saves_per_game': 2.8, 'shots_per_game': 4.8, 'shooting_pct': 21
+            'saves_per_game': 2.8, 'shots_per_game': 4.8, 'shot_percentage': 21
         },
         
         # Average player on good team (like bacon, Pullis)
         {
             'player_id': 'Team_Passenger', 'games_played': 22, 'wins': 16, 'losses': 6,
             'avg_score': 310, 'goals_per_game': 0.7, 'assists_per_game': 0.6,
-            'saves_per_game': 1.2, 'shots_per_game': 3.2, 'shooting_pct': 22
+            'saves_per_game': 1.2, 'shots_per_game': 3.2, 'shot_percentage': 22
         },
         
         # Poor player on bad team
         {
             'player_id': 'Struggling', 'games_played': 14, 'wins': 4, 'losses': 10,
             'avg_score': 280, 'goals_per_game': 0.5, 'assists_per_game': 0.4,
-            'saves_per_game': 1.0, 'shots_per_game': 2.8, 'shooting_pct': 18
+            'saves_per_game': 1.0, 'shots_per_game': 2.8, 'shot_percentage': 18
         },
         
         # Defensive specialist (like who Drose defensive style)
         {
             'player_id': 'Defense_Specialist', 'games_played': 16, 'wins': 6, 'losses': 10,
             'avg_score': 400, 'goals_per_game': 0.6, 'assists_per_game': 0.9,
-            'saves_per_game': 3.2, 'shots_per_game': 2.9, 'shooting_pct': 21
+            'saves_per_game': 3.2, 'shots_per_game': 2.9, 'shot_percentage': 21
         }
     ]
     
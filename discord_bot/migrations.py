@@ -51,6 +51,11 @@ def apply_migration():
 
         ALTER TABLE scheduling_sessions
         ADD COLUMN IF NOT EXISTS proposed_times JSON DEFAULT '[]';
+
+        -- The replay ledger is per group: a replay filed in two groups gets a row in each.
+        ALTER TABLE IF EXISTS ingested_replays
+        DROP CONSTRAINT IF EXISTS ingested_replays_pkey,
+        ADD PRIMARY KEY (group_id, replay_id);
         """)
 
         with engine.connect() as connection:
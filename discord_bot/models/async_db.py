@@ -0,0 +1,67 @@
+# File: discord_bot/models/async_db.py
+
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from .engine_registry import engine_registry
+
+logger = logging.getLogger(__name__)
+
+# Matches the shared engines' pool_size, so a worker never waits on a connection checkout
+DEFAULT_DB_WORKERS = engine_registry.pool_settings['pool_size']
+
+
+class DBExecutor:
+    """Dedicated, bounded thread pool for blocking database calls
+
+    The models use synchronous SQLAlchemy sessions; running them here keeps the
+    event loop (and the Discord gateway) free while queries are in flight. Calls
+    beyond max_workers queue up instead of opening more connections.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_DB_WORKERS, thread_name_prefix: str = 'db'):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Await func(*args, **kwargs) on a database worker thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+class AsyncRepository:
+    """Awaitable view of a synchronous repository (an object or module of DB functions)
+
+    repo.method(...) returns a coroutine that runs the wrapped method on the
+    database executor; non-callable attributes are passed through unchanged.
+    """
+
+    def __init__(self, target: Any, executor: 'DBExecutor' = None):
+        self._target = target
+        self._executor = executor or db_executor
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def call(*args, **kwargs):
+            return await self._executor.run(attribute, *args, **kwargs)
+        return call
+
+
+# One per process: every cog's database work shares these workers
+db_executor = DBExecutor(int(os.getenv('DB_EXECUTOR_WORKERS', DEFAULT_DB_WORKERS)))
+
+
+async def run_db(func: Callable, *args, **kwargs) -> Any:
+    """Await a blocking database call on the shared executor"""
+    return await db_executor.run(func, *args, **kwargs)
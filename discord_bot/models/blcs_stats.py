@@ -0,0 +1,530 @@
+# File: discord_bot/models/blcs_stats.py
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from utils.dq_history import biggest_movers, build_snapshots
+from models.engine_registry import engine_registry
+
+logger = logging.getLogger(__name__)
+
+try:
+    from sqlalchemy import Column, Integer, String, Float, DateTime, BigInteger, Index, func
+    from sqlalchemy.ext.declarative import declarative_base
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.dialects import postgresql, sqlite
+    SQLALCHEMY_AVAILABLE = True
+    
+    Base = declarative_base()
+    
+    class PlayerMapping(Base):
+        __tablename__ = 'blcs_player_mappings'
+        
+        discord_id = Column(BigInteger, primary_key=True)
+        discord_username = Column(String(255))
+        ballchasing_player_id = Column(String(255))
+        ballchasing_platform = Column(String(50))
+        created_at = Column(DateTime, default=datetime.utcnow)
+        updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    class PlayerStatistics(Base):
+        __tablename__ = 'blcs_player_statistics'
+        
+        player_id = Column(String(255), primary_key=True)
+        season_id = Column(String(255))
+        games_played = Column(Integer)
+        wins = Column(Integer)
+        losses = Column(Integer)
+        avg_score = Column(Float)
+        goals_per_game = Column(Float)
+        assists_per_game = Column(Float)
+        saves_per_game = Column(Float)
+        shots_per_game = Column(Float)
+        shot_percentage = Column(Float)
+        demos_inflicted_per_game = Column(Float)
+        demos_taken_per_game = Column(Float)
+        avg_speed = Column(Float)
+        dominance_quotient = Column(Float)
+        percentile_rank = Column(Float)
+        last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    class PlayerStatisticsSnapshot(Base):
+        """One row per player per refresh; deltas are against the player's previous snapshot"""
+        __tablename__ = 'blcs_player_stat_snapshots'
+        __table_args__ = (
+            # Latest snapshot of a season, then its rows in DQ-delta order (/blcs_movers)
+            Index('ix_blcs_snapshots_season_time_delta', 'season_id', 'snapshot_at', 'dq_delta'),
+            # Each player's previous snapshot when recording a new one
+            Index('ix_blcs_snapshots_player_time', 'player_id', 'snapshot_at'),
+        )
+
+        id = Column(Integer, primary_key=True, autoincrement=True)
+        player_id = Column(String(255), nullable=False)
+        season_id = Column(String(255))
+        snapshot_at = Column(DateTime, nullable=False)
+        games_played = Column(Integer)
+        wins = Column(Integer)
+        avg_score = Column(Float)
+        goals_per_game = Column(Float)
+        assists_per_game = Column(Float)
+        saves_per_game = Column(Float)
+        dominance_quotient = Column(Float)
+        percentile_rank = Column(Float)
+        dq_delta = Column(Float)
+        percentile_delta = Column(Float)
+        games_delta = Column(Integer)
+
+    # Both dialects spell upserts as INSERT ... ON CONFLICT, each with its own insert construct
+    DIALECT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+except ImportError:
+    SQLALCHEMY_AVAILABLE = False
+    logger.warning("SQLAlchemy/psycopg2 not available - database features disabled")
+
+
+class SimpleMemoryStorage:
+    """Simple in-memory storage when database is not available"""
+    def __init__(self):
+        self.player_mappings = {}
+        self.player_stats = {}
+        self.stat_snapshots = []
+    
+    def add_player_mapping(self, discord_id: int, discord_username: str, 
+                          ballchasing_player_id: str, platform: str):
+        """Add or update player mapping"""
+        self.player_mappings[discord_id] = {
+            'discord_id': discord_id,
+            'discord_username': discord_username,
+            'ballchasing_player_id': ballchasing_player_id,
+            'ballchasing_platform': platform
+        }
+        logger.info(f"Stored mapping for {discord_username}")
+    
+    def get_player_mapping(self, discord_id: int) -> Optional[Dict]:
+        """Get player mapping by Discord ID"""
+        return self.player_mappings.get(discord_id)
+    
+    def update_player_statistics(self, player_stats: Dict):
+        """Update player statistics"""
+        player_id = player_stats['player_id']
+        # Merge, so a partial row (e.g. just a new DQ) keeps the rest of the player's stats
+        self.player_stats.setdefault(player_id, {}).update(player_stats)
+        logger.debug("Updated stats for %s", player_id)
+    
+    def get_player_statistics(self, player_id: str) -> Optional[Dict]:
+        """Get player statistics"""
+        return self.player_stats.get(player_id)
+    
+    def get_all_player_statistics(self) -> List[Dict]:
+        """Get all player statistics for ranking calculations"""
+        return list(self.player_stats.values())
+
+    def record_stat_snapshot(self, players: List[Dict], taken_at: datetime) -> int:
+        """Append a snapshot of every player, with deltas against their previous one"""
+        previous = {}
+        for row in self.stat_snapshots:
+            previous[row['player_id']] = row
+        rows = build_snapshots(players, previous, taken_at)
+        self.stat_snapshots.extend(rows)
+        return len(rows)
+
+    def get_dq_movers(self, limit: int, season_id: Optional[str] = None) -> Tuple[List[Dict], List[Dict]]:
+        """Biggest DQ risers and fallers of the latest snapshot"""
+        snapshots = [row for row in self.stat_snapshots if season_id is None or row['season_id'] == season_id]
+        if not snapshots:
+            return [], []
+        latest = max(row['snapshot_at'] for row in snapshots)
+        risers, fallers = biggest_movers([row for row in snapshots if row['snapshot_at'] == latest], limit)
+        return [dict(row) for row in risers], [dict(row) for row in fallers]
+
+# Bind parameters per statement: under PostgreSQL's 65535 and SQLite's 32766,
+# which assumes SQLite >= 3.32 (older builds cap statements at 999)
+MAX_BIND_PARAMS = 32000
+
+
+class DatabaseManager:
+    def __init__(self, database_url: str):
+        # Bumped whenever player statistics change, so derived indexes know to rebuild
+        self.stats_generation = 0
+        # Bumped whenever a player mapping changes (names in the joined statistics)
+        self.mapping_generation = 0
+        # get_all_player_statistics() result and the (stats, mapping) generations it was read at
+        self._all_stats_cache: Optional[List[Dict]] = None
+        self._all_stats_cache_key: Optional[Tuple[int, int]] = None
+
+        if not SQLALCHEMY_AVAILABLE:
+            logger.warning("Using memory storage - data will not persist")
+            self.storage = SimpleMemoryStorage()
+            self.use_db = False
+            return
+        
+        try:
+            # The process-wide engine, shared with the scheduling and profile models
+            self.engine = engine_registry.get_engine(database_url)
+            Base.metadata.create_all(self.engine)
+            Session = sessionmaker(bind=self.engine)
+            self.Session = Session
+            self.insert = DIALECT_INSERTS.get(self.engine.dialect.name, postgresql.insert)
+            self.use_db = True
+            logger.info("PostgreSQL database initialized for BLCS stats")
+        except Exception as e:
+            logger.warning(f"Database failed, using memory storage: {e}")
+            self.storage = SimpleMemoryStorage()
+            self.use_db = False
+    
+    def add_player_mapping(self, discord_id: int, discord_username: str, 
+                          ballchasing_player_id: str, platform: str):
+        """Add or update player mapping"""
+        if not self.use_db:
+            self.storage.add_player_mapping(discord_id, discord_username, ballchasing_player_id, platform)
+            self.mapping_generation += 1
+            return
+        
+        try:
+            with self.Session() as session:
+                stmt = self.insert(PlayerMapping).values(
+                    discord_id=discord_id,
+                    discord_username=discord_username,
+                    ballchasing_player_id=ballchasing_player_id,
+                    ballchasing_platform=platform
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['discord_id'],
+                    set_=dict(
+                        discord_username=stmt.excluded.discord_username,
+                        ballchasing_player_id=stmt.excluded.ballchasing_player_id,
+                        ballchasing_platform=stmt.excluded.ballchasing_platform,
+                        updated_at=datetime.utcnow()
+                    )
+                )
+                session.execute(stmt)
+                session.commit()
+        except Exception as e:
+            logger.error(f"Error saving player mapping: {e}")
+        finally:
+            # After the write, so a read racing it can't cache the old names as current
+            self.mapping_generation += 1
+    
+    def get_player_mapping(self, discord_id: int) -> Optional[Dict]:
+        """Get player mapping by Discord ID"""
+        if not self.use_db:
+            return self.storage.get_player_mapping(discord_id)
+        
+        try:
+            with self.Session() as session:
+                mapping = session.query(PlayerMapping).filter_by(discord_id=discord_id).first()
+                if mapping:
+                    return {
+                        'discord_id': mapping.discord_id,
+                        'discord_username': mapping.discord_username,
+                        'ballchasing_player_id': mapping.ballchasing_player_id,
+                        'ballchasing_platform': mapping.ballchasing_platform
+                    }
+                return None
+        except Exception as e:
+            logger.error(f"Error getting player mapping: {e}")
+            return None
+    
+    def mark_stats_changed(self):
+        """Start a new data generation after player statistics were written or cleared
+
+        Call it once the write is committed: a read between a bump and the commit
+        would otherwise cache the old statistics as current.
+        """
+        self.stats_generation += 1
+
+    def update_player_statistics(self, player_stats: Dict):
+        """Update player statistics"""
+        if not self.use_db:
+            self.storage.update_player_statistics(player_stats)
+            self.mark_stats_changed()
+            return
+        
+        try:
+            with self.Session() as session:
+                stmt = self.insert(PlayerStatistics).values(**player_stats)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['player_id'],
+                    set_={k: stmt.excluded[k] for k in player_stats.keys() if k != 'player_id'}
+                )
+                session.execute(stmt)
+                session.commit()
+                logger.debug("Updated stats for player_id: %s", player_stats.get('player_id'))
+        except Exception as e:
+            logger.error(f"Error updating player statistics for {player_stats.get('player_id')}: {e}")
+        finally:
+            self.mark_stats_changed()
+    
+    def bulk_upsert_player_statistics(self, rows: List[Dict]) -> int:
+        """Upsert many players' statistics in one transaction
+
+        Rows with the same columns go out as one multi-row INSERT ... ON CONFLICT
+        (split only to stay under the driver's bind-parameter limit); partial rows
+        only overwrite the columns they carry. Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+        if not self.use_db:
+            for player_stats in rows:
+                self.storage.update_player_statistics(player_stats)
+            self.mark_stats_changed()
+            return len(rows)
+
+        # One statement per column set, in first-seen order
+        batches: Dict[Tuple[str, ...], List[Dict]] = {}
+        for player_stats in rows:
+            batches.setdefault(tuple(player_stats), []).append(player_stats)
+
+        try:
+            with self.Session() as session:
+                for columns, batch in batches.items():
+                    chunk = max(1, MAX_BIND_PARAMS // len(columns))
+                    for start in range(0, len(batch), chunk):
+                        stmt = self.insert(PlayerStatistics).values(batch[start:start + chunk])
+                        stmt = stmt.on_conflict_do_update(
+                            index_elements=['player_id'],
+                            set_={k: stmt.excluded[k] for k in columns if k != 'player_id'}
+                        )
+                        session.execute(stmt)
+                session.commit()
+                logger.debug("Upserted stats for %d players", len(rows))
+                return len(rows)
+        except Exception as e:
+            logger.error(f"Error bulk updating statistics for {len(rows)} players: {e}")
+            return 0
+        finally:
+            self.mark_stats_changed()
+
+    def get_player_statistics(self, player_id: str) -> Optional[Dict]:
+        """Get player statistics"""
+        if not self.use_db:
+            return self.storage.get_player_statistics(player_id)
+        
+        try:
+            with self.Session() as session:
+                logger.info(f"Attempting to retrieve stats for player_id: {player_id}")
+                stats = session.query(PlayerStatistics).filter_by(player_id=player_id).first()
+                if stats:
+                    logger.info(f"Successfully retrieved stats for player_id: {player_id}")
+                    return {
+                        'player_id': stats.player_id,
+                        'season_id': stats.season_id,
+                        'games_played': stats.games_played,
+                        'wins': stats.wins,
+                        'losses': stats.losses,
+                        'avg_score': stats.avg_score,
+                        'goals_per_game': stats.goals_per_game,
+                        'assists_per_game': stats.assists_per_game,
+                        'saves_per_game': stats.saves_per_game,
+                        'shots_per_game': stats.shots_per_game,
+                        'shot_percentage': stats.shot_percentage,
+                        'demos_inflicted_per_game': stats.demos_inflicted_per_game,
+                        'demos_taken_per_game': stats.demos_taken_per_game,
+                        'avg_speed': stats.avg_speed,
+                        'dominance_quotient': stats.dominance_quotient,
+                        'percentile_rank': stats.percentile_rank,
+                        'last_updated': stats.last_updated
+                    }
+                logger.warning(f"No stats found for player_id: {player_id}")
+                return None
+        except Exception as e:
+            logger.error(f"Error getting player statistics for {player_id}: {e}")
+            return None
+    
+    def get_players_by_discord_ids(self, discord_ids: List[int]) -> Dict[int, Tuple[Dict, Optional[Dict]]]:
+        """Mapping and statistics of each linked Discord ID, in one joined query
+
+        Unlinked IDs are left out; a linked player without statistics gets None stats.
+        """
+        if not self.use_db:
+            players = {}
+            for discord_id in discord_ids:
+                mapping = self.storage.get_player_mapping(discord_id)
+                if mapping:
+                    # Copies, like the rows a query builds
+                    stats = self.storage.get_player_statistics(mapping['ballchasing_player_id'])
+                    players[discord_id] = (dict(mapping), dict(stats) if stats else None)
+            return players
+
+        try:
+            with self.Session() as session:
+                results = (
+                    session.query(PlayerMapping, PlayerStatistics)
+                    .outerjoin(PlayerStatistics, PlayerStatistics.player_id == PlayerMapping.ballchasing_player_id)
+                    .filter(PlayerMapping.discord_id.in_(list(discord_ids)))
+                    .all()
+                )
+                players = {}
+                for mapping, stats in results:
+                    mapping_dict = {
+                        'discord_id': mapping.discord_id,
+                        'discord_username': mapping.discord_username,
+                        'ballchasing_player_id': mapping.ballchasing_player_id,
+                        'ballchasing_platform': mapping.ballchasing_platform
+                    }
+                    stats_dict = None
+                    if stats is not None:
+                        stats_dict = {c.name: getattr(stats, c.name) for c in stats.__table__.columns}
+                    players[mapping.discord_id] = (mapping_dict, stats_dict)
+                return players
+        except Exception as e:
+            logger.error(f"Error getting players for Discord IDs {list(discord_ids)}: {e}")
+            return {}
+
+    def get_player_by_discord_id(self, discord_id: int) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """(mapping, statistics) of one Discord user; either may be None"""
+        return self.get_players_by_discord_ids([discord_id]).get(discord_id, (None, None))
+
+    def get_all_player_statistics(self) -> List[Dict]:
+        """Get all player statistics for ranking, joined with player names.
+
+        Served from memory until statistics or mappings change. Each caller gets
+        its own copies of the rows, so changing them never leaks into the cache.
+        """
+        key = (self.stats_generation, self.mapping_generation)
+        if self._all_stats_cache is not None and self._all_stats_cache_key == key:
+            return [dict(row) for row in self._all_stats_cache]
+
+        try:
+            all_stats = self._query_all_player_statistics()
+        except Exception as e:
+            logger.error(f"Error getting all player statistics: {e}")
+            return []
+        # Stored under the generations read before the query, so a write racing it forces a re-read
+        self._all_stats_cache, self._all_stats_cache_key = all_stats, key
+        return [dict(row) for row in all_stats]
+
+    def _query_all_player_statistics(self) -> List[Dict]:
+        if not self.use_db:
+            # Fallback for memory storage (less efficient); copies, so the names stay out of storage
+            stats = [dict(s) for s in self.storage.get_all_player_statistics()]
+            mappings = self.storage.player_mappings
+            # Create a reverse map from ballchasing_id to discord_username
+            reverse_map = {v['ballchasing_player_id']: v['discord_username'] for k, v in mappings.items()}
+            for s in stats:
+                s['discord_username'] = reverse_map.get(s['player_id'])
+            return sorted(stats, key=lambda x: x.get('dominance_quotient', 0), reverse=True)
+
+        with self.Session() as session:
+            # Efficiently join PlayerStatistics with PlayerMapping
+            results = (
+                session.query(PlayerStatistics, PlayerMapping.discord_username)
+                .outerjoin(PlayerMapping, PlayerStatistics.player_id == PlayerMapping.ballchasing_player_id)
+                .order_by(PlayerStatistics.dominance_quotient.desc())
+                .all()
+            )
+            
+            # Process results into a list of dictionaries
+            all_stats = []
+            for stats, discord_username in results:
+                stat_dict = {
+                    c.name: getattr(stats, c.name) for c in stats.__table__.columns
+                }
+                stat_dict['discord_username'] = discord_username
+                all_stats.append(stat_dict)
+            
+            return all_stats
+    
+    def clear_player_statistics(self):
+        """Delete every player's statistics (mappings and snapshots are kept)"""
+        if not self.use_db:
+            self.storage.player_stats.clear()
+        else:
+            with self.Session() as session:
+                session.query(PlayerStatistics).delete()
+                session.commit()
+        self.mark_stats_changed()
+
+    def get_all_player_mappings(self) -> List[Dict]:
+        """Get all player mappings from the database"""
+        if not self.use_db:
+            return list(self.storage.player_mappings.values())
+
+        try:
+            with self.Session() as session:
+                all_mappings = session.query(PlayerMapping).all()
+                return [{
+                    'discord_id': mapping.discord_id,
+                    'discord_username': mapping.discord_username,
+                    'ballchasing_player_id': mapping.ballchasing_player_id,
+                    'ballchasing_platform': mapping.ballchasing_platform
+                } for mapping in all_mappings]
+        except Exception as e:
+            logger.error(f"Error getting all player mappings: {e}")
+            return []
+
+    def record_stat_snapshot(self, players: List[Dict], taken_at: Optional[datetime] = None) -> int:
+        """Append one snapshot row per player, deltas precomputed against their previous snapshot"""
+        taken_at = taken_at or datetime.utcnow()
+        if not self.use_db:
+            return self.storage.record_stat_snapshot(players, taken_at)
+
+        try:
+            with self.Session() as session:
+                player_ids = [p['player_id'] for p in players]
+                # Each player's latest snapshot, found through the (player_id, snapshot_at) index
+                latest = (
+                    session.query(PlayerStatisticsSnapshot.player_id,
+                                  func.max(PlayerStatisticsSnapshot.snapshot_at).label('snapshot_at'))
+                    .filter(PlayerStatisticsSnapshot.player_id.in_(player_ids))
+                    .group_by(PlayerStatisticsSnapshot.player_id)
+                    .subquery()
+                )
+                previous = {
+                    row.player_id: {'dominance_quotient': row.dominance_quotient,
+                                    'percentile_rank': row.percentile_rank,
+                                    'games_played': row.games_played}
+                    for row in session.query(PlayerStatisticsSnapshot).join(
+                        latest,
+                        (PlayerStatisticsSnapshot.player_id == latest.c.player_id)
+                        & (PlayerStatisticsSnapshot.snapshot_at == latest.c.snapshot_at))
+                }
+                rows = build_snapshots(players, previous, taken_at)
+                session.bulk_insert_mappings(PlayerStatisticsSnapshot, rows)
+                session.commit()
+                return len(rows)
+        except Exception as e:
+            logger.error(f"Error recording player statistics snapshot: {e}")
+            return 0
+
+    def get_dq_movers(self, limit: int = 5, season_id: Optional[str] = None) -> Tuple[List[Dict], List[Dict]]:
+        """Biggest DQ risers and fallers of the latest snapshot, joined with player names"""
+        if not self.use_db:
+            risers, fallers = self.storage.get_dq_movers(limit, season_id)
+            reverse_map = {v['ballchasing_player_id']: v['discord_username']
+                           for v in self.storage.player_mappings.values()}
+            for row in risers + fallers:
+                row['discord_username'] = reverse_map.get(row['player_id'])
+            return risers, fallers
+
+        try:
+            with self.Session() as session:
+                latest = session.query(func.max(PlayerStatisticsSnapshot.snapshot_at))
+                if season_id is not None:
+                    latest = latest.filter(PlayerStatisticsSnapshot.season_id == season_id)
+                latest = latest.scalar()
+                if latest is None:
+                    return [], []
+
+                def movers(condition, order):
+                    query = (
+                        session.query(PlayerStatisticsSnapshot, PlayerMapping.discord_username)
+                        .outerjoin(PlayerMapping,
+                                   PlayerStatisticsSnapshot.player_id == PlayerMapping.ballchasing_player_id)
+                        .filter(PlayerStatisticsSnapshot.snapshot_at == latest, condition)
+                    )
+                    if season_id is not None:
+                        query = query.filter(PlayerStatisticsSnapshot.season_id == season_id)
+                    rows = []
+                    for snapshot, discord_username in query.order_by(order).limit(limit):
+                        row = {c.name: getattr(snapshot, c.name) for c in snapshot.__table__.columns}
+                        row['discord_username'] = discord_username
+                        rows.append(row)
+                    return rows
+
+                return (movers(PlayerStatisticsSnapshot.dq_delta > 0, PlayerStatisticsSnapshot.dq_delta.desc()),
+                        movers(PlayerStatisticsSnapshot.dq_delta < 0, PlayerStatisticsSnapshot.dq_delta.asc()))
+        except Exception as e:
+            logger.error(f"Error getting DQ movers: {e}")
+            return [], []
@@ -2,12 +2,13 @@
 
 import os
 import logging
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
 import urllib.parse
 
+from models.engine_registry import engine_registry
+
 logger = logging.getLogger(__name__)
 
 # Base for all models
@@ -51,31 +52,11 @@ class DatabaseConfig:
         try:
             self.database_url = self.get_database_url()
             
-            # Database engine configuration
+            # Shared with every other subsystem; pool settings come from conf/config.yaml
+            self.engine = engine_registry.get_engine(self.database_url)
             if self.database_url.startswith('postgresql://'):
-                # PostgreSQL configuration for production
-                self.engine = create_engine(
-                    self.database_url,
-                    poolclass=QueuePool,
-                    pool_size=5,          # Number of connections to maintain
-                    max_overflow=10,      # Additional connections if needed
-                    pool_recycle=3600,    # Recycle connections every hour
-                    pool_pre_ping=True,   # Validate connections before use
-                    echo=False,           # Set to True for SQL debugging
-                    connect_args={
-                        "sslmode": "require",
-                        "connect_timeout": 10,
-                        "application_name": "RocketLeagueBot"
-                    }
-                )
                 logger.info("✅ Configured PostgreSQL database engine")
             else:
-                # SQLite configuration for local development
-                self.engine = create_engine(
-                    self.database_url,
-                    echo=False,
-                    connect_args={"check_same_thread": False}
-                )
                 logger.info("✅ Configured SQLite database engine (development)")
             
             # Create session factory
@@ -121,6 +102,7 @@ class DatabaseConfig:
             # Import all models to ensure they're registered
             from models.player_profile import PlayerProfile
             from models.scheduling import SchedulingSession as DBSchedulingSession
+            from models.ingestion import ProcessedReplay, IngestionWatermark
             
             # Create all tables
             Base.metadata.create_all(self.engine)
@@ -0,0 +1,185 @@
+# File: discord_bot/models/engine_registry.py
+
+import copy
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from omegaconf import OmegaConf
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+logger = logging.getLogger(__name__)
+
+BOT_DIR = Path(__file__).resolve().parents[1]
+DB_CONFIG_PATH = BOT_DIR / 'conf' / 'config.yaml'
+DB_CONFIG_SECTION = 'database'
+
+DEFAULT_POOL_SETTINGS = {
+    'pool_size': 5,
+    'max_overflow': 5,
+    'pool_timeout': 30,
+    'pool_recycle': 1800,
+    'pool_pre_ping': True,
+    'postgres_connect_args': {
+        'sslmode': 'require',
+        'connect_timeout': 10,
+        'application_name': 'RocketLeagueBot',
+    },
+}
+
+
+def normalize_database_url(database_url: str) -> str:
+    """postgres:// (as DigitalOcean hands it out) spelled the way SQLAlchemy expects"""
+    if database_url.startswith('postgres://'):
+        return database_url.replace('postgres://', 'postgresql://', 1)
+    return database_url
+
+
+def load_pool_settings(path: Optional[Path] = None) -> Dict:
+    """DEFAULT_POOL_SETTINGS overlaid with the bot config's database section
+
+    Values are cast to the defaults' types, since env-backed YAML values arrive as strings.
+    """
+    settings = copy.deepcopy(DEFAULT_POOL_SETTINGS)
+    path = Path(path or DB_CONFIG_PATH)
+    if not path.exists():
+        return settings
+
+    try:
+        section = OmegaConf.to_container(OmegaConf.load(path), resolve=True).get(DB_CONFIG_SECTION) or {}
+    except Exception as e:
+        logger.error(f"Could not read database settings from {path}, using defaults: {e}")
+        return settings
+    for name, value in section.items():
+        if name not in settings:
+            logger.warning(f"Ignoring unknown database setting {name} in {path}")
+        elif isinstance(settings[name], dict):
+            settings[name].update(value or {})
+        elif isinstance(settings[name], bool):
+            settings[name] = value if isinstance(value, bool) else str(value).lower() in ('1', 'true', 'yes')
+        else:
+            settings[name] = type(settings[name])(value)
+    return settings
+
+
+class PoolMetrics:
+    """Connection counters for one engine's pool, fed by pool events"""
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine):
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+
+class EngineRegistry:
+    """One SQLAlchemy engine per database URL for the whole process
+
+    Every subsystem asks here instead of calling create_engine, so the process
+    holds at most pool_size + max_overflow connections per database, with
+    recycle and pre-ping settings from the bot config.
+    """
+
+    def __init__(self, pool_settings: Optional[Dict] = None):
+        self.pool_settings = pool_settings if pool_settings is not None else load_pool_settings()
+        self._engines: Dict[str, Engine] = {}
+        self._metrics: Dict[str, PoolMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _create_engine(self, database_url: str) -> Engine:
+        settings = self.pool_settings
+        if database_url.startswith('sqlite'):
+            if ':memory:' in database_url or database_url in ('sqlite://', 'sqlite:///'):
+                # One shared connection, or every worker thread would see its own empty database
+                return create_engine(database_url, poolclass=StaticPool,
+                                     connect_args={'check_same_thread': False})
+            return create_engine(database_url, pool_pre_ping=settings['pool_pre_ping'],
+                                 connect_args={'check_same_thread': False})
+
+        connect_args = settings['postgres_connect_args'] if database_url.startswith('postgresql') else {}
+        return create_engine(
+            database_url,
+            pool_size=settings['pool_size'],
+            max_overflow=settings['max_overflow'],
+            pool_timeout=settings['pool_timeout'],
+            pool_recycle=settings['pool_recycle'],
+            pool_pre_ping=settings['pool_pre_ping'],
+            connect_args=dict(connect_args),
+        )
+
+    def get_engine(self, database_url: str) -> Engine:
+        """The process's engine for database_url, created on first use"""
+        database_url = normalize_database_url(database_url)
+        with self._lock:
+            engine = self._engines.get(database_url)
+            if engine is None:
+                engine = self._create_engine(database_url)
+                metrics = PoolMetrics()
+                metrics.attach(engine)
+                self._engines[database_url] = engine
+                self._metrics[database_url] = metrics
+                logger.info(f"Created database engine for {engine.url.render_as_string(hide_password=True)}")
+            return engine
+
+    def pool_status(self) -> Dict[str, Dict]:
+        """Pool usage of every engine, keyed by its URL with the password hidden"""
+        status = {}
+        with self._lock:
+            engines = list(self._engines.items())
+        for database_url, engine in engines:
+            pool = engine.pool
+            metrics = self._metrics[database_url]
+            entry = {
+                'pool': type(pool).__name__,
+                'checked_out': metrics.checked_out,
+                'peak_checked_out': metrics.peak_checked_out,
+                'checkouts': metrics.checkouts,
+                'connects': metrics.connects,
+            }
+            if hasattr(pool, 'size'):
+                entry.update(size=pool.size(), checked_in=pool.checkedin(), overflow=pool.overflow(),
+                             max_overflow=self.pool_settings['max_overflow'])
+            status[engine.url.render_as_string(hide_password=True)] = entry
+        return status
+
+    def dispose_all(self):
+        """Close every pooled connection (on shutdown)"""
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+
+
+# The process-wide registry
+engine_registry = EngineRegistry()
+
+
+def get_engine(database_url: Optional[str] = None) -> Engine:
+    """The shared engine for database_url (DATABASE_URL by default)"""
+    database_url = database_url or os.getenv('DATABASE_URL')
+    if not database_url:
+        raise RuntimeError("No database URL given and DATABASE_URL is not set")
+    return engine_registry.get_engine(database_url)
@@ -0,0 +1,118 @@
+# File: discord_bot/models/ingestion.py
+
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime, timedelta, timezone
+import logging
+from models.database_config import Base, get_session
+
+logger = logging.getLogger(__name__)
+
+# Re-read this much before the watermark so replays sharing a timestamp,
+# or indexed late by ballchasing, are never skipped. The ledger drops repeats.
+WATERMARK_OVERLAP = timedelta(minutes=10)
+
+class ProcessedReplay(Base):
+    __tablename__ = 'ingested_replays'
+
+    # Keyed per group: a replay filed in two groups is ingested once for each
+    group_id = Column(String(255), primary_key=True)
+    replay_id = Column(String(64), primary_key=True)
+    uploaded_at = Column(DateTime)  # ballchasing's server-side `created` time
+    processed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class IngestionWatermark(Base):
+    __tablename__ = 'ingestion_watermarks'
+
+    group_id = Column(String(255), primary_key=True)
+    watermark = Column(DateTime, nullable=False)  # server time, UTC
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+def parse_server_time(value):
+    """Parse a ballchasing RFC3339 timestamp into a naive UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        logger.warning(f"Unparseable ballchasing timestamp: {value}")
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def format_server_time(value):
+    """Format a naive UTC datetime the way ballchasing's date filters expect"""
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class ReplayLedger:
+    """Durable record of which replays of a group were ingested, and up to when"""
+
+    def __init__(self, group_id):
+        self.group_id = group_id
+        self.watermark = None
+        self._processed = set()
+        self.load()
+
+    def load(self):
+        """Load the watermark and processed replay IDs for this group"""
+        session = get_session()
+        try:
+            row = session.get(IngestionWatermark, self.group_id)
+            self.watermark = row.watermark if row else None
+            self._processed = {
+                replay_id for (replay_id,) in
+                session.query(ProcessedReplay.replay_id).filter_by(group_id=self.group_id)
+            }
+            logger.info(f"Ledger for {self.group_id}: {len(self._processed)} replays, watermark {self.watermark}")
+        finally:
+            session.close()
+
+    def resume_from(self):
+        """Server time to resume listing from, or None for a full backfill"""
+        if self.watermark is None:
+            return None
+        return self.watermark - WATERMARK_OVERLAP
+
+    def is_processed(self, replay_id):
+        return replay_id in self._processed
+
+    def mark_processed(self, replay_id, uploaded_at=None):
+        """Record a replay as ingested; safe to call again for the same replay"""
+        if replay_id in self._processed:
+            return
+        session = get_session()
+        try:
+            session.merge(ProcessedReplay(
+                replay_id=replay_id,
+                group_id=self.group_id,
+                uploaded_at=uploaded_at,
+                processed_at=datetime.utcnow()
+            ))
+            session.commit()
+            self._processed.add(replay_id)
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error recording replay {replay_id}: {e}")
+            raise e
+        finally:
+            session.close()
+
+    def advance_watermark(self, server_time):
+        """Move the watermark forward (never backward) to a server timestamp"""
+        if server_time is None or (self.watermark is not None and server_time <= self.watermark):
+            return
+        session = get_session()
+        try:
+            session.merge(IngestionWatermark(
+                group_id=self.group_id,
+                watermark=server_time,
+                updated_at=datetime.utcnow()
+            ))
+            session.commit()
+            self.watermark = server_time
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error advancing watermark for {self.group_id}: {e}")
+            raise e
+        finally:
+            session.close()
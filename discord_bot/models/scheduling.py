@@ -1,5 +1,5 @@
 # models/scheduling.py - Updated with PostgreSQL support
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, JSON, Boolean, Text, text
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean, Text, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta
@@ -8,6 +8,8 @@ import os
 from pathlib import Path
 import itertools
 
+from models.engine_registry import engine_registry
+
 Base = declarative_base()
 
 from collections import defaultdict
@@ -177,29 +179,15 @@ def ensure_data_directory():
         return tmp_path
 
 def create_database_engine():
-    """Create database engine with appropriate settings"""
+    """The process's shared engine for the scheduling database"""
     database_url = get_database_url()
     
     # print(f"🔗 Connecting to database: {database_url.split('@')[0]}@***" if '@' in database_url else database_url)
     
+    engine = engine_registry.get_engine(database_url)
     if database_url.startswith('postgresql://'):
-        # PostgreSQL settings
-        engine = create_engine(
-            database_url,
-            pool_pre_ping=True,        # Verify connections before use
-            pool_recycle=300,          # Recycle connections every 5 minutes
-            pool_size=5,               # Connection pool size
-            max_overflow=10,           # Max additional connections
-            echo=False                 # Set to True for SQL debugging
-        )
         print("[DB INFO] Using PostgreSQL with connection pooling")
     else:
-        # SQLite settings
-        engine = create_engine(
-            database_url,
-            pool_pre_ping=True,
-            echo=False
-        )
         print("[DB INFO] Using SQLite database")
     
     return engine
@@ -213,7 +201,7 @@ try:
 except Exception as e:
     print(f"[DB ERROR] Database initialization error: {e}")
     # Fallback to in-memory SQLite for development
-    engine = create_engine('sqlite:///:memory:', echo=False)
+    engine = engine_registry.get_engine('sqlite:///:memory:')
     Base.metadata.create_all(engine)
     Session = sessionmaker(bind=engine)
     print("[DB WARNING] Using in-memory database as fallback")
@@ -0,0 +1,150 @@
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "aiohttp",
+#     "omegaconf",
+#     "pandas",
+#     "pyarrow",
+#     "python-dotenv",
+#     "requests",
+# ]
+# ///
+# File: discord_bot/scripts/backfill_archive.py
+"""Backfill every archived season into a partitioned Parquet archive
+
+Each season root in `archive_seasons` (shared/config/conf/main.yaml) is crawled.
+Its first-level subgroups become stages, and replays directly in the root, or
+the root's own totals, become stage "all". Tables written per stage:
+
+    replays        one row per unique replay
+    players        one row per player per replay
+    group_players  the stage group's player totals (PLAYER_FIELDS)
+    group_teams    the stage group's team totals (TEAM_FIELDS)
+
+Layout: <archive>/season=<s>/stage=<stage>/table=<table>/part-0.parquet (zstd).
+A partition whose source is unchanged since the last run is left alone, and
+replay details are only fetched for stages whose replay set changed.
+
+    python scripts/backfill_archive.py
+    python scripts/backfill_archive.py --season 5 --archive-dir data/archive --force
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.crawl_groups import load_main_config
+from utils.ballchasing_api import get_ballchasing_client, close_ballchasing_client
+from utils.group_crawler import GroupCrawler
+from utils.group_stream import GROUP_FIELDS
+from utils.parquet_archive import ParquetArchive, fingerprint, partition_slug
+
+logger = logging.getLogger(__name__)
+
+ROOT_STAGE = 'all'
+
+
+def replay_stage(result, replay_id):
+    """Stage of a replay: the first-level subgroup its home group sits under"""
+    path = result.home_group(replay_id).path
+    return partition_slug(path[1]) if len(path) > 1 else ROOT_STAGE
+
+
+def stage_groups(result, root_id):
+    """Stage name -> group ID whose totals are archived for that stage"""
+    stages = {ROOT_STAGE: root_id}
+    for node in result.groups.values():
+        if len(node.path) == 2:
+            stages.setdefault(partition_slug(node.name), node.id)
+    return stages
+
+
+async def backfill_season(crawler, archive, season, root_id, force):
+    counts = {'written': 0, 'unchanged': 0}
+
+    def record(written):
+        counts['written' if written else 'unchanged'] += 1
+
+    result = await crawler.crawl([root_id])
+    by_stage = defaultdict(list)
+    for replay_id in result.replays:
+        by_stage[replay_stage(result, replay_id)].append(replay_id)
+
+    # Replay tables: a stage is refetched only if its set of replays changed
+    digests = {stage: fingerprint(sorted(replay_ids)) for stage, replay_ids in by_stage.items()}
+    changed = [stage for stage, digest in digests.items()
+               if force or not (archive.is_current(season, stage, 'replays', digests[stage])
+                                and archive.is_current(season, stage, 'players', digests[stage]))]
+    counts['unchanged'] += 2 * (len(by_stage) - len(changed))
+
+    if changed:
+        await crawler.fetch_replay_rows(result, [rid for stage in changed for rid in by_stage[stage]])
+        replays = result.replay_frame()
+        players = result.player_frame()
+        failed = set(result.failed_replays)
+        for stage in changed:
+            replay_ids = set(by_stage[stage])
+            stage_replays = replays[replays['replay_id'].isin(replay_ids)].reset_index(drop=True)
+            stage_players = players[players['replay_id'].isin(replay_ids)].reset_index(drop=True) \
+                if len(players) else players
+            complete = not (failed & replay_ids)
+            if not complete:
+                logger.warning(f"Season {season} {stage}: {len(failed & replay_ids)} replays failed; will retry next run")
+            record(archive.write(season, stage, 'replays', stage_replays, digests[stage], force=force))
+            record(archive.write(season, stage, 'players', stage_players, digests[stage],
+                                complete=complete, force=force))
+
+    # Group totals: cheap to refetch (a 304 while unchanged), rewritten only if the numbers moved
+    groups = stage_groups(result, root_id)
+    columns = await asyncio.gather(*(crawler.client.get_group_columns(group_id, GROUP_FIELDS)
+                                     for group_id in groups.values()))
+    for stage, group_columns in zip(groups, columns):
+        for array, table in (('players', 'group_players'), ('teams', 'group_teams')):
+            record(archive.write(season, stage, table, group_columns.frame(array), force=force))
+
+    logger.info(f"Season {season}: {len(result.groups)} groups, {len(result.replays)} replays, "
+                f"{counts['written']} partitions written, {counts['unchanged']} unchanged")
+    return counts
+
+
+async def backfill(seasons, archive, concurrency, force):
+    try:
+        crawler = GroupCrawler(get_ballchasing_client(), max_concurrency=concurrency, fetch_details=False)
+        totals = await asyncio.gather(*(backfill_season(crawler, archive, season, root_id, force)
+                                        for season, root_id in seasons.items()))
+    finally:
+        await close_ballchasing_client()
+        archive.save_manifest()
+    return {key: sum(t[key] for t in totals) for key in ('written', 'unchanged')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--season', action='append', help='only these seasons (repeatable)')
+    parser.add_argument('--archive-dir', default=os.getenv('BLCS_ARCHIVE_DIR', 'data/archive'))
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv('BALLCHASING_CRAWL_CONCURRENCY', 8)))
+    parser.add_argument('--force', action='store_true', help='rewrite every partition')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    seasons = {str(season): str(group_id)
+               for season, group_id in load_main_config().get('archive_seasons', {}).items()}
+    if args.season:
+        seasons = {season: group_id for season, group_id in seasons.items() if season in args.season}
+    if not seasons:
+        parser.error("no seasons configured under archive_seasons (or none matched --season)")
+
+    start = time.perf_counter()
+    archive = ParquetArchive(args.archive_dir)
+    totals = asyncio.run(backfill(seasons, archive, args.concurrency, args.force))
+    print(f"Backfilled {len(seasons)} seasons into {archive.root} in {time.perf_counter() - start:.1f}s: "
+          f"{totals['written']} partitions written, {totals['unchanged']} unchanged")
+
+
+if __name__ == '__main__':
+    main()
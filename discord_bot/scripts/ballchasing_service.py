@@ -1,5 +1,4 @@
 # File: ballchasing_service.py
-import aiohttp
 import asyncio
 from datetime import datetime
 from typing import Dict, List, Any, Optional
@@ -10,6 +9,7 @@ from models.repositories import (
     PlayerRepository, TeamRepository, MatchRepository, 
     GameRepository, PlayerStatsRepository, BallchasingSyncRepository
 )
+from utils.ballchasing_api import get_ballchasing_client
 
 class BallchasingService:
     def __init__(self, api_key: str):
@@ -26,15 +26,7 @@ class BallchasingService:
     
     async def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Make a request to the ballchasing API"""
-        url = f"{self.base_url}/{endpoint}"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    text = await response.text()
-                    raise Exception(f"API request failed with status {response.status}: {text}")
+        return await get_ballchasing_client().get_json(endpoint, params=params, api_key=self.api_key)
     
     async def sync_replay(self, replay_id: str) -> Game:
         """Sync a replay from ballchasing API"""
@@ -0,0 +1,123 @@
+# File: discord_bot/scripts/bench_dq.py
+"""Benchmark Dominance Quotient scoring: per-player loop vs calculate_all vs live updates
+
+For each league size, synthetic players are scored both ways and the results
+are checked for exact equality. The per-player loop is O(n^2); above
+--max-loop players it is timed on a random sample and extrapolated. The
+"update" column is the mean cost of one single-player DQRatingStore.update
+(one replay's worth of change).
+
+    python scripts/bench_dq.py
+    python scripts/bench_dq.py --sizes 50 500 5000 --max-loop 5000 --iterations 5
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.dominance_quotient import DataDrivenDominanceQuotientCalculator
+from utils.dq_rating_store import DQRatingStore
+
+logger = logging.getLogger(__name__)
+
+
+def synthetic_players(n, seed=0):
+    """Players shaped like extract_player_stats output, with ties and the odd missing stat"""
+    rng = random.Random(seed)
+    players = []
+    for i in range(n):
+        games = rng.randint(8, 28)
+        wins = rng.randint(0, games)
+        players.append({
+            'player_id': f"steam:{i}",
+            'games_played': games,
+            'wins': wins,
+            'losses': games - wins,
+            'avg_score': round(rng.gauss(360, 70), 1),
+            'goals_per_game': round(max(rng.gauss(0.8, 0.3), 0), 2),
+            'assists_per_game': round(max(rng.gauss(0.6, 0.25), 0), 2),
+            'saves_per_game': round(max(rng.gauss(1.6, 0.5), 0), 2),
+            'shots_per_game': round(max(rng.gauss(3.0, 0.8), 0), 2),
+            'shot_percentage': None if rng.random() < 0.02 else round(rng.uniform(10, 50), 1),
+        })
+    return players
+
+
+def time_best(fn, iterations):
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - start)
+    return min(durations), statistics.median(durations), result
+
+
+def bench_size(calculator, n, max_loop, iterations, seed):
+    players = synthetic_players(n, seed)
+    vector_best, vector_median, vector_dqs = time_best(lambda: calculator.calculate_all(players), iterations)
+
+    sample = players if n <= max_loop else random.Random(seed).sample(players, max_loop)
+    loop_time, _, loop_dqs = time_best(
+        lambda: [calculator.calculate_dominance_quotient(p, players) for p in sample], 1)
+    loop_time *= n / len(sample)
+
+    by_id = dict(zip((p['player_id'] for p in players), vector_dqs))
+    mismatches = sum(1 for p, dq in zip(sample, loop_dqs) if by_id[p['player_id']] != dq)
+
+    store = DQRatingStore(calculator)
+    store.load(players)
+    rng = random.Random(seed)
+    updates = [dict(p, games_played=p['games_played'] + 1, wins=p['wins'] + rng.randint(0, 1),
+                    avg_score=round(p['avg_score'] + rng.uniform(-15, 15), 1))
+               for p in rng.sample(players, min(n, 50))]
+    start = time.perf_counter()
+    changed = [len(store.update(p)) for p in updates]
+    update_time = (time.perf_counter() - start) / len(updates)
+    return {
+        'players': n,
+        'loop_s': loop_time,
+        'loop_estimated': len(sample) < n,
+        'vector_s': vector_best,
+        'vector_median_s': vector_median,
+        'update_s': update_time,
+        'update_changed': statistics.mean(changed),
+        'checked': len(sample),
+        'mismatches': mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000])
+    parser.add_argument('--max-loop', type=int, default=500,
+                        help='players scored by the per-player loop before sampling kicks in')
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help='log every per-player DQ breakdown (DEBUG)')
+    args = parser.parse_args()
+
+    # At DEBUG the per-player path records and logs a DQExplanation for every player
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    calculator = DataDrivenDominanceQuotientCalculator()
+
+    print(f"{'players':>8} {'loop':>12} {'calculate_all':>14} {'speedup':>9} {'update':>10} "
+          f"{'DQs moved':>10} {'checked':>8} {'mismatches':>11}")
+    failed = False
+    for n in args.sizes:
+        row = bench_size(calculator, n, args.max_loop, args.iterations, args.seed)
+        loop = f"{row['loop_s'] * 1000:.1f}ms" + ('*' if row['loop_estimated'] else '')
+        print(f"{n:>8} {loop:>12} {row['vector_s'] * 1000:>12.2f}ms "
+              f"{row['loop_s'] / row['vector_s']:>8.0f}x {row['update_s'] * 1000:>8.2f}ms "
+              f"{row['update_changed']:>10.0f} {row['checked']:>8} {row['mismatches']:>11}")
+        failed = failed or row['mismatches'] > 0
+    print("* extrapolated from a sample of --max-loop players")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+# File: discord_bot/scripts/bench_ingest.py
+"""End-to-end ingest benchmark against the local fake ballchasing API
+
+Starts scripts/fake_ballchasing.py in-process, points every ballchasing caller
+at it through BALLCHASING_BASE_URL, then times each ingestion path:
+
+    updater   BallchasingStatsUpdater.fetch_group_stats + extract_player_stats
+    cog       BLCSXStatsCog.process_group_data (into a throwaway SQLite file)
+    process   Process.process_team_data for one group snapshot
+    sync      the FastAPI sync_replay path (BallchasingService.sync_replay)
+    replays   services BallchasingService replay listing + concurrent detail fetch
+
+    python scripts/bench_ingest.py --players 500 --replays 1000 --latency-ms 30 --rate-limit 0.02
+
+Paths whose dependencies are missing from this environment are reported as skipped.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.fake_ballchasing import add_server_arguments, server_from_args
+
+logger = logging.getLogger(__name__)
+
+BENCH_GROUP_ID = "bench-group"
+BENCH_API_KEY = "fake-ballchasing-key"
+
+
+async def bench_updater(args):
+    from services.ballchasing_stats_updater import BallchasingStatsUpdater
+    updater = BallchasingStatsUpdater(BENCH_API_KEY)
+    updater.group_id = BENCH_GROUP_ID
+
+    async def run():
+        group_data = await updater.fetch_group_stats()
+        return len(updater.extract_player_stats(group_data))
+    return run
+
+
+async def bench_cog(args, scratch_dir):
+    from cogs.blcsx_stats import BLCSXStatsCog
+
+    # Never the configured DATABASE_URL: each run upserts player stats and
+    # records DQ snapshots, which would show up in /blcs_movers
+    database_url = os.environ.get('DATABASE_URL')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(scratch_dir, 'bench_cog.db')}"
+    try:
+        cog = BLCSXStatsCog(bot=None)
+    finally:
+        if database_url is None:
+            os.environ.pop('DATABASE_URL', None)
+        else:
+            os.environ['DATABASE_URL'] = database_url
+    cog.ballchasing_token = BENCH_API_KEY
+
+    async def run():
+        await cog.process_group_data(BENCH_GROUP_ID)
+        return args.players * args.scale
+    return run
+
+
+async def bench_process(args):
+    from scripts.process import Process
+
+    def process_once():
+        # A fresh Process each time, so the group is fetched and flattened again
+        process = Process()
+        snapshot = process.get_snapshot(BENCH_GROUP_ID, BENCH_API_KEY)
+        process.process_team_data(snapshot=snapshot)
+        return len(snapshot.players)
+
+    async def run():
+        return await asyncio.to_thread(process_once)
+    return run
+
+
+async def bench_sync(args, replay_ids):
+    from scripts.ballchasing_service import BallchasingService
+    service = BallchasingService(BENCH_API_KEY)
+
+    async def run():
+        await asyncio.gather(*(service.sync_replay(replay_id) for replay_id in replay_ids))
+        return len(replay_ids)
+    return run
+
+
+async def bench_replays(args):
+    from services.ballchasing_service import BallchasingService
+    service = BallchasingService(max_concurrent_fetches=args.concurrency)
+    service.api_key = BENCH_API_KEY
+
+    async def run():
+        ingested = 0
+        async for replays in service.iter_group_replays(BENCH_GROUP_ID):
+            replay_ids = [replay['id'] for replay in replays]
+            async for replay_id, details in service.fetch_replay_details(replay_ids):
+                if details:
+                    service.extract_player_stats(details)
+                    ingested += 1
+        return ingested
+    return run
+
+
+def summarize(name, durations, units, server_stats):
+    total = sum(durations)
+    return {
+        'path': name,
+        'iterations': len(durations),
+        'units': units,
+        'mean_s': statistics.mean(durations),
+        'p50_s': statistics.median(durations),
+        'p95_s': sorted(durations)[max(int(round(0.95 * len(durations))) - 1, 0)],
+        'max_s': max(durations),
+        'units_per_s': units / total if total else 0.0,
+        **server_stats,
+    }
+
+
+async def run_path(name, make_runner, args, server, cache_root):
+    from utils import group_cache
+    from utils.ballchasing_api import close_ballchasing_client
+
+    try:
+        run = await make_runner()
+    except Exception as e:
+        # Missing optional dependencies (discord, mongo models, config) mean this path can't run here
+        return {'path': name, 'skipped': f"{type(e).__name__}: {e}"}
+
+    durations = []
+    units = 0
+    before = dict(server.stats)
+    try:
+        for iteration in range(args.warmup + args.iterations):
+            if not args.warm_cache:
+                # Every iteration starts cold: fresh cache dir, no parsed payloads in memory
+                cache_dir = os.path.join(cache_root, f"{name}-{iteration}")
+                group_cache.group_cache = group_cache.GroupCache(cache_dir)
+
+            start = time.perf_counter()
+            count = await run()
+            elapsed = time.perf_counter() - start
+            if iteration >= args.warmup:
+                durations.append(elapsed)
+                units += count or 0
+    except Exception as e:
+        traceback.print_exc()
+        return {'path': name, 'failed': f"{type(e).__name__}: {e}"}
+    finally:
+        await close_ballchasing_client()
+
+    server_stats = {key: server.stats[key] - before.get(key, 0) for key in server.stats}
+    return summarize(name, durations, units, server_stats)
+
+
+def print_report(results):
+    header = f"{'path':<10}{'iters':>7}{'units':>9}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'units/s':>11}{'reqs':>8}{'429s':>7}{'304s':>7}"
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        if 'skipped' in result or 'failed' in result:
+            status = 'skipped' if 'skipped' in result else 'FAILED'
+            print(f"{result['path']:<10}  {status}: {result.get('skipped') or result.get('failed')}")
+            continue
+        print(f"{result['path']:<10}{result['iterations']:>7}{result['units']:>9}"
+              f"{result['mean_s'] * 1000:>10.1f}{result['p50_s'] * 1000:>10.1f}{result['p95_s'] * 1000:>10.1f}"
+              f"{result['units_per_s']:>11.1f}{result['requests']:>8}{result['rate_limited']:>7}"
+              f"{result['not_modified']:>7}")
+
+
+async def run_benchmarks(args, server):
+    cache_root = tempfile.mkdtemp(prefix='bench-ballchasing-')
+    os.environ['BALLCHASING_CACHE_DIR'] = os.path.join(cache_root, 'default')
+
+    replay_ids = server.data.replay_order[:args.sync_replays]
+    paths = {
+        'updater': lambda: bench_updater(args),
+        'cog': lambda: bench_cog(args, cache_root),
+        'process': lambda: bench_process(args),
+        'sync': lambda: bench_sync(args, replay_ids),
+        'replays': lambda: bench_replays(args),
+    }
+
+    results = []
+    try:
+        for name in args.paths:
+            logger.info(f"Benchmarking {name}")
+            results.append(await run_path(name, paths[name], args, server, cache_root))
+    finally:
+        shutil.rmtree(cache_root, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_server_arguments(parser)
+    parser.add_argument('--paths', nargs='+', default=['updater', 'cog', 'process', 'sync', 'replays'],
+                        choices=['updater', 'cog', 'process', 'sync', 'replays'])
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--warm-cache', action='store_true',
+                        help='keep the group cache between iterations (measures the 304 path)')
+    parser.add_argument('--concurrency', type=int, default=4, help='replay detail fetches in flight')
+    parser.add_argument('--sync-replays', type=int, default=50, help='replays per sync_replay iteration')
+    parser.add_argument('--json', dest='json_out', help='also write results to this JSON file')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    # The ingestion paths log per player; keep that out of the timings unless asked
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    server = server_from_args(args).start_in_thread()
+    os.environ['BALLCHASING_BASE_URL'] = server.base_url
+    os.environ['BALLCHASING_API_KEY'] = BENCH_API_KEY
+    os.environ['TOKEN'] = BENCH_API_KEY
+    print(f"Fake ballchasing API on {server.base_url}: {args.players * args.scale} players, "
+          f"{len(server.data.replays)} replays, {args.latency_ms:g}ms latency, {args.rate_limit:.0%} 429s")
+
+    try:
+        results = asyncio.run(run_benchmarks(args, server))
+    finally:
+        server.stop_thread()
+
+    print_report(results)
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# File: discord_bot/scripts/crawl_groups.py
+"""Crawl ballchasing group trees into one dataset tagged with each replay's group path
+
+With no group IDs, every entry of `group_paths` in shared/config/conf/main.yaml
+is crawled. Subgroups are walked concurrently, replays shared between groups
+are fetched once, and the result is written as players/replays/groups Parquet.
+
+    python scripts/crawl_groups.py
+    python scripts/crawl_groups.py blcsx-1-yp2y1hqpvg --concurrency 12 --out-dir data/processed/crawl
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+from omegaconf import OmegaConf
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.ballchasing_api import get_ballchasing_client, close_ballchasing_client
+from utils.group_crawler import GroupCrawler
+
+logger = logging.getLogger(__name__)
+
+BOT_DIR = Path(__file__).resolve().parent.parent
+# shared/ sits next to discord_bot/ in the repo and inside it in the image
+MAIN_CONFIG_CANDIDATES = [
+    BOT_DIR / 'shared' / 'config' / 'conf' / 'main.yaml',
+    BOT_DIR.parent / 'shared' / 'config' / 'conf' / 'main.yaml',
+]
+
+
+def load_main_config():
+    """The shared main.yaml, or an empty config if it isn't present"""
+    for path in MAIN_CONFIG_CANDIDATES:
+        if path.exists():
+            return OmegaConf.load(path)
+    logger.warning("shared/config/conf/main.yaml not found")
+    return OmegaConf.create({})
+
+
+def configured_group_ids():
+    """Group IDs listed under group_paths in the shared main.yaml"""
+    return [str(group_id) for group_id in load_main_config().get('group_paths', {}).values()]
+
+
+async def crawl(group_ids, concurrency, fetch_details):
+    try:
+        crawler = GroupCrawler(get_ballchasing_client(), max_concurrency=concurrency, fetch_details=fetch_details)
+        return await crawler.crawl(group_ids)
+    finally:
+        await close_ballchasing_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('group_ids', nargs='*', help='root group IDs (default: group_paths in main.yaml)')
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv('BALLCHASING_CRAWL_CONCURRENCY', 8)),
+                        help='ballchasing requests in flight at once')
+    parser.add_argument('--no-details', action='store_true', help='list groups and replays only')
+    parser.add_argument('--out-dir', default='data/processed/crawl')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    group_ids = args.group_ids or configured_group_ids()
+    if not group_ids:
+        parser.error("no group IDs given and none configured")
+
+    start = time.perf_counter()
+    result = asyncio.run(crawl(group_ids, args.concurrency, not args.no_details))
+    elapsed = time.perf_counter() - start
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    result.group_frame().to_parquet(out_dir / 'groups.parquet', index=False)
+    result.replay_frame().to_parquet(out_dir / 'replays.parquet', index=False)
+    if not args.no_details:
+        result.player_frame().to_parquet(out_dir / 'players.parquet', index=False)
+
+    print(f"Crawled {len(result.groups)} groups and {len(result.replays)} unique replays "
+          f"({len(result.player_rows)} player rows, {len(result.failed_replays)} failed) "
+          f"in {elapsed:.1f}s -> {out_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,470 @@
+# File: discord_bot/scripts/fake_ballchasing.py
+"""Local stand-in for the ballchasing.com API, for offline ingestion benchmarks
+
+Serves /api/groups/{id}, /api/groups?group= (subgroups), /api/replays
+(paginated with a `next` cursor) and /api/replays/{id}. Payloads come from recorded JSON if a record directory is
+given (groups/{id}.json, replays/{id}.json), otherwise they are synthesized;
+either way the roster can be scaled up to stress the ingestion paths.
+
+    python scripts/fake_ballchasing.py --players 500 --replays 2000 --latency-ms 40 --rate-limit 0.02
+    BALLCHASING_BASE_URL=http://127.0.0.1:8089/api python bot.py
+"""
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+ROOT_GROUP_ID = 'bench-league'
+
+PLATFORMS = ['steam', 'epic', 'ps4', 'xbox']
+MAPS = [('stadium_p', 'DFH Stadium'), ('eurostadium_p', 'Mannfield'), ('cs_p', 'Champions Field'),
+        ('utopiastadium_p', 'Utopia Coliseum'), ('wasteland_s_p', 'Wasteland')]
+
+
+class FakeBallchasingData:
+    """Recorded or synthetic group and replay payloads, serialized once up front"""
+
+    def __init__(self, players: int = 64, replays: int = 400, scale: int = 1,
+                 record_dir: Optional[str] = None, seed: int = 0,
+                 seasons: int = 0, shared_replays: float = 0.0):
+        self.rng = random.Random(seed)
+        self.scale = max(scale, 1)
+        self.record_dir = Path(record_dir) if record_dir else None
+
+        recorded_replays = self._load_recorded('replays')
+        self.roster = self._make_roster(players)
+        self.replays: Dict[str, dict] = recorded_replays or self._make_replays(replays)
+        # Replay list order: newest upload first, like ballchasing
+        self.replay_order: List[str] = sorted(
+            self.replays, key=lambda rid: self.replays[rid].get('created', ''), reverse=True
+        )
+        self.replay_bodies = {rid: json.dumps(r).encode() for rid, r in self.replays.items()}
+
+        # Optional group tree: root -> season-N -> regular-season / playoffs
+        self.group_names: Dict[str, str] = {}
+        self.subgroups: Dict[str, List[str]] = {}
+        self.group_replays: Dict[str, List[str]] = {}
+        if seasons:
+            self._make_tree(seasons, shared_replays)
+
+        self._recorded_groups = self._load_recorded('groups')
+        self._group_bodies: Dict[str, bytes] = {}
+        self._group_etags: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _load_recorded(self, kind: str) -> Dict[str, dict]:
+        if self.record_dir is None or not (self.record_dir / kind).is_dir():
+            return {}
+        recorded = {}
+        for path in sorted((self.record_dir / kind).glob('*.json')):
+            with open(path, 'r') as f:
+                recorded[path.stem] = json.load(f)
+        logger.info(f"Loaded {len(recorded)} recorded {kind} from {self.record_dir}")
+        return recorded
+
+    # === Synthetic payloads ===
+
+    def _make_roster(self, players: int) -> List[dict]:
+        roster = []
+        for i in range(players):
+            roster.append({
+                'platform': PLATFORMS[i % len(PLATFORMS)],
+                'id': f"{76561198000000000 + i}",
+                'name': f"Player{i:04d}",
+                'team': f"Team {i // 3:03d}",
+                # Per-player strength, so stats are correlated like a real league
+                'skill': self.rng.uniform(0.5, 1.5),
+            })
+        return roster
+
+    def _core_stats(self, skill: float, games: int = 1) -> dict:
+        rng = self.rng
+        shots = sum(rng.randint(0, int(4 * skill) + 1) for _ in range(games))
+        goals = min(shots, sum(rng.randint(0, int(2 * skill) + 1) for _ in range(games)))
+        return {
+            'shots': shots,
+            'shots_against': sum(rng.randint(1, 6) for _ in range(games)),
+            'goals': goals,
+            'goals_against': sum(rng.randint(0, 4) for _ in range(games)),
+            'saves': sum(rng.randint(0, 3) for _ in range(games)),
+            'assists': sum(rng.randint(0, int(1.5 * skill) + 1) for _ in range(games)),
+            'score': sum(int(rng.gauss(350 * skill, 90)) for _ in range(games)),
+            'shooting_percentage': round(100 * goals / shots, 2) if shots else 0,
+        }
+
+    def _averaged(self, stats: dict, games: int) -> dict:
+        averaged = {}
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                averaged[key] = self._averaged(value, games)
+            elif key.endswith('percentage') or key.startswith('avg_'):
+                averaged[key] = value
+            else:
+                averaged[key] = round(value / games, 4) if games else 0
+        return averaged
+
+    def _player_cumulative(self, member: dict, games: int) -> dict:
+        skill = member['skill']
+        return {
+            'games': games,
+            'wins': sum(self.rng.random() < 0.5 * skill for _ in range(games)),
+            'core': self._core_stats(skill, games),
+            'demo': {'inflicted': self.rng.randint(0, 2 * games), 'taken': self.rng.randint(0, 2 * games)},
+            'boost': {'amount_stolen_big': round(self.rng.uniform(100, 400) * games, 1),
+                      'amount_stolen_small': round(self.rng.uniform(50, 200) * games, 1)},
+            'movement': {'avg_speed': int(self.rng.gauss(1450 + 80 * skill, 40))},
+        }
+
+    def _make_group(self, group_id: str) -> dict:
+        players = []
+        for member in self.roster:
+            games = self.rng.randint(8, 20)
+            cumulative = self._player_cumulative(member, games)
+            cumulative['win_percentage'] = round(100 * cumulative['wins'] / games, 2)
+            players.append({
+                'platform': member['platform'],
+                'id': member['id'],
+                'name': member['name'],
+                'team': member['team'],
+                'cumulative': cumulative,
+                'game_average': self._averaged({k: v for k, v in cumulative.items()
+                                                if isinstance(v, dict)}, games),
+            })
+
+        teams = {}
+        for player in players:
+            team = teams.setdefault(player['team'], {'name': player['team'], 'players': [],
+                                                     'cumulative': None})
+            team['players'].append({'platform': player['platform'], 'id': player['id'],
+                                    'name': player['name']})
+            if team['cumulative'] is None:
+                team['cumulative'] = copy.deepcopy(player['cumulative'])
+        for team in teams.values():
+            cumulative = team['cumulative']
+            team['game_average'] = self._averaged({k: v for k, v in cumulative.items()
+                                                   if isinstance(v, dict)}, cumulative['games'])
+
+        return {
+            'id': group_id,
+            'name': self.group_names.get(group_id, group_id),
+            'status': 'ok',
+            'players': players,
+            'teams': list(teams.values()),
+        }
+
+    def _replay_team(self, color: str, members: List[dict]) -> dict:
+        players = []
+        for member in members:
+            players.append({
+                'id': {'platform': member['platform'], 'id': member['id']},
+                'name': member['name'],
+                'stats': {
+                    'core': self._core_stats(member['skill']),
+                    'demo': {'inflicted': self.rng.randint(0, 3), 'taken': self.rng.randint(0, 3)},
+                    'movement': {'avg_speed': int(self.rng.gauss(1500, 60))},
+                },
+            })
+        totals = {key: sum(p['stats']['core'][key] for p in players)
+                  for key in ('shots', 'goals', 'saves', 'assists', 'score')}
+        return {'color': color, 'name': members[0]['team'], 'players': players, 'stats': {'core': totals},
+                **{k: totals[k] for k in ('goals', 'shots', 'saves', 'assists')}, 'score': totals['goals']}
+
+    def _make_replays(self, count: int) -> Dict[str, dict]:
+        replays = {}
+        teams = {}
+        for member in self.roster:
+            teams.setdefault(member['team'], []).append(member)
+        team_names = sorted(teams)
+        if len(team_names) < 2:
+            return replays
+
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for i in range(count):
+            blue, orange = self.rng.sample(team_names, 2)
+            created = start + timedelta(minutes=7 * i, seconds=self.rng.randint(0, 59))
+            map_code, map_name = self.rng.choice(MAPS)
+            replay_id = f"{self.rng.getrandbits(128):032x}"
+            replays[replay_id] = {
+                'id': replay_id,
+                'created': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'date': created.isoformat(),
+                'map_code': map_code,
+                'map_name': map_name,
+                'duration': self.rng.randint(300, 420),
+                'blue': self._replay_team('blue', teams[blue]),
+                'orange': self._replay_team('orange', teams[orange]),
+            }
+        return replays
+
+    def _make_tree(self, seasons: int, shared_replays: float):
+        root = ROOT_GROUP_ID
+        self.group_names[root] = 'BLCS All Seasons'
+        leaves = []
+        for season in range(1, seasons + 1):
+            season_id = f"blcs-{season}-season"
+            self.group_names[season_id] = f"BLCS {season}"
+            self.subgroups.setdefault(root, []).append(season_id)
+            for stage in ('regular-season', 'playoffs'):
+                leaf_id = f"blcs-{season}-{stage}"
+                self.group_names[leaf_id] = stage.replace('-', ' ').title()
+                self.subgroups.setdefault(season_id, []).append(leaf_id)
+                leaves.append(leaf_id)
+
+        # Replays are spread over the leaves in upload order; some also land in a second leaf
+        ordered = sorted(self.replays, key=lambda rid: self.replays[rid].get('created', ''))
+        for i, replay_id in enumerate(ordered):
+            leaf = leaves[i * len(leaves) // len(ordered)]
+            self.group_replays.setdefault(leaf, []).append(replay_id)
+            if self.rng.random() < shared_replays:
+                other = self.rng.choice([l for l in leaves if l != leaf] or [leaf])
+                if other != leaf:
+                    self.group_replays.setdefault(other, []).append(replay_id)
+        for group_id in self.group_replays:
+            self.group_replays[group_id].sort(key=lambda rid: self.replays[rid].get('created', ''), reverse=True)
+
+    def replays_in(self, group_id: Optional[str]) -> List[str]:
+        """Replay IDs directly in a group, newest first; without a tree every group holds all of them"""
+        if group_id and self.group_names:
+            return self.group_replays.get(group_id, [])
+        return self.replay_order
+
+    def group_summary(self, group_id: str) -> dict:
+        return {
+            'id': group_id,
+            'name': self.group_names.get(group_id, group_id),
+            'link': f"https://ballchasing.com/api/groups/{group_id}",
+            'direct_replays': len(self.group_replays.get(group_id, [])),
+        }
+
+    # === Scaling ===
+
+    def _scale_group(self, group: dict) -> dict:
+        """Replicate a (recorded) roster `scale` times with jittered numbers"""
+        if self.scale == 1:
+            return group
+        scaled = dict(group)
+        for key in ('players', 'teams'):
+            rows = []
+            for copy_index in range(self.scale):
+                for row in group.get(key, []):
+                    clone = self._jitter(copy.deepcopy(row)) if copy_index else row
+                    if copy_index:
+                        clone['name'] = f"{row.get('name', '')}#{copy_index}"
+                        if key == 'players':
+                            clone['id'] = f"{row.get('id', '')}-{copy_index}"
+                            clone['team'] = f"{row.get('team', '')}#{copy_index}"
+                    rows.append(clone)
+            scaled[key] = rows
+        return scaled
+
+    def _jitter(self, value):
+        if isinstance(value, dict):
+            return {k: self._jitter(v) for k, v in value.items()}
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return value
+        jittered = value * self.rng.uniform(0.8, 1.2)
+        return int(round(jittered)) if isinstance(value, int) else round(jittered, 4)
+
+    # === Lookup ===
+
+    def group(self, group_id: str):
+        """(body, etag) for a group; unknown IDs get a synthetic group"""
+        with self._lock:
+            if group_id not in self._group_bodies:
+                payload = self._recorded_groups.get(group_id) or self._make_group(group_id)
+                body = json.dumps(self._scale_group(payload)).encode()
+                self._group_bodies[group_id] = body
+                self._group_etags[group_id] = f'"{hashlib.sha1(body).hexdigest()}"'
+            return self._group_bodies[group_id], self._group_etags[group_id]
+
+
+class FakeBallchasingServer:
+    """aiohttp app serving FakeBallchasingData with injected latency and rate limiting"""
+
+    def __init__(self, data: FakeBallchasingData, host: str = '127.0.0.1', port: int = 8089,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, rate_limit: float = 0.0,
+                 retry_after: float = 0.1, max_page_size: int = 200, etags: bool = True, seed: int = 0):
+        self.data = data
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.max_page_size = max_page_size
+        self.etags = etags
+        self.rng = random.Random(seed)
+
+        self.stats = {'requests': 0, 'rate_limited': 0, 'not_modified': 0}
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/api"
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._simulate_network])
+        app.router.add_get('/api/groups', self.handle_group_list)
+        app.router.add_get('/api/groups/{group_id}', self.handle_group)
+        app.router.add_get('/api/replays', self.handle_replay_list)
+        app.router.add_get('/api/replays/{replay_id}', self.handle_replay)
+        return app
+
+    @web.middleware
+    async def _simulate_network(self, request, handler):
+        self.stats['requests'] += 1
+        delay = self.latency_ms + (self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if not request.headers.get('Authorization'):
+            return web.json_response({'error': 'missing API key'}, status=401)
+        if self.rate_limit and self.rng.random() < self.rate_limit:
+            self.stats['rate_limited'] += 1
+            return web.json_response({'error': 'rate limit exceeded'}, status=429,
+                                     headers={'Retry-After': f"{self.retry_after:g}"})
+        return await handler(request)
+
+    async def handle_group(self, request):
+        body, etag = self.data.group(request.match_info['group_id'])
+        if not self.etags:
+            return web.Response(body=body, content_type='application/json')
+        if request.headers.get('If-None-Match') == etag:
+            self.stats['not_modified'] += 1
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(body=body, content_type='application/json', headers={'ETag': etag})
+
+    def _paginate(self, request, items: List, render) -> dict:
+        """One page of items plus the `next` cursor URL, the way ballchasing lists things"""
+        query = request.query
+        count = min(int(query.get('count', 150)), self.max_page_size)
+        offset = int(query.get('after', 0))
+
+        listing = {
+            'count': len(items),
+            'list': [render(item) for item in items[offset:offset + count]],
+        }
+        if offset + count < len(items):
+            next_query = {k: v for k, v in query.items() if k != 'after'}
+            next_query['after'] = str(offset + count)
+            listing['next'] = str(request.url.with_query(next_query))
+        return listing
+
+    async def handle_group_list(self, request):
+        children = self.data.subgroups.get(request.query.get('group'), [])
+        return web.json_response(self._paginate(request, children, self.data.group_summary))
+
+    async def handle_replay_list(self, request):
+        order = self.data.replays_in(request.query.get('group'))
+        created_after = request.query.get('created-after')
+        if created_after:
+            order = [rid for rid in order if self.data.replays[rid].get('created', '') > created_after]
+
+        def summary(replay_id):
+            replay = self.data.replays[replay_id]
+            return {k: replay[k] for k in ('id', 'created', 'date', 'map_code', 'duration') if k in replay}
+        return web.json_response(self._paginate(request, order, summary))
+
+    async def handle_replay(self, request):
+        body = self.data.replay_bodies.get(request.match_info['replay_id'])
+        if body is None:
+            return web.json_response({'error': 'replay not found'}, status=404)
+        return web.Response(body=body, content_type='application/json')
+
+    # === Lifecycle ===
+
+    async def start(self):
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = self._runner.addresses[0][1]
+        logger.info(f"Fake ballchasing API listening on {self.base_url}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self):
+        """Serve from a background thread, so synchronous (requests) callers can hit it too"""
+        ready = threading.Event()
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, name='fake-ballchasing', daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop_thread(self):
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    """Options shared by the standalone server and the ingest benchmark"""
+    parser.add_argument('--players', type=int, default=64, help='synthetic roster size')
+    parser.add_argument('--replays', type=int, default=400, help='synthetic replays in the group')
+    parser.add_argument('--scale', type=int, default=1, help='replicate every group roster this many times')
+    parser.add_argument('--record-dir', help='directory with recorded groups/*.json and replays/*.json')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='added latency per request')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='+/- random latency per request')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=float, default=0.1, help='Retry-After seconds sent with a 429')
+    parser.add_argument('--page-size', type=int, default=200, help='largest replay list page served')
+    parser.add_argument('--no-etag', action='store_true', help='never answer group requests with 304')
+    parser.add_argument('--seasons', type=int, default=0,
+                        help=f"serve a group tree under '{ROOT_GROUP_ID}' with this many seasons")
+    parser.add_argument('--shared-replays', type=float, default=0.0,
+                        help='fraction of replays that also appear in a second leaf group')
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def server_from_args(args, host: str = '127.0.0.1', port: int = 0) -> FakeBallchasingServer:
+    data = FakeBallchasingData(players=args.players, replays=args.replays, scale=args.scale,
+                               record_dir=args.record_dir, seed=args.seed,
+                               seasons=args.seasons, shared_replays=args.shared_replays)
+    return FakeBallchasingServer(data, host=host, port=port, latency_ms=args.latency_ms,
+                                 jitter_ms=args.jitter_ms, rate_limit=args.rate_limit,
+                                 retry_after=args.retry_after, max_page_size=args.page_size,
+                                 etags=not args.no_etag, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_server_arguments(parser)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = server_from_args(args, host=args.host, port=args.port)
+    print(f"Serving fake ballchasing API on {server.base_url}")
+    web.run_app(server.make_app(), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,35 +4,27 @@ from pathlib import Path
 import logging
 import os
 import sys
-from scipy.stats import zscore
 import dataframe_image as dfi
 from numpy import round
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.config import Config
+from utils.group_cache import fetch_group_columns
+from utils.group_stream import PLAYER_FIELDS, TEAM_FIELDS
+from utils.rating_kernel import pipeline_player_kernel, pipeline_team_kernel
 from visualization.visualization import make_highlighted_table, team_styled_table
 
 config = Config()
 
 def fetch_playoff_player_stats(group_id, token=config._ballchasing_token):
 
-    url = f"https://ballchasing.com/api/groups/{group_id}"
-    headers = {"Authorization": token}
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    data = response.json()
-    df = pd.json_normalize(data, record_path=["players"])
-    return df
+    columns = fetch_group_columns(group_id, token, {"players": PLAYER_FIELDS})
+    return columns.frame("players")
 
 def fetch_playoff_team_stats(group_id, token=config._ballchasing_token):
 
-    url = f"https://ballchasing.com/api/groups/{group_id}"
-    headers = {"Authorization": token}
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    data = response.json()
-    df = pd.json_normalize(data, record_path=["teams"])
-    return df
+    columns = fetch_group_columns(group_id, token, {"teams": TEAM_FIELDS})
+    return columns.frame("teams")
 
 def process():
     logging.info("Processing player data")
@@ -59,20 +51,10 @@ def process():
     df_final2 = df_final.copy()
     df_final2 = df_final2.drop("Team", axis=1)
     logging.info("Calculating Z-scores and Dominance Quotient for players...")
-    df_final2["Avg Score Zscore"] = round(zscore(df_final2["Avg Score"]) * config.avg_score, 2)
-    df_final2["Goals Per Game Zscore"] = round(zscore(df_final2["Goals Per Game"]) * config.goals_per_game, 2)
-    df_final2["Assists Per Game Zscore"] = round(zscore(df_final2["Assists Per Game"]) * config.assists_per_game, 2)
-    df_final2["Saves Per Game Zscore"] = round(zscore(df_final2["Saves Per Game"]) * config.saves_per_game, 2)
-    df_final2["Shots Per Game Zscore"] = round(zscore(df_final2["Shots Per Game"]) * config.shots_per_game, 2)
-    df_final2["Demos Inf. Per Game Zscore"] = round(zscore(df_final2["Demos Inf. Per Game"]) * config.demos_per_games, 2)
-    df_final2["Demos Taken Per Game Zscore"] = round(zscore(df_final2["Demos Taken Per Game"]) * config.demos_taken_per_game, 2)
-    df_final2["Big Boost Stolen Zscore"] = round(zscore(df_final2["Big Boost Stolen"]) * config.count_big_pads_stolen_per_game, 2)
-    df_final2["Small Boost Stolen Zscore"] = round(zscore(df_final2["Small Boost Stolen"]) * config.count_small_pads_stolen_per_game, 2)
+    contributions, dominance_quotients = pipeline_player_kernel(config, 'zscore').rate_frame(df_final2)
+    df_final2[contributions.columns] = contributions
     df_final2["Shooting %"] = df_final2["Shooting %"] / 100
-
-    # Calculate Dominance Quotient
-    dq_summation = [i for i in df_final2.columns.tolist() if "Zscore" in i]
-    df_final2["Dominance Quotient"] = (df_final2[dq_summation].sum(axis=1) + 2) * config.dominance_quotient_multiplier
+    df_final2["Dominance Quotient"] = dominance_quotients
 
     df_final2 = df_final2[["Player", "Dominance Quotient", "Avg Score", "Goals Per Game", "Assists Per Game", "Saves Per Game", "Shots Per Game", "Shooting %", "Demos Inf. Per Game", "Demos Taken Per Game", "Big Boost Stolen", "Small Boost Stolen"]]
 
@@ -87,27 +69,6 @@ def filter_player_data():
     logging.info("Filtering player data...")
     df_final2, df_final = process()
 
-    logging.info("Calculating Z-scores and Dominance Quotient for players...")
-    df_final2["Avg Score Zscore"] = round(zscore(df_final2["Avg Score"]) * config.avg_score, 2)
-    df_final2["Goals Per Game Zscore"] = round(zscore(df_final2["Goals Per Game"]) * config.goals_per_game, 2)
-    df_final2["Assists Per Game Zscore"] = round(zscore(df_final2["Assists Per Game"]) * config.assists_per_game, 2)
-    df_final2["Saves Per Game Zscore"] = round(zscore(df_final2["Saves Per Game"]) * config.saves_per_game, 2)
-    df_final2["Shots Per Game Zscore"] = round(zscore(df_final2["Shots Per Game"]) * config.shots_per_game, 2)
-    df_final2["Demos Inf. Per Game Zscore"] = round(zscore(df_final2["Demos Inf. Per Game"]) * config.demos_per_games, 2)
-    df_final2["Demos Taken Per Game Zscore"] = round(zscore(df_final2["Demos Taken Per Game"]) * config.demos_taken_per_game, 2)
-    df_final2["Big Boost Stolen Zscore"] = round(zscore(df_final2["Big Boost Stolen"]) * config.count_big_pads_stolen_per_game, 2)
-    df_final2["Small Boost Stolen Zscore"] = round(zscore(df_final2["Small Boost Stolen"]) * config.count_small_pads_stolen_per_game, 2)
-
-    # for styling purposes
-    df_final2["Shooting %"] = df_final2["Shooting %"] / 100
-
-    # Calculate Dominance Quotient
-    dq_summation = [i for i in df_final2.columns.tolist() if "Zscore" in i]
-    df_final2["Dominance Quotient"] = (df_final2[dq_summation].sum(axis=1) + 2) * config.dominance_quotient_multiplier
-    df_final2 = df_final2[["Player", "Dominance Quotient", "Avg Score", "Goals Per Game", "Assists Per Game", "Saves Per Game", "Shots Per Game", "Shooting %", "Demos Inf. Per Game", "Demos Taken Per Game", "Big Boost Stolen", "Small Boost Stolen"]]
-    df_final2 = df_final2.sort_values(by="Dominance Quotient", ascending=False).reset_index(drop=True)
-    df_final2.index += 1
-
     # Save the cleaned data to a parquet file
     df_final2.to_parquet("../data/parquet/playoff_player_data_season_4.parquet")
 
@@ -130,19 +91,9 @@ def filter_team_data():
     team_df["Goal Diff"] = team_df["cumulative.core.goals"] - team_df["cumulative.core.goals_against"]
     team_df["Demo Diff"] = team_df["cumulative.demo.inflicted"] - team_df["cumulative.demo.taken"]
     team_df["Shots Diff"] = team_df["cumulative.core.shots"] - team_df["cumulative.core.shots_against"]
-    team_df["Win % Zscore"] = zscore(team_df["cumulative.win_percentage"]) * config.win_perc_weight
-    team_df["Goal Diff Zscore"] = zscore(team_df["Goal Diff"]) * config.goal_diff_weight
-    team_df["Demo Diff Zscore"] = zscore(team_df["Demo Diff"]) * config.demo_diff_weight
-    team_df["Shots Diff Zscore"] = zscore(team_df["Shots Diff"]) * config.shot_diff_weight
 
     # Calculate EPI Score
-    team_df["EPI Score"] = team_df[[
-        "Win % Zscore", 
-        "Goal Diff Zscore", 
-        "Demo Diff Zscore", 
-        "Shots Diff Zscore", 
-        # "Team Played Win % Zscore"
-    ]].sum(axis=1)
+    _, team_df["EPI Score"] = pipeline_team_kernel(config).rate_frame(team_df)
 
     features_of_interest = ["name", "cumulative.win_percentage", "game_average.core.goals", "game_average.core.goals_against", "cumulative.core.goals", 
                         "cumulative.core.goals_against", "game_average.core.shots", "game_average.core.shots_against", "cumulative.core.shots", "cumulative.core.shots_against", "EPI Score"
@@ -7,7 +7,6 @@
 #     "pyarrow",
 #     "python-dotenv",
 #     "requests",
-#     "scipy",
 # ]
 # ///
 import requests
@@ -16,46 +15,57 @@ from pathlib import Path
 import logging
 import os
 import sys
-from scipy.stats import zscore
 import dataframe_image as dfi
 import numpy as np
 import asyncio
 import traceback
+from functools import cached_property
 # from numpy import round
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.config import Config
+from utils.group_cache import fetch_group_columns
+from utils.rating_kernel import pipeline_player_kernel, pipeline_team_kernel
 from visualization.visualization import make_highlighted_table, team_styled_table, export_styled_table, create_styled_table
 
 config = Config()
 
+class GroupSnapshot:
+    """A ballchasing group fetched once and flattened once for every stage of a run"""
+    def __init__(self, group_id, columns):
+        self.group_id = group_id
+        # Only the field paths in utils.group_stream.GROUP_FIELDS are ever parsed
+        self.columns = columns
+
+    @classmethod
+    def fetch(cls, group_id, token=config._ballchasing_token):
+        return cls(group_id, fetch_group_columns(group_id, token))
+
+    @cached_property
+    def players(self) -> pd.DataFrame:
+        return self.columns.frame("players")
+
+    @cached_property
+    def teams(self) -> pd.DataFrame:
+        return self.columns.frame("teams")
+
+
 class Process:
     def __init__(self):
-        pass
+        # One snapshot per group and one set of player DQ results per snapshot
+        self._snapshots = {}
+        self._player_results = {}
 
+    def get_snapshot(self, group_id, token=config._ballchasing_token) -> GroupSnapshot:
+        if group_id not in self._snapshots:
+            self._snapshots[group_id] = GroupSnapshot.fetch(group_id, token)
+        return self._snapshots[group_id]
 
     def fetch_player_data(self, group_id, token=config._ballchasing_token):
-        url = f"https://ballchasing.com/api/groups/{group_id}"
-        headers = {"Authorization": token}
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        df = pd.json_normalize(data, record_path=["players"])
-        return df
+        return self.get_snapshot(group_id, token).players.copy()
     
     def fetch_team_data(self, group_id, token=config._ballchasing_token):
-        url = f"https://ballchasing.com/api/groups/{group_id}"
-        headers = {"Authorization": token}
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        df = pd.json_normalize(data, record_path=["teams"])
-        return df
-    
-    def minmax_scale(self, data):
-        min_val = np.min(data)
-        max_val = np.max(data)
-        return (data - min_val) / (max_val - min_val)
+        return self.get_snapshot(group_id, token).teams.copy()
     
     def remove_accidental_game(self, df: pd.DataFrame, index: int) -> pd.DataFrame:
         df = df.sort_values('team')
@@ -63,9 +73,18 @@ class Process:
         return df
     
 
-    def process_player_data(self, group_id=config.current_group_id):
+    def process_player_data(self, group_id=config.current_group_id, snapshot: GroupSnapshot = None):
+        snapshot = snapshot or self.get_snapshot(group_id)
+        if snapshot not in self._player_results:
+            self._player_results[snapshot] = self._compute_player_data(snapshot)
+
+        # Copies, so callers styling or mutating their frames don't leak into the team stage
+        df_final, df_final0 = self._player_results[snapshot]
+        return df_final.copy(), df_final0.copy()
+
+    def _compute_player_data(self, snapshot: GroupSnapshot):
         logging.info("Processing player data")
-        df = self.fetch_player_data(group_id=group_id)
+        df = snapshot.players.copy()
         features_to_keep = [
             "name",
             "team",
@@ -90,15 +109,10 @@ class Process:
         df_final = df_final0.copy()
         # df_final = df_final.drop("Team", axis=1)
         logging.info("Calculating Z-scores and Dominance Quotient for players...")
-        df_final["Avg Score Zscore"] = np.round(self.minmax_scale(df_final["Avg Score"]) * config.avg_score, 2)
-        df_final["Goals Per Game Zscore"] = np.round(self.minmax_scale(df_final["Goals Per Game"]) * config.goals_per_game, 2)
-        df_final["Assists Per Game Zscore"] = np.round(self.minmax_scale(df_final["Assists Per Game"]) * config.assists_per_game, 2)
-        df_final["Saves Per Game Zscore"] = np.round(self.minmax_scale(df_final["Saves Per Game"]) * config.saves_per_game, 2)
-        df_final["Shots Per Game Zscore"] = np.round(self.minmax_scale(df_final["Shots Per Game"]) * config.shots_per_game, 2)
-        df_final["Demos Inf. Per Game Zscore"] = np.round(self.minmax_scale(df_final["Demos Inf. Per Game"]) * config.demos_per_games, 2)
-        df_final["Demos Taken Per Game Zscore"] = -np.round(self.minmax_scale(df_final["Demos Taken Per Game"]) * config.demos_taken_per_game, 2)
-        df_final["Big Boost Stolen Zscore"] = np.round(self.minmax_scale(df_final["Big Boost Stolen"]) * config.count_big_pads_stolen_per_game, 2)
-        df_final["Small Boost Stolen Zscore"] = np.round(self.minmax_scale(df_final["Small Boost Stolen"]) * config.count_small_pads_stolen_per_game, 2)
+        # Demos taken count against the player here
+        player_kernel = pipeline_player_kernel(config, 'minmax', negate=("Demos Taken Per Game",))
+        contributions, dominance_quotients = player_kernel.rate_frame(df_final)
+        df_final[contributions.columns] = contributions
         df_final["Shooting %"] = df_final["Shooting %"] / 100
 
         logging.info("Saving to parquet file...")
@@ -108,9 +122,7 @@ class Process:
 
         df_final = df_final.drop("Team", axis=1)
 
-        # Calculate Dominance Quotient
-        dq_summation = [i for i in df_final.columns.tolist() if "Zscore" in i]
-        df_final["Dominance Quotient"] = (df_final[dq_summation].sum(axis=1) + 2) * config.dominance_quotient_multiplier
+        df_final["Dominance Quotient"] = dominance_quotients
 
         df_final = df_final[["Player", "Dominance Quotient", "Avg Score", "Goals Per Game", "Assists Per Game", "Saves Per Game", "Shots Per Game", "Shooting %", "Demos Inf. Per Game", "Demos Taken Per Game", "Big Boost Stolen", "Small Boost Stolen"]]
 
@@ -146,9 +158,10 @@ class Process:
 
         return merged_df
 
-    def process_team_data(self, group_id=config.current_group_id):
+    def process_team_data(self, group_id=config.current_group_id, snapshot: GroupSnapshot = None):
         """Filter the data."""
-        team_df = self.fetch_team_data(group_id=group_id)
+        snapshot = snapshot or self.get_snapshot(group_id)
+        team_df = snapshot.teams.copy()
 
         # team_df = self.merge_remove_duplicate_teams(team_df)
 
@@ -167,7 +180,7 @@ class Process:
         # team_df = team_df.drop(7, axis=0).reset_index(drop=True)
   
 
-        df_final2, df_final = self.process_player_data()
+        df_final2, df_final = self.process_player_data(snapshot=snapshot)
         # Load the data
         team_df = team_df.sort_values(by="name").reset_index(drop=True)
         team_df["Goal Diff"] = team_df["cumulative.core.goals"] - team_df["cumulative.core.goals_against"]
@@ -175,19 +188,9 @@ class Process:
         team_df["Shots Diff"] = team_df["cumulative.core.shots"] - team_df["cumulative.core.shots_against"]
         team_df["Demos Inflicted"] = team_df["game_average.demo.inflicted"]
         team_df["Demos Taken"] = team_df["game_average.demo.taken"]
-        team_df["Win % Zscore"] = zscore(team_df["cumulative.win_percentage"]) * config.win_perc_weight
-        team_df["Goal Diff Zscore"] = zscore(team_df["Goal Diff"]) * config.goal_diff_weight
-        team_df["Demo Diff Zscore"] = zscore(team_df["Demo Diff"]) * config.demo_diff_weight
-        team_df["Shots Diff Zscore"] = zscore(team_df["Shots Diff"]) * config.shot_diff_weight
 
         # Calculate EPI Score
-        team_df["EPI Score"] = team_df[[
-            "Win % Zscore", 
-            "Goal Diff Zscore", 
-            "Demo Diff Zscore", 
-            "Shots Diff Zscore", 
-            # "Team Played Win % Zscore"
-        ]].sum(axis=1)
+        _, team_df["EPI Score"] = pipeline_team_kernel(config).rate_frame(team_df)
 
         print(team_df)
 
@@ -255,8 +258,11 @@ def run():
 
         p = Process()
 
+        # Fetch and parse the group once; both stages share it
+        snapshot = p.get_snapshot(config.current_group_id)
+
         # Player data
-        player_df, _ = p.process_player_data()
+        player_df, _ = p.process_player_data(snapshot=snapshot)
         player_path = f"data/parquet/{config.all_player_data}.parquet"
         player_df.to_parquet(player_path)
         print(f"Saved player data to {player_path}")
@@ -268,7 +274,7 @@ def run():
         print(f"Generated player image at {player_img_path}")
 
         # Team data
-        team_df = p.process_team_data()
+        team_df = p.process_team_data(snapshot=snapshot)
         team_path = f"data/parquet/{config.all_team_data}.parquet"
         team_df.to_parquet(team_path)
         print(f"Saved team data to {team_path}")
@@ -0,0 +1,149 @@
+# File: discord_bot/scripts/tune_weights.py
+"""Tune Dominance Quotient (or EPI) weights against archived seasons
+
+Candidate weight sets are scored against every archived season under data/
+(see utils.weight_tuning for the objectives). The first half of the trials is
+spread uniformly over all weight sets with the current total; the second half
+is drawn around the best sets found so far. Batches of trials are scored in a
+process pool; the same --seed gives the same result for any --workers.
+
+The best weights are printed (or written with --output) as YAML: for dq, the
+dominance_quotient section of shared/config/conf/blcsx_calculator_config.yaml;
+for epi, main.yaml's team_weights. Weights are rounded to 4 places and the
+rounded set is re-scored before it is reported.
+
+    python scripts/tune_weights.py
+    python scripts/tune_weights.py --trials 20000 --workers 8 --output data/processed/dq_weights.yaml
+    python scripts/tune_weights.py --target epi
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from omegaconf import OmegaConf
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.dominance_quotient import DataDrivenDominanceQuotientCalculator
+from utils.weight_tuning import DQTuningData, EPITuningData, load_archived_seasons, sample_weight_sets
+
+logger = logging.getLogger(__name__)
+
+BOT_DIR = Path(__file__).resolve().parent.parent
+# data/ and shared/ sit next to discord_bot/ in the repo and inside it in the image
+DATA_DIR_CANDIDATES = [BOT_DIR / 'data', BOT_DIR.parent / 'data']
+MAIN_CONFIG_CANDIDATES = [
+    BOT_DIR / 'shared' / 'config' / 'conf' / 'main.yaml',
+    BOT_DIR.parent / 'shared' / 'config' / 'conf' / 'main.yaml',
+]
+REFINE_POOL = 10  # best sets the refinement half is drawn around
+
+_tuning_data = None  # set once per worker process
+
+
+def _init_worker(tuning_data):
+    global _tuning_data
+    _tuning_data = tuning_data
+
+
+def _score_batch(weight_sets):
+    return _tuning_data.score(weight_sets)
+
+
+def load_team_weights():
+    for path in MAIN_CONFIG_CANDIDATES:
+        if path.exists():
+            return OmegaConf.to_container(OmegaConf.load(path).team_weights)
+    raise FileNotFoundError("shared/config/conf/main.yaml not found")
+
+
+def score_all(pool, tuning_data, weight_sets, batch_size):
+    batches = [weight_sets[start:start + batch_size] for start in range(0, len(weight_sets), batch_size)]
+    if pool is None:
+        return np.concatenate([tuning_data.score(batch) for batch in batches])
+    return np.concatenate(list(pool.map(_score_batch, batches)))
+
+
+def tune(tuning_data, trials, workers, batch_size, seed):
+    """Best weight set and its score after trials candidates"""
+    rng = np.random.default_rng(seed)
+    base, tunable = tuning_data.base_weights, tuning_data.tunable
+    explore = sample_weight_sets(rng, base, tunable, trials // 2)
+
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(tuning_data,)) if workers > 1 else None
+    try:
+        candidates = np.vstack([base, explore])
+        scores = score_all(pool, tuning_data, candidates, batch_size)
+
+        # Refine: equal shares of the remaining trials around each of the best sets so far
+        leaders = candidates[np.argsort(-scores, kind='stable')[:REFINE_POOL]]
+        per_leader = max((trials - len(explore)) // len(leaders), 1)
+        refine = np.vstack([sample_weight_sets(rng, base, tunable, per_leader, center=leader, concentration=200)
+                            for leader in leaders])
+        candidates = np.vstack([candidates, refine])
+        scores = np.concatenate([scores, score_all(pool, tuning_data, refine, batch_size)])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    best = candidates[int(np.argmax(scores))]
+    return best, len(candidates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', choices=['dq', 'epi'], default='dq')
+    parser.add_argument('--trials', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--batch-size', type=int, default=500, help='weight sets scored per pool task')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', type=Path, default=None,
+                        help='archive root holding parquet/ and processed/ (default: the repo data/)')
+    parser.add_argument('--output', type=Path, default=None, help='write the YAML here instead of stdout')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    data_dir = args.data_dir or next((path for path in DATA_DIR_CANDIDATES if path.exists()), None)
+    if data_dir is None:
+        parser.error("no data/ directory found; pass --data-dir")
+    seasons = load_archived_seasons(data_dir)
+
+    if args.target == 'dq':
+        tuning_data = DQTuningData(seasons, DataDrivenDominanceQuotientCalculator())
+    else:
+        tuning_data = EPITuningData(seasons, load_team_weights())
+    frozen = [key for key, tunable in zip(tuning_data.stat_keys, tuning_data.tunable) if not tunable]
+    if frozen:
+        logger.info(f"No archived data varies {', '.join(frozen)}; keeping the current weight")
+
+    start = time.perf_counter()
+    best, evaluated = tune(tuning_data, args.trials, max(args.workers, 1), args.batch_size, args.seed)
+    elapsed = time.perf_counter() - start
+    best = np.round(best, 4)
+
+    current_objectives, best_objectives = tuning_data.objectives(np.vstack([tuning_data.base_weights, best]))
+    print(f"{evaluated} weight sets in {elapsed:.1f}s ({evaluated / elapsed:.0f}/s)", file=sys.stderr)
+    print(f"{'objective':<40} {'current':>8} {'best':>8}", file=sys.stderr)
+    for name, current, tuned in zip(tuning_data.objective_names, current_objectives, best_objectives):
+        print(f"{name:<40} {current:>8.3f} {tuned:>8.3f}", file=sys.stderr)
+    print(f"{'mean':<40} {current_objectives.mean():>8.3f} {best_objectives.mean():>8.3f}", file=sys.stderr)
+
+    header = (f"# Tuned by scripts/tune_weights.py --target {args.target} --trials {args.trials} "
+              f"--seed {args.seed}\n# Seasons: {', '.join(season.name for season in seasons)}; "
+              f"mean correlation {best_objectives.mean():.3f} (current weights: {current_objectives.mean():.3f})\n")
+    text = header + OmegaConf.to_yaml(OmegaConf.create(tuning_data.as_config(best)))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text)
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        print(text, end='')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,53 +1,74 @@
-import requests
 import asyncio
 from datetime import datetime
 from models.player_profile import update_player_stats, get_player_profile
+from models.ingestion import ReplayLedger, parse_server_time, format_server_time
+from models.async_db import run_db
+from utils.ballchasing_api import get_ballchasing_client
 import os
 
 class BallchasingService:
-    def __init__(self):
+    def __init__(self, max_concurrent_fetches=None):
         self.api_key = os.getenv('BALLCHASING_API_KEY')
-        self.base_url = "https://ballchasing.com/api"
-        self.headers = {
-            'Authorization': self.api_key,
-            'Content-Type': 'application/json'
-        }
+        self.client = get_ballchasing_client()
+        
+        # Upper bound on replay detail requests in flight at once
+        self.max_concurrent_fetches = max_concurrent_fetches or int(
+            os.getenv('BALLCHASING_MAX_CONCURRENT_FETCHES', 4)
+        )
         
         # Discord ID to ballchasing player mapping
         # You'll populate this as you link players
         self.player_mapping = {}
+        
+        # Coroutines awaited with (group_id, replay, uploaded_at) for every newly ingested replay
+        self.replay_listeners = []
+    
+    def add_replay_listener(self, listener):
+        """Have listener(group_id, replay, uploaded_at) awaited after each replay is ingested"""
+        if listener not in self.replay_listeners:
+            self.replay_listeners.append(listener)
     
-    def get_group_replays(self, group_id, since_date=None):
-        """Get replays from a specific ballchasing group"""
-        url = f"{self.base_url}/replays"
+    async def iter_group_replays(self, group_id, since_date=None, created_after=None, page_size=200):
+        """Yield replay summaries from a ballchasing group one page at a time, following every page"""
         params = {
             'group': group_id,
-            'count': 200  # Max per request
+            'count': page_size  # 200 is the max per request
         }
         
         if since_date:
             params['replay-date-after'] = since_date.isoformat()
+        if created_after:
+            # Upload time on ballchasing's clock, unlike the in-game replay date
+            params['created-after'] = format_server_time(created_after)
         
-        try:
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"Error fetching replays: {e}")
-            return None
+        async for replays in self.client.iter_pages("replays", params=params, api_key=self.api_key):
+            yield replays
     
-    def get_replay_details(self, replay_id):
+    async def get_replay_details(self, replay_id):
         """Get detailed stats for a specific replay"""
-        url = f"{self.base_url}/replays/{replay_id}"
-        
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return await self.client.get_json(f"replays/{replay_id}", api_key=self.api_key)
+        except Exception as e:
             print(f"Error fetching replay {replay_id}: {e}")
             return None
     
+    async def fetch_replay_details(self, replay_ids):
+        """Fetch replay details concurrently, yielding (replay_id, details) as each one arrives"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+        
+        async def fetch(replay_id):
+            async with semaphore:
+                return replay_id, await self.get_replay_details(replay_id)
+        
+        tasks = [asyncio.create_task(fetch(replay_id)) for replay_id in replay_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Don't leave fetches running if the consumer stops early
+            for task in tasks:
+                task.cancel()
+    
     def extract_player_stats(self, replay_data):
         """Extract player stats from replay data"""
         players_stats = []
@@ -134,35 +155,75 @@ class BallchasingService:
         
         return updated_players
     
+    async def ingest_new_replays(self, group_id, ledger):
+        """One pass over a group: ingest every replay the ledger hasn't seen, then move its watermark
+
+        Returns the IDs of the replays ingested in this pass.
+        """
+        since = ledger.resume_from()
+        print(f"Checking for new replays uploaded since {since or 'the start of the group'}")
+        
+        ingested = []
+        newest_seen = None
+        oldest_failed = None
+        undated_failure = False
+        
+        # Stream replays since the watermark; later pages download while earlier ones are processed
+        async for replays in self.iter_group_replays(group_id, created_after=since):
+            uploaded = {}
+            for replay in replays:
+                replay_id = replay.get('id')
+                created = parse_server_time(replay.get('created'))
+                if created and (newest_seen is None or created > newest_seen):
+                    newest_seen = created
+                if replay_id and not ledger.is_processed(replay_id):
+                    uploaded[replay_id] = created
+            
+            if not uploaded:
+                continue
+            print(f"Found {len(uploaded)} new replays")
+            
+            async for replay_id, detailed_replay in self.fetch_replay_details(list(uploaded)):
+                if not detailed_replay:
+                    # Hold the watermark back so this replay is retried next pass
+                    created = uploaded[replay_id]
+                    if created is None:
+                        undated_failure = True
+                    elif oldest_failed is None or created < oldest_failed:
+                        oldest_failed = created
+                    continue
+                
+                # Profile updates hit the database synchronously, keep them off the event loop
+                updated_players = await run_db(
+                    self.process_replay_for_discord_users, detailed_replay
+                )
+                await run_db(ledger.mark_processed, replay_id, uploaded[replay_id])
+                ingested.append(replay_id)
+                
+                for listener in self.replay_listeners:
+                    try:
+                        await listener(group_id, detailed_replay, uploaded[replay_id])
+                    except Exception as e:
+                        print(f"Error in replay listener for {replay_id}: {e}")
+                
+                if updated_players:
+                    print(f"Updated {len(updated_players)} Discord users from replay {replay_id}")
+        
+        if undated_failure:
+            # No upload time to resume from: keep the watermark where it is, or the replay is never listed again
+            print(f"Keeping the watermark for {group_id} at {ledger.watermark}: a replay without an upload time failed")
+        else:
+            await run_db(ledger.advance_watermark, oldest_failed or newest_seen)
+        return ingested
+    
     async def monitor_group_for_updates(self, group_id, check_interval=300):
         """Monitor a ballchasing group for new replays (5 min intervals)"""
-        last_check = datetime.now()
+        # Durable ledger: survives restarts, and uses ballchasing's clock rather than ours
+        ledger = await run_db(ReplayLedger, group_id)
         
         while True:
             try:
-                print(f"Checking for new replays since {last_check}")
-                
-                # Get replays since last check
-                replays_data = self.get_group_replays(group_id, since_date=last_check)
-                
-                if replays_data and replays_data.get('list'):
-                    new_replays = replays_data['list']
-                    print(f"Found {len(new_replays)} new replays")
-                    
-                    for replay in new_replays:
-                        replay_id = replay.get('id')
-                        if replay_id:
-                            # Get detailed replay data
-                            detailed_replay = self.get_replay_details(replay_id)
-                            if detailed_replay:
-                                # Process for Discord users
-                                updated_players = self.process_replay_for_discord_users(detailed_replay)
-                                
-                                if updated_players:
-                                    print(f"Updated {len(updated_players)} Discord users from replay {replay_id}")
-                
-                last_check = datetime.now()
-                
+                await self.ingest_new_replays(group_id, ledger)
             except Exception as e:
                 print(f"Error in monitoring loop: {e}")
             
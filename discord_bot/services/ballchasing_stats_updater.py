@@ -1,6 +1,5 @@
 # File: discord_bot/services/ballchasing_stats_updater.py
 
-import aiohttp
 import asyncio
 import json
 from datetime import datetime
@@ -10,6 +9,8 @@ from models.player_profile import (
     get_player_profile, create_or_update_profile, 
     update_player_stats, get_all_profiles
 )
+from models.async_db import run_db
+from utils.ballchasing_api import get_ballchasing_client, BallchasingAPIError
 
 logger = logging.getLogger(__name__)
 
@@ -28,20 +29,14 @@ class BallchasingStatsUpdater:
     async def fetch_group_stats(self) -> Dict:
         """Fetch comprehensive stats from your BLCS group"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Get group data with player statistics
-                url = f"{self.base_url}/groups/{self.group_id}"
-                
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        group_data = await response.json()
-                        logger.info(f"✅ Successfully fetched BLCS group data")
-                        return group_data
-                    else:
-                        logger.error(f"❌ Failed to fetch group data: {response.status}")
-                        error_text = await response.text()
-                        logger.error(f"Error details: {error_text}")
-                        return {}
+            # Get group data with player statistics over the shared pooled client
+            group_data = await get_ballchasing_client().get_group(self.group_id, api_key=self.api_key)
+            logger.info(f"✅ Successfully fetched BLCS group data")
+            return group_data
+        except BallchasingAPIError as e:
+            logger.error(f"❌ Failed to fetch group data: {e.status}")
+            logger.error(f"Error details: {e}")
+            return {}
         except Exception as e:
             logger.error(f"❌ Error fetching group stats: {e}")
             return {}
@@ -57,6 +52,9 @@ class BallchasingStatsUpdater:
             try:
                 # Get player identifiers
                 player_id = player.get('id', {})
+                if not isinstance(player_id, dict):
+                    # Group payloads list platform and ID side by side
+                    player_id = {'platform': player.get('platform', 'unknown'), 'id': player_id}
                 player_name = player.get('name', 'Unknown')
                 platform = player_id.get('platform', 'unknown')
                 
@@ -145,6 +143,42 @@ class BallchasingStatsUpdater:
         self.player_mapping[discord_id] = ballchasing_name.lower()
         logger.info(f"✅ Linked Discord {discord_id} to ballchasing '{ballchasing_name}'")
     
+    def save_player_profile(self, discord_id: int, matching_player: Dict):
+        """Create or update one linked player's profile from their ballchasing stats"""
+        # Get or create profile
+        profile = get_player_profile(discord_id)
+        
+        if not profile:
+            # Create new profile
+            create_or_update_profile(
+                discord_id,
+                rl_name=matching_player['name'],
+                **self.convert_stats_for_profile(matching_player)
+            )
+            logger.info(f"✅ Created new profile for {matching_player['name']}")
+        else:
+            # Update existing profile
+            update_data = self.convert_stats_for_profile(matching_player)
+            for key, value in update_data.items():
+                if hasattr(profile, key):
+                    setattr(profile, key, value)
+            
+            # Update timestamp
+            profile.last_updated = datetime.utcnow()
+            
+            # Save changes (assuming you have a session management system)
+            try:
+                from models.player_profile import Session
+                session = Session()
+                session.merge(profile)
+                session.commit()
+                session.close()
+            except:
+                # Fallback if session management is different
+                create_or_update_profile(discord_id, **update_data)
+            
+            logger.info(f"✅ Updated profile for {matching_player['name']}")
+    
     async def update_all_player_profiles(self):
         """Update all linked players with fresh ballchasing data"""
         # Fetch fresh data from ballchasing
@@ -172,39 +206,8 @@ class BallchasingStatsUpdater:
                         break
                 
                 if matching_player:
-                    # Get or create profile
-                    profile = get_player_profile(discord_id)
-                    
-                    if not profile:
-                        # Create new profile
-                        create_or_update_profile(
-                            discord_id,
-                            rl_name=matching_player['name'],
-                            **self.convert_stats_for_profile(matching_player)
-                        )
-                        logger.info(f"✅ Created new profile for {matching_player['name']}")
-                    else:
-                        # Update existing profile
-                        update_data = self.convert_stats_for_profile(matching_player)
-                        for key, value in update_data.items():
-                            if hasattr(profile, key):
-                                setattr(profile, key, value)
-                        
-                        # Update timestamp
-                        profile.last_updated = datetime.utcnow()
-                        
-                        # Save changes (assuming you have a session management system)
-                        try:
-                            from models.player_profile import Session
-                            session = Session()
-                            session.merge(profile)
-                            session.commit()
-                            session.close()
-                        except:
-                            # Fallback if session management is different
-                            create_or_update_profile(discord_id, **update_data)
-                        
-                        logger.info(f"✅ Updated profile for {matching_player['name']}")
+                    # Profile reads/writes are synchronous SQLAlchemy, keep them off the event loop
+                    await run_db(self.save_player_profile, discord_id, matching_player)
                     
                     updated_count += 1
                 else:
@@ -1,13 +1,234 @@
+# File: discord_bot/utils/ballchasing_api.py
+
 import aiohttp
+import asyncio
+import json
 import os
+import logging
+from typing import Dict, Any, Optional, Sequence
+
+from utils.group_cache import get_group_cache
+from utils.group_stream import CHUNK_SIZE, GROUP_FIELDS, GroupColumns, GroupStreamParser
+
+logger = logging.getLogger(__name__)
+
+
+class BallchasingAPIError(Exception):
+    """Raised when ballchasing.com answers with a non-200 status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"API request failed with status {status}: {message}")
+        self.status = status
+
+
+class BallchasingClient:
+    """Long-lived, keep-alive HTTP client shared by every ballchasing caller"""
+
+    def __init__(self, api_key: Optional[str] = None,
+                 base_url: str = "https://ballchasing.com/api",
+                 pool_limit: int = 20,
+                 pool_limit_per_host: int = 10,
+                 dns_ttl: int = 300,
+                 keepalive_timeout: float = 60.0,
+                 request_timeout: float = 30.0,
+                 max_retries: int = 3):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.pool_limit = pool_limit
+        self.pool_limit_per_host = pool_limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it on first use"""
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                # One connector for the whole process: connections, DNS lookups
+                # and TLS sessions are reused across every request.
+                connector = aiohttp.TCPConnector(
+                    limit=self.pool_limit,
+                    limit_per_host=self.pool_limit_per_host,
+                    use_dns_cache=True,
+                    ttl_dns_cache=self.dns_ttl,
+                    keepalive_timeout=self.keepalive_timeout,
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                )
+                logger.info(f"Opened pooled ballchasing session (limit={self.pool_limit}, "
+                            f"per_host={self.pool_limit_per_host})")
+        return self._session
+
+    def _headers(self, api_key: Optional[str] = None) -> Dict[str, str]:
+        token = api_key or self.api_key
+        return {"Authorization": token} if token else {}
+
+    def _url(self, endpoint: str) -> str:
+        if endpoint.startswith('http'):
+            return endpoint
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+
+    def _retry_delay(self, retry_after: Optional[str], attempt: int) -> float:
+        try:
+            return max(float(retry_after), 0.0)
+        except (TypeError, ValueError):
+            return min(2 ** attempt, 30)
+
+    async def _get(self, url: str, headers: Dict[str, str],
+                   params: Optional[Dict[str, Any]] = None):
+        """GET a URL, backing off on 429; returns (status, headers, body)"""
+        session = await self.get_session()
+        for attempt in range(self.max_retries + 1):
+            async with session.get(url, headers=headers, params=params) as response:
+                if response.status != 429 or attempt == self.max_retries:
+                    return response.status, response.headers, await response.read()
+                delay = self._retry_delay(response.headers.get('Retry-After'), attempt)
+            logger.warning(f"Rate limited by ballchasing on {url}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def get_json(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                       api_key: Optional[str] = None) -> Dict[str, Any]:
+        """GET an API endpoint (relative to base_url, or absolute) and decode the JSON body"""
+        status, _, body = await self._get(self._url(endpoint), self._headers(api_key), params)
+        if status != 200:
+            raise BallchasingAPIError(status, body.decode(errors='replace'))
+        return json.loads(body)
+
+    async def iter_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                         api_key: Optional[str] = None):
+        """Follow ballchasing's `next` cursor, yielding the `list` of each page in order
+
+        The next page is already being downloaded while the caller works on the
+        current one, and at most two pages are held at a time.
+        """
+        pending = asyncio.create_task(self.get_json(endpoint, params=params, api_key=api_key))
+        try:
+            while pending is not None:
+                page = await pending
+                next_url = page.get('next')
+                pending = asyncio.create_task(self.get_json(next_url, api_key=api_key)) if next_url else None
+                yield page.get('list', [])
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def get_group(self, group_id: str, api_key: Optional[str] = None) -> Dict[str, Any]:
+        """GET /groups/{id}, sending cached validators so an unchanged group costs a 304"""
+        cache = get_group_cache()
+        url = f"{self.base_url}/groups/{group_id}"
+        conditional = await asyncio.to_thread(cache.conditional_headers, group_id)
+
+        status, headers, body = await self._get(url, {**self._headers(api_key), **conditional})
+        if status == 304:
+            cached = await asyncio.to_thread(cache.load, group_id)
+            if cached is not None:
+                logger.info(f"Group {group_id} not modified, using cached payload")
+                return cached
+            # Validators survived but the body did not; fetch it unconditionally
+            status, headers, body = await self._get(url, self._headers(api_key))
+
+        if status != 200:
+            raise BallchasingAPIError(status, body.decode(errors='replace'))
+        return await asyncio.to_thread(cache.store, group_id, body, headers)
+
+    async def get_group_columns(self, group_id: str, fields: Dict[str, Sequence[str]] = GROUP_FIELDS,
+                                api_key: Optional[str] = None) -> GroupColumns:
+        """Like get_group, but stream-parse only the given field paths of the players/teams arrays"""
+        cache = get_group_cache()
+        url = f"{self.base_url}/groups/{group_id}"
+        conditional = await asyncio.to_thread(cache.conditional_headers, group_id)
+
+        session = await self.get_session()
+        attempt = 0
+        while True:
+            async with session.get(url, headers={**self._headers(api_key), **conditional}) as response:
+                if response.status == 304 and conditional:
+                    columns = await asyncio.to_thread(cache.load_columns, group_id, fields)
+                    if columns is not None:
+                        logger.info(f"Group {group_id} not modified, using cached payload")
+                        return columns
+                    # Validators survived but the body did not; fetch it unconditionally
+                    conditional = {}
+                    continue
+                if response.status == 200:
+                    return await self._parse_group_body(group_id, response, fields)
+                if response.status != 429 or attempt == self.max_retries:
+                    raise BallchasingAPIError(response.status, await response.text())
+                delay = self._retry_delay(response.headers.get('Retry-After'), attempt)
+            attempt += 1
+            logger.warning(f"Rate limited by ballchasing on {url}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _parse_group_body(self, group_id: str, response: aiohttp.ClientResponse,
+                                fields: Dict[str, Sequence[str]]) -> GroupColumns:
+        cache = get_group_cache()
+        pending = await asyncio.to_thread(cache.begin_store, group_id, response.headers)
+        parser = GroupStreamParser(fields)
+
+        def consume(chunk: bytes):
+            parser.feed(chunk)
+            if pending is not None:
+                pending.write(chunk)
+
+        try:
+            # Parsing happens off the loop, one chunk at a time, as the body arrives
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                await asyncio.to_thread(consume, chunk)
+            columns = parser.close()
+        except BaseException:
+            if pending is not None:
+                pending.abort()
+            raise
+        if pending is not None:
+            await asyncio.to_thread(pending.commit)
+            cache.remember_columns(group_id, fields, columns)
+        return columns
+
+    async def close(self):
+        """Close the pooled session and release its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Closed pooled ballchasing session")
+        self._session = None
+
+
+# Global client instance
+ballchasing_client = None
+
+def get_ballchasing_client() -> BallchasingClient:
+    """Get the process-wide ballchasing client, creating it from the environment if needed"""
+    global ballchasing_client
+    if ballchasing_client is None:
+        ballchasing_client = BallchasingClient(
+            api_key=os.getenv('BALLCHASING_API_KEY') or os.getenv('TOKEN'),
+            base_url=os.getenv('BALLCHASING_BASE_URL', 'https://ballchasing.com/api'),
+            pool_limit=int(os.getenv('BALLCHASING_POOL_LIMIT', 20)),
+            pool_limit_per_host=int(os.getenv('BALLCHASING_POOL_LIMIT_PER_HOST', 10)),
+            dns_ttl=int(os.getenv('BALLCHASING_DNS_TTL', 300)),
+            keepalive_timeout=float(os.getenv('BALLCHASING_KEEPALIVE_TIMEOUT', 60)),
+            max_retries=int(os.getenv('BALLCHASING_MAX_RETRIES', 3)),
+        )
+    return ballchasing_client
+
+async def close_ballchasing_client():
+    """Close the process-wide ballchasing client (call on shutdown)"""
+    global ballchasing_client
+    if ballchasing_client is not None:
+        await ballchasing_client.close()
+        ballchasing_client = None
+
 
 async def fetch_group_stats(group_id: str):
-    headers = {"Authorization": os.getenv("TOKEN")}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            f"https://ballchasing.com/api/groups/{group_id}",
-            headers=headers
-        ) as response:
-            if response.status != 200:
-                raise ValueError(f"API Error: {await response.text()}")
-            return await response.json()
+    try:
+        return await get_ballchasing_client().get_group(group_id, api_key=os.getenv("TOKEN"))
+    except BallchasingAPIError as e:
+        raise ValueError(f"API Error: {e}")
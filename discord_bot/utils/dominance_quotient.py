@@ -0,0 +1,568 @@
+# File: discord_bot/utils/dominance_quotient.py
+
+import copy
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from omegaconf import OmegaConf
+
+from .rating_kernel import as_float_array, percentile_ranks, sum_columns
+
+logger = logging.getLogger(__name__)
+
+BOT_DIR = Path(__file__).resolve().parent.parent
+# shared/ sits next to discord_bot/ in the repo and inside it in the image
+DQ_CONFIG_CANDIDATES = [
+    BOT_DIR / 'shared' / 'config' / 'conf' / 'blcsx_calculator_config.yaml',
+    BOT_DIR.parent / 'shared' / 'config' / 'conf' / 'blcsx_calculator_config.yaml',
+]
+DQ_CONFIG_SECTION = 'dominance_quotient'
+
+# Used when the YAML is missing, and for any key it leaves out
+DEFAULT_DQ_CONFIG = {
+    'stat_weights': {
+        'avg_score': 0.40,
+        'saves_per_game': 0.25,
+        'goals_per_game': 0.15,
+        'assists_per_game': 0.10,
+        'shot_percentage': 0.03,
+        'shots_per_game': 0.02,
+        'win_rate': 0.05,
+    },
+    'tournament_config': {
+        'min_games_threshold': 8,
+        'early_elimination_threshold': 14,
+        'deep_run_threshold': 22,
+        'confidence_games': 16,
+        'early_elimination_boost': 0.12,
+        'deep_run_penalty': 0.06,
+    },
+    'performance_benchmarks': {
+        'elite_score_threshold': 450,
+        'good_score_threshold': 380,
+        'average_score_threshold': 320,
+        'elite_saves_threshold': 2.2,
+        'good_saves_threshold': 1.8,
+        'elite_goals_threshold': 1.1,
+        'good_goals_threshold': 0.8,
+        'elite_assists_threshold': 1.0,
+    },
+}
+
+# Weight names from older configs, and the player stat each one means
+STAT_KEY_ALIASES = {
+    'shooting_pct': 'shot_percentage',
+}
+
+
+def dq_config_path() -> Optional[Path]:
+    """The calculator YAML: BLCS_DQ_CONFIG if set, else the shared config"""
+    if os.getenv('BLCS_DQ_CONFIG'):
+        return Path(os.environ['BLCS_DQ_CONFIG'])
+    return next((path for path in DQ_CONFIG_CANDIDATES if path.exists()), None)
+
+
+def load_dq_config(path: Optional[Path] = None) -> Dict:
+    """DEFAULT_DQ_CONFIG overlaid with the YAML's dominance_quotient section
+
+    Raises ValueError if the file exists but doesn't hold a usable config.
+    """
+    config = copy.deepcopy(DEFAULT_DQ_CONFIG)
+    path = path or dq_config_path()
+    if path is None or not Path(path).exists():
+        return config
+
+    try:
+        section = OmegaConf.to_container(OmegaConf.load(path), resolve=True).get(DQ_CONFIG_SECTION) or {}
+    except Exception as e:
+        raise ValueError(f"Could not read {path}: {e}") from e
+    for name, values in section.items():
+        if name not in config or not isinstance(values, dict):
+            raise ValueError(f"{path}: unknown or malformed section {DQ_CONFIG_SECTION}.{name}")
+        if name == 'stat_weights':
+            config[name] = {}  # the weight set is replaced whole, so a stat can be dropped
+            for stat_key in values:
+                if stat_key in STAT_KEY_ALIASES:
+                    logger.warning(f"{path}: stat weight {stat_key} is read as {STAT_KEY_ALIASES[stat_key]}")
+            # Player rows never carry the old names, which would rank everyone at the 50th percentile
+            values = {STAT_KEY_ALIASES.get(k, k): v for k, v in values.items()}
+        config[name].update(values)
+
+    for stat_key, weight in config['stat_weights'].items():
+        if not isinstance(weight, (int, float)) or weight < 0:
+            raise ValueError(f"{path}: weight for {stat_key} must be a non-negative number")
+    return config
+
+
+class DQWeights:
+    """The calculator config compiled into NumPy arrays for the vectorized scorer"""
+
+    def __init__(self, config: Dict):
+        weights = config['stat_weights']
+        tournament = config['tournament_config']
+        benchmarks = config['performance_benchmarks']
+
+        # Summed in this order, so vectorized and per-player sums round the same way
+        self.stat_keys: Tuple[str, ...] = tuple(weights)
+        self.vector = np.array([weights[stat_key] for stat_key in self.stat_keys], dtype=float)
+        # Stats ranked by league percentile; win_rate is ranked separately with regression to the mean
+        self.ranked_stats: Tuple[str, ...] = tuple(k for k in self.stat_keys if k != 'win_rate')
+
+        self.early_elimination_threshold = tournament['early_elimination_threshold']
+        self.deep_run_threshold = tournament['deep_run_threshold']
+        self.tournament_factors = np.array([1.0 + tournament['early_elimination_boost'],
+                                            1.0 - tournament['deep_run_penalty']])
+        # Score tiers 3/2/1 and the stats that count as a specialty
+        self.score_tiers = np.array([benchmarks['elite_score_threshold'], benchmarks['good_score_threshold'],
+                                     benchmarks['average_score_threshold']], dtype=float)
+        self.specialties = (
+            ('saves_per_game', benchmarks['elite_saves_threshold']),
+            ('goals_per_game', benchmarks['elite_goals_threshold']),
+            ('assists_per_game', benchmarks['elite_assists_threshold']),
+        )
+
+
+class DQConfigWatcher:
+    """Polls the calculator YAML and hands back the new config when the file changes"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else dq_config_path()
+        self._stamp = self._read_stamp()
+
+    def _read_stamp(self):
+        try:
+            stat = self.path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except (AttributeError, OSError):
+            return None
+
+    def poll(self) -> Optional[Dict]:
+        """The reloaded config if the file changed since the last poll, else None"""
+        stamp = self._read_stamp()
+        if stamp == self._stamp:
+            return None
+        self._stamp = stamp
+        try:
+            return load_dq_config(self.path)
+        except ValueError as e:
+            logger.error(f"Keeping the current DQ config: {e}")
+            return None
+
+
+def _stat_array(players: List[Dict], stat_key: str) -> np.ndarray:
+    return as_float_array([p.get(stat_key, 0) for p in players])
+
+
+class LeagueContext:
+    """League-wide win-rate figures, computed once per refresh instead of once per player"""
+
+    def __init__(self, games: np.ndarray, wins: np.ndarray, confidence_games: int):
+        self.confidence_games = confidence_games
+        # Game and win counts are integers, so these float sums are exact
+        self.league_avg_win_rate = float(np.sum(wins)) / max(float(np.sum(games)), 1)
+
+        adjusted = self.adjusted_win_rates(games, wins)
+        self.player_count = len(adjusted)  # before NaNs are dropped, as calculate_percentile counts them
+        self.sorted_adjusted_rates = np.sort(adjusted[~np.isnan(adjusted)])
+
+    @classmethod
+    def from_players(cls, players: List[Dict], confidence_games: int) -> 'LeagueContext':
+        return cls(_stat_array(players, 'games_played'), _stat_array(players, 'wins'), confidence_games)
+
+    def confidence(self, games):
+        """How far a player's own win rate is trusted over the league average (0-1)"""
+        return min(games / self.confidence_games, 1.0)
+
+    def adjusted_win_rate(self, games, wins) -> float:
+        """Win rate regressed toward the league average for small samples"""
+        confidence_factor = self.confidence(games)
+        return (confidence_factor * (wins / max(games, 1))) + \
+               ((1 - confidence_factor) * self.league_avg_win_rate)
+
+    def adjusted_win_rates(self, games: np.ndarray, wins: np.ndarray) -> np.ndarray:
+        """adjusted_win_rate for arrays of players (the same float operations, so the same bits)"""
+        confidence = np.minimum(games / self.confidence_games, 1.0)
+        return (confidence * (wins / np.maximum(games, 1))) + ((1 - confidence) * self.league_avg_win_rate)
+
+    def win_rate_percentile(self, adjusted_win_rate: float) -> float:
+        """Percentile of an adjusted win rate among the league's, by binary search"""
+        if self.player_count <= 1 or not len(self.sorted_adjusted_rates):
+            return 50.0
+        if pd.isna(adjusted_win_rate):
+            return 0.0
+        better_count = int(np.searchsorted(self.sorted_adjusted_rates, adjusted_win_rate, side='left'))
+        return (better_count / len(self.sorted_adjusted_rates)) * 100
+
+    def win_rate_percentiles(self, games: np.ndarray, wins: np.ndarray) -> np.ndarray:
+        """win_rate_percentile of adjusted_win_rate for arrays of players"""
+        if self.player_count <= 1 or not len(self.sorted_adjusted_rates):
+            return np.full(len(games), 50.0)
+        adjusted = self.adjusted_win_rates(games, wins)
+        better_count = np.where(np.isnan(adjusted), 0,
+                                np.searchsorted(self.sorted_adjusted_rates, adjusted, side='left'))
+        return (better_count / len(self.sorted_adjusted_rates)) * 100
+
+
+class DQExplanation:
+    """How one player's DQ was reached; recorded only when asked for"""
+
+    def __init__(self, player_id: str):
+        self.player_id = player_id
+        self.stats: Dict[str, Dict[str, float]] = {}  # stat -> value, percentile, weight, contribution
+        self.win_rate: Optional[float] = None
+        self.adjusted_win_rate: Optional[float] = None
+        self.win_rate_confidence: Optional[float] = None
+        self.games_played = 0
+        self.base_dominance_quotient: Optional[float] = None
+        self.tournament_factor: Optional[float] = None
+        self.adjustment_type = ''
+        self.consistency_bonus: Optional[float] = None
+        self.score_tier = 0
+        self.specialties = 0
+        self.dominance_quotient: Optional[float] = None
+
+    def add_stat(self, stat_key: str, value, percentile: float, weight: float, contribution: float):
+        self.stats[stat_key] = {'value': value, 'percentile': percentile,
+                                'weight': weight, 'contribution': contribution}
+
+    def as_dict(self) -> Dict:
+        return dict(self.__dict__)
+
+    def lines(self) -> List[str]:
+        """Human-readable breakdown, one line per step"""
+        if self.base_dominance_quotient is None:
+            return [f"Final DQ: {self.dominance_quotient:.1f} (no league data to compare against)"]
+        lines = [f"{stat_key}: {entry['value'] or 0:.2f} -> {entry['percentile']:.1f}th percentile "
+                 f"x {entry['weight']:.3f} = {entry['contribution']:.2f}"
+                 for stat_key, entry in self.stats.items()]
+        if self.adjusted_win_rate is not None:
+            lines.append(f"Win rate: {self.win_rate:.3f} -> {self.adjusted_win_rate:.3f} "
+                         f"(confidence: {self.win_rate_confidence:.2f})")
+        lines.append(f"Base DQ: {self.base_dominance_quotient:.2f}")
+        lines.append(f"Games: {self.games_played}, tournament factor: {self.tournament_factor:.3f} "
+                     f"({self.adjustment_type})")
+        lines.append(f"Consistency bonus: {self.consistency_bonus:.3f} "
+                     f"(score tier {self.score_tier}, {self.specialties} specialties)")
+        lines.append(f"Final DQ: {self.dominance_quotient:.1f}")
+        return lines
+
+    def __str__(self) -> str:
+        return "\n".join([f"=== DQ for {self.player_id} ===", *self.lines()])
+
+
+class DataDrivenDominanceQuotientCalculator:
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Dominance Quotient calculator based on BLCS4 season analysis
+        Designed to identify individual skill regardless of team performance
+
+        Weights and thresholds come from config (default: the dominance_quotient
+        section of shared/config/conf/blcsx_calculator_config.yaml).
+        """
+        self.apply_config(config if config is not None else load_dq_config())
+
+    def apply_config(self, config: Dict):
+        """Switch to a new weight set and thresholds"""
+        weights = DQWeights(config)
+        self.stat_weights = dict(config['stat_weights'])
+        self.tournament_config = dict(config['tournament_config'])
+        self.performance_benchmarks = dict(config['performance_benchmarks'])
+        self.weights = weights
+
+    @property
+    def ranked_stats(self) -> Tuple[str, ...]:
+        return self.weights.ranked_stats
+    
+    def calculate_percentile(self, player_value: float, all_values: List[float], 
+                           higher_is_better: bool = True) -> float:
+        """Calculate what percentage of players this value beats"""
+        if not all_values or len(all_values) <= 1:
+            return 50.0
+        
+        # Filter out invalid values
+        valid_values = [v for v in all_values if not pd.isna(v) and v is not None]
+        if not valid_values:
+            return 50.0
+        if player_value is None:
+            return 0.0  # Missing, like NaN, beats nobody
+        
+        if higher_is_better:
+            better_count = sum(1 for v in valid_values if v < player_value)
+        else:
+            better_count = sum(1 for v in valid_values if v > player_value)
+        
+        return (better_count / len(valid_values)) * 100
+    
+    def tournament_adjustment(self, games_played: int) -> Tuple[float, str]:
+        """Opportunity adjustment for games played, with the kind of adjustment applied"""
+        if games_played <= self.tournament_config['early_elimination_threshold']:
+            # Early elimination: Fewer opportunities to showcase skill
+            return 1.0 + self.tournament_config['early_elimination_boost'], "early elimination boost"
+        elif games_played >= self.tournament_config['deep_run_threshold']:
+            # Deep run: More opportunities to accumulate stats
+            return 1.0 - self.tournament_config['deep_run_penalty'], "deep run penalty"
+        else:
+            # Standard tournament run
+            return 1.0, "no adjustment"
+
+    def get_tournament_adjustment_factor(self, games_played: int) -> float:
+        """Calculate opportunity adjustment based on games played"""
+        return self.tournament_adjustment(games_played)[0]
+
+    def skill_consistency(self, player_stats: Dict) -> Tuple[float, int, int]:
+        """Consistency bonus with the score tier and specialty count behind it"""
+        score_tier = 0
+        if player_stats.get('avg_score', 0) >= self.performance_benchmarks['elite_score_threshold']:
+            score_tier = 3  # Elite
+        elif player_stats.get('avg_score', 0) >= self.performance_benchmarks['good_score_threshold']:
+            score_tier = 2  # Good
+        elif player_stats.get('avg_score', 0) >= self.performance_benchmarks['average_score_threshold']:
+            score_tier = 1  # Average
+        
+        # Check if player excels in multiple specific areas
+        specialties = 0
+        if player_stats.get('saves_per_game', 0) >= self.performance_benchmarks['elite_saves_threshold']:
+            specialties += 1  # Defensive specialist
+        if player_stats.get('goals_per_game', 0) >= self.performance_benchmarks['elite_goals_threshold']:
+            specialties += 1  # Offensive threat
+        if player_stats.get('assists_per_game', 0) >= self.performance_benchmarks['elite_assists_threshold']:
+            specialties += 1  # Playmaker
+        
+        # Multi-skilled players get a small bonus
+        if score_tier >= 2 and specialties >= 2:
+            return 1.05, score_tier, specialties  # 5% bonus for well-rounded elite players
+        elif score_tier >= 1 and specialties >= 1:
+            return 1.02, score_tier, specialties  # 2% bonus for solid specialists
+        else:
+            return 1.0, score_tier, specialties   # No bonus
+
+    def calculate_skill_consistency_bonus(self, player_stats: Dict) -> float:
+        """Bonus for players who excel in multiple areas"""
+        return self.skill_consistency(player_stats)[0]
+    
+    def league_context(self, all_players: List[Dict]) -> LeagueContext:
+        """League averages and sorted adjusted win rates, to share across one refresh"""
+        return LeagueContext.from_players(all_players, self.tournament_config['confidence_games'])
+
+    def calculate_win_rate_with_context(self, player_stats: Dict, all_players: List[Dict],
+                                        context: Optional[LeagueContext] = None,
+                                        explanation: Optional['DQExplanation'] = None) -> float:
+        """Calculate win rate percentile with heavy regression for small samples"""
+        context = context or self.league_context(all_players)
+        player_games = player_stats.get('games_played', 0)
+        player_wins = player_stats.get('wins', 0)
+        
+        # Blend individual win rate with league average, then rank among all adjusted win rates
+        adjusted_win_rate = context.adjusted_win_rate(player_games, player_wins)
+        percentile = context.win_rate_percentile(adjusted_win_rate)
+        
+        if explanation is not None:
+            explanation.win_rate = player_wins / max(player_games, 1)
+            explanation.adjusted_win_rate = adjusted_win_rate
+            explanation.win_rate_confidence = context.confidence(player_games)
+        
+        return percentile
+    
+    def calculate_dominance_quotient(self, player_stats: Dict, all_players: List[Dict],
+                                     context: Optional[LeagueContext] = None,
+                                     explanation: Optional['DQExplanation'] = None) -> float:
+        """
+        Calculate the Data-Driven Dominance Quotient
+        Based on BLCS4 analysis showing individual stats >> team success
+
+        Pass a DQExplanation to have the breakdown recorded into it; with DEBUG
+        logging enabled one is recorded and logged anyway.
+        """
+        if not all_players:
+            return 50.0
+        
+        if explanation is None and logger.isEnabledFor(logging.DEBUG):
+            explanation = DQExplanation(player_stats.get('player_id', 'Unknown'))
+            trace = True
+        else:
+            trace = False
+        
+        # Extract stat values for percentile calculations
+        stat_lists = {}
+        for stat_key in self.ranked_stats:
+            stat_lists[stat_key] = [p.get(stat_key, 0) for p in all_players if p.get(stat_key) is not None]
+        
+        # Calculate percentiles for each stat
+        percentiles = {}
+        for stat_key in self.stat_weights:
+            if stat_key == 'win_rate':
+                # Special handling for win rate
+                percentiles[stat_key] = self.calculate_win_rate_with_context(player_stats, all_players, context,
+                                                                             explanation)
+            elif stat_key in stat_lists and stat_lists[stat_key]:
+                player_value = player_stats.get(stat_key, 0)
+                percentiles[stat_key] = self.calculate_percentile(player_value, stat_lists[stat_key], True)
+            else:
+                percentiles[stat_key] = 50.0  # Default if no data
+        
+        final_dq = self.score_from_percentiles(player_stats, percentiles, explanation)
+        if trace:
+            logger.debug("%s", explanation)
+        return final_dq
+
+    def score_from_percentiles(self, player_stats: Dict, percentiles: Dict[str, float],
+                               explanation: Optional['DQExplanation'] = None) -> float:
+        """Weight a player's stat percentiles into a DQ and apply the tournament and consistency factors"""
+        weighted_contributions = {}
+        for stat_key, weight in self.stat_weights.items():
+            # Calculate weighted contribution
+            weighted_contributions[stat_key] = percentiles.get(stat_key, 50.0) * weight
+        
+        # Sum all weighted contributions
+        base_dominance_quotient = sum(weighted_contributions.values())
+        
+        # Apply tournament opportunity adjustment
+        games_played = player_stats.get('games_played', 0)
+        tournament_factor, adjustment_type = self.tournament_adjustment(games_played)
+        
+        # Apply skill consistency bonus
+        consistency_bonus, score_tier, specialties = self.skill_consistency(player_stats)
+        
+        # Calculate final DQ
+        final_dq = base_dominance_quotient * tournament_factor * consistency_bonus
+        
+        # Clamp to 0-100 range
+        final_dq = max(0, min(100, final_dq))
+        
+        if explanation is not None:
+            for stat_key, weight in self.stat_weights.items():
+                explanation.add_stat(stat_key, player_stats.get(stat_key, 0), percentiles.get(stat_key, 50.0),
+                                     weight, weighted_contributions[stat_key])
+            explanation.games_played = games_played
+            explanation.base_dominance_quotient = base_dominance_quotient
+            explanation.tournament_factor = tournament_factor
+            explanation.adjustment_type = adjustment_type
+            explanation.consistency_bonus = consistency_bonus
+            explanation.score_tier = score_tier
+            explanation.specialties = specialties
+            explanation.dominance_quotient = final_dq
+        
+        return final_dq
+
+    def explain_dominance_quotient(self, player_stats: Dict, all_players: List[Dict],
+                                   context: Optional[LeagueContext] = None) -> 'DQExplanation':
+        """Calculate a player's DQ and return the full breakdown of how it was reached"""
+        explanation = DQExplanation(player_stats.get('player_id', 'Unknown'))
+        explanation.dominance_quotient = self.calculate_dominance_quotient(
+            player_stats, all_players, context, explanation)
+        return explanation
+
+    def calculate_percentiles(self, values: Sequence[float], all_values: Sequence[float],
+                              higher_is_better: bool = True) -> np.ndarray:
+        """calculate_percentile for many values at once: one sort, then a binary search per value"""
+        return percentile_ranks(values, all_values, higher_is_better)
+
+    def percentile_matrix(self, players: List[Dict]) -> np.ndarray:
+        """Every player's percentile for each weighted stat: one row per weights.stat_keys entry"""
+        weights = self.weights
+        games = _stat_array(players, 'games_played')
+        wins = _stat_array(players, 'wins')
+        context = LeagueContext(games, wins, self.tournament_config['confidence_games'])
+
+        percentiles = np.full((len(weights.stat_keys), len(players)), 50.0)
+        for row, stat_key in enumerate(weights.stat_keys):
+            if stat_key == 'win_rate':
+                percentiles[row] = context.win_rate_percentiles(games, wins)
+                continue
+            pool = [p.get(stat_key, 0) for p in players if p.get(stat_key) is not None]
+            if pool:
+                values = [p.get(stat_key, 0) for p in players]
+                percentiles[row] = self.calculate_percentiles(values, pool, True)
+        return percentiles
+
+    def adjustment_factors(self, players: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Every player's tournament factor and skill consistency bonus"""
+        weights = self.weights
+        games = _stat_array(players, 'games_played')
+        tournament_factor = np.select(
+            [games <= weights.early_elimination_threshold, games >= weights.deep_run_threshold],
+            weights.tournament_factors,
+            1.0,
+        )
+
+        stat_keys = ['avg_score'] + [stat_key for stat_key, _ in weights.specialties]
+        return tournament_factor, self.consistency_bonuses({k: _stat_array(players, k) for k in stat_keys})
+
+    def consistency_bonuses(self, stats: Dict[str, np.ndarray]) -> np.ndarray:
+        """skill_consistency bonus for arrays of avg_score and specialty stats (any shape)"""
+        weights = self.weights
+        score_tier = np.select([stats['avg_score'] >= threshold for threshold in weights.score_tiers], [3, 2, 1], 0)
+        specialties = sum((stats[stat_key] >= threshold).astype(int) for stat_key, threshold in weights.specialties)
+        return np.select(
+            [(score_tier >= 2) & (specialties >= 2), (score_tier >= 1) & (specialties >= 1)],
+            [1.05, 1.02],
+            1.0,
+        )
+
+    def calculate_all(self, players: List[Dict]) -> List[float]:
+        """
+        Dominance Quotient of every player against the same pool, in one vectorized pass
+        Gives exactly what calculate_dominance_quotient(player, players) gives for each player
+        """
+        n = len(players)
+        if not n:
+            return []
+
+        percentiles = self.percentile_matrix(players)
+        # sum_columns rather than percentiles.T @ vector: a dot product sums in a
+        # different order, and the per-player sum() would no longer match
+        base_dominance_quotient = sum_columns(percentiles.T * self.weights.vector)
+
+        tournament_factor, consistency_bonus = self.adjustment_factors(players)
+        final_dq = base_dominance_quotient * tournament_factor * consistency_bonus
+        # Same clamp as max(0, min(100, x)), NaN included
+        final_dq = np.where(final_dq < 100, final_dq, 100.0)
+        final_dq = np.where(final_dq > 0, final_dq, 0.0)
+
+        logger.info(f"Calculated DQ for {n} players (mean {final_dq.mean():.1f})")
+        return final_dq.tolist()
+
+    def analyze_player_profile(self, player_stats: Dict, all_players: List[Dict]) -> Dict:
+        """Provide detailed analysis of a player's strengths and weaknesses"""
+        analysis = {
+            'dominance_quotient': self.calculate_dominance_quotient(player_stats, all_players),
+            'player_type': '',
+            'strengths': [],
+            'weaknesses': [],
+            'comparison_to_league': {}
+        }
+        
+        # Determine player type based on stats
+        avg_score = player_stats.get('avg_score', 0)
+        saves_per_game = player_stats.get('saves_per_game', 0)
+        goals_per_game = player_stats.get('goals_per_game', 0)
+        win_rate = player_stats.get('wins', 0) / max(player_stats.get('games_played', 1), 1) * 100
+        
+        # Player type classification
+        if avg_score >= self.performance_benchmarks['elite_score_threshold']:
+            if win_rate >= 55:
+                analysis['player_type'] = "Elite Carry (High skill + winning team)"
+            else:
+                analysis['player_type'] = "Elite Victim (High skill + bad team)"
+        elif avg_score >= self.performance_benchmarks['good_score_threshold']:
+            analysis['player_type'] = "Solid Contributor"
+        elif win_rate >= 55:
+            analysis['player_type'] = "Team Passenger (Carried by good team)"
+        else:
+            analysis['player_type'] = "Developing Player"
+        
+        # Identify strengths
+        if saves_per_game >= self.performance_benchmarks['elite_saves_threshold']:
+            analysis['strengths'].append("Elite Defender")
+        if goals_per_game >= self.performance_benchmarks['elite_goals_threshold']:
+            analysis['strengths'].append("Offensive Threat")
+        if player_stats.get('assists_per_game', 0) >= self.performance_benchmarks['elite_assists_threshold']:
+            analysis['strengths'].append("Playmaker")
+        if avg_score >= self.performance_benchmarks['elite_score_threshold']:
+            analysis['strengths'].append("Overall Impact")
+        
+        return analysis
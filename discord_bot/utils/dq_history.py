@@ -0,0 +1,56 @@
+# File: discord_bot/utils/dq_history.py
+
+import heapq
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stats copied into every snapshot row; enough to explain a move without the full stat line
+SNAPSHOT_STATS = (
+    'games_played',
+    'wins',
+    'avg_score',
+    'goals_per_game',
+    'assists_per_game',
+    'saves_per_game',
+    'dominance_quotient',
+    'percentile_rank',
+)
+
+
+def _delta(current, previous) -> Optional[float]:
+    if current is None or previous is None:
+        return None
+    return current - previous
+
+
+def build_snapshots(players: List[Dict], previous: Dict[str, Dict], taken_at: datetime) -> List[Dict]:
+    """One snapshot row per player, with deltas against that player's previous snapshot
+
+    previous maps player_id to the player's latest stored snapshot; players
+    without one get None deltas, so they never show up as movers.
+    """
+    rows = []
+    for player in players:
+        row = {'player_id': player['player_id'], 'season_id': player.get('season_id'), 'snapshot_at': taken_at}
+        for stat_key in SNAPSHOT_STATS:
+            row[stat_key] = player.get(stat_key)
+        last = previous.get(player['player_id'])
+        if last is None:
+            row['dq_delta'] = row['percentile_delta'] = row['games_delta'] = None
+        else:
+            row['dq_delta'] = _delta(row['dominance_quotient'], last.get('dominance_quotient'))
+            row['percentile_delta'] = _delta(row['percentile_rank'], last.get('percentile_rank'))
+            row['games_delta'] = _delta(row['games_played'], last.get('games_played'))
+        rows.append(row)
+    return rows
+
+
+def biggest_movers(snapshots: List[Dict], limit: int) -> Tuple[List[Dict], List[Dict]]:
+    """Top risers and fallers by DQ delta among snapshots that have one"""
+    moved = [row for row in snapshots if row.get('dq_delta') is not None]
+    risers = [row for row in heapq.nlargest(limit, moved, key=lambda row: row['dq_delta']) if row['dq_delta'] > 0]
+    fallers = [row for row in heapq.nsmallest(limit, moved, key=lambda row: row['dq_delta']) if row['dq_delta'] < 0]
+    return risers, fallers
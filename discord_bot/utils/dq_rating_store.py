@@ -0,0 +1,288 @@
+# File: discord_bot/utils/dq_rating_store.py
+
+import logging
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from .dominance_quotient import DataDrivenDominanceQuotientCalculator, LeagueContext
+
+logger = logging.getLogger(__name__)
+
+
+# Season per-game averages, and the replay stat each one folds in
+REPLAY_AVERAGES = {
+    'avg_score': 'score',
+    'goals_per_game': 'goals',
+    'assists_per_game': 'assists',
+    'saves_per_game': 'saves',
+    'shots_per_game': 'shots',
+    'demos_inflicted_per_game': 'demos_inflicted',
+    'demos_taken_per_game': 'demos_taken',
+}
+
+
+def _is_nan(value) -> bool:
+    return value != value
+
+
+def fold_replay_stats(player_stats: Dict, replay_stats: Dict) -> Dict:
+    """A player's season row with one more game folded into its record and averages
+
+    replay_stats is one player of a replay, as BallchasingService.extract_player_stats
+    returns it. Only the stat columns are carried over; the DQ is left to the store.
+    """
+    games = player_stats.get('games_played') or 0
+    folded = {key: player_stats.get(key) for key in ('player_id', 'season_id', 'avg_speed')}
+    for average, stat in REPLAY_AVERAGES.items():
+        folded[average] = ((player_stats.get(average) or 0) * games + (replay_stats.get(stat) or 0)) / (games + 1)
+    folded['games_played'] = games + 1
+    folded['wins'] = (player_stats.get('wins') or 0) + int(bool(replay_stats.get('won')))
+    folded['losses'] = folded['games_played'] - folded['wins']
+    shots = folded['shots_per_game']
+    folded['shot_percentage'] = folded['goals_per_game'] / shots * 100 if shots else 0
+    return folded
+
+
+class _RankedColumn:
+    """One stat in sorted order: the percentile pool, and every player's own value for lookups"""
+
+    def __init__(self, stat_key: str):
+        self.stat_key = stat_key
+        self.total = 0                  # pool size with NaNs, as calculate_percentile counts them
+        self.pool: List[float] = []     # sorted pool without NaNs
+        self.query_values: List[float] = []  # sorted players' values (missing stat = 0)...
+        self.query_ids: List[str] = []       # ...and whose they are, in the same order
+
+    def _pool_value(self, stats: Optional[Dict]):
+        return None if stats is None else stats.get(self.stat_key)
+
+    def _query_value(self, stats: Optional[Dict]):
+        value = None if stats is None else stats.get(self.stat_key, 0)
+        return None if value is None or _is_nan(value) else value
+
+    def add(self, player_id: str, stats: Dict):
+        value = self._pool_value(stats)
+        if value is not None:
+            self.total += 1
+            if not _is_nan(value):
+                insort(self.pool, value)
+        query = self._query_value(stats)
+        if query is not None:
+            position = bisect_right(self.query_values, query)
+            self.query_values.insert(position, query)
+            self.query_ids.insert(position, player_id)
+
+    def discard(self, player_id: str, stats: Dict):
+        value = self._pool_value(stats)
+        if value is not None:
+            self.total -= 1
+            if not _is_nan(value):
+                del self.pool[bisect_left(self.pool, value)]
+        query = self._query_value(stats)
+        if query is not None:
+            lo = bisect_left(self.query_values, query)
+            position = self.query_ids.index(player_id, lo, bisect_right(self.query_values, query))
+            del self.query_values[position]
+            del self.query_ids[position]
+
+    def replace(self, player_id: str, old: Optional[Dict], new: Optional[Dict]) -> Optional[Set[str]]:
+        """Swap a player's value; returns the players whose percentile may move, or None for everyone"""
+        old_value, new_value = self._pool_value(old), self._pool_value(new)
+        if old is not None:
+            self.discard(player_id, old)
+        if new is not None:
+            self.add(player_id, new)
+
+        if old_value is None and new_value is None:
+            return set()
+        if old_value is None or new_value is None or _is_nan(old_value) or _is_nan(new_value):
+            return None  # the pool grew or shrank: every percentile's denominator changed
+        if old_value == new_value:
+            return set()
+        # Only players strictly above one value and at or below the other gain or lose a "beaten" player
+        lo, hi = sorted((old_value, new_value))
+        return set(self.query_ids[bisect_right(self.query_values, lo):bisect_right(self.query_values, hi)])
+
+    def percentile(self, value) -> float:
+        """Same result as calculate_percentile(value, pool)"""
+        if self.total <= 1 or not self.pool:
+            return 50.0
+        if value is None or _is_nan(value):
+            return 0.0
+        return (bisect_left(self.pool, value) / len(self.pool)) * 100
+
+
+class DQRatingStore:
+    """Every player's DQ, kept current one player update at a time
+
+    Each stat is held in sorted order, so an update re-scores only the players
+    whose percentile it can move, and reports the players whose DQ changed.
+    Results equal a full calculate_all over the same players. The store keeps
+    its own copy of every row, so callers' dicts are never modified.
+    """
+
+    def __init__(self, calculator: Optional[DataDrivenDominanceQuotientCalculator] = None):
+        self.calculator = calculator or DataDrivenDominanceQuotientCalculator()
+        self.players: Dict[str, Dict] = {}
+        self.columns: Dict[str, _RankedColumn] = {}
+        self.dominance_quotients: Dict[str, float] = {}
+        # Win-rate inputs by slot: the league average moves with every game, so these are re-ranked whole
+        self._slots: Dict[str, int] = {}
+        self._slot_ids: List[str] = []
+        self._games = np.zeros(0)
+        self._wins = np.zeros(0)
+        self._win_rate_percentiles = np.zeros(0)
+        self.clear()
+
+    def clear(self):
+        """Empty the store; columns follow the calculator's current weight set"""
+        self.players = {}
+        self.columns = {stat_key: _RankedColumn(stat_key) for stat_key in self.calculator.ranked_stats}
+        self.dominance_quotients = {}
+        self._slots = {}
+        self._slot_ids = []
+        self._games = np.zeros(0)
+        self._wins = np.zeros(0)
+        self._win_rate_percentiles = np.zeros(0)
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self.players
+
+    def load(self, players: List[Dict]) -> List[float]:
+        """Replace the store's contents with a full league; returns the DQs in input order"""
+        self.clear()
+        for player_stats in players:
+            self.players[player_stats['player_id']] = dict(player_stats)
+        for player_id, player_stats in self.players.items():
+            for column in self.columns.values():
+                column.add(player_id, player_stats)
+        self._slot_ids = list(self.players)
+        self._slots = {player_id: slot for slot, player_id in enumerate(self._slot_ids)}
+        self._games = np.array([p.get('games_played', 0) for p in self.players.values()], dtype=float)
+        self._wins = np.array([p.get('wins', 0) for p in self.players.values()], dtype=float)
+        self._win_rate_percentiles = np.full(len(self._slot_ids), np.nan)
+        self._refresh_win_rates()
+
+        league = list(self.players.values())
+        dominance_quotients = self.calculator.calculate_all(league)
+        self.dominance_quotients = {p['player_id']: dq for p, dq in zip(league, dominance_quotients)}
+        return [self.dominance_quotients[p['player_id']] for p in players]
+
+    def percentile_ranks(self) -> Dict[str, float]:
+        """Every player's DQ percentile within the league"""
+        player_ids = list(self.dominance_quotients)
+        dominance_quotients = [self.dominance_quotients[player_id] for player_id in player_ids]
+        ranks = self.calculator.calculate_percentiles(dominance_quotients, dominance_quotients).tolist()
+        return dict(zip(player_ids, ranks))
+
+    def load_rows(self, players: List[Dict]) -> List[Dict]:
+        """Load a full league; returns copies of its rows with dominance_quotient and percentile_rank set"""
+        self.load(players)
+        percentile_ranks = self.percentile_ranks()
+        for player_id, player_stats in self.players.items():
+            player_stats['dominance_quotient'] = self.dominance_quotients[player_id]
+            player_stats['percentile_rank'] = percentile_ranks[player_id]
+        return [dict(self.players[p['player_id']]) for p in players]
+
+    def apply_update(self, player_stats: Dict) -> List[Dict]:
+        """Add or replace one player's stats; returns the rows to store for it
+
+        That is the player's full row, plus a partial (player_id, dominance_quotient,
+        percentile_rank) row for every other player whose rating moved. Together they
+        bring stored rows to what load_rows would give for the whole league.
+        """
+        player_id = player_stats['player_id']
+        self.update(player_stats)
+        rows = []
+        for other_id, percentile_rank in self.percentile_ranks().items():
+            stats = self.players[other_id]
+            dominance_quotient = self.dominance_quotients[other_id]
+            if (other_id != player_id and stats.get('dominance_quotient') == dominance_quotient
+                    and stats.get('percentile_rank') == percentile_rank):
+                continue
+            stats['dominance_quotient'] = dominance_quotient
+            stats['percentile_rank'] = percentile_rank
+            if other_id == player_id:
+                rows.append(dict(stats))
+            else:
+                rows.append({'player_id': other_id, 'dominance_quotient': dominance_quotient,
+                             'percentile_rank': percentile_rank})
+        return rows
+
+    def update(self, player_stats: Dict) -> Set[str]:
+        """Add or replace one player's stats; returns the IDs whose DQ changed (new players included)"""
+        player_id = player_stats['player_id']
+        old = self.players.get(player_id)
+        self.players[player_id] = player_stats = dict(player_stats)
+
+        slot = self._slots.get(player_id)
+        if slot is None:
+            slot = self._slots[player_id] = len(self._slot_ids)
+            self._slot_ids.append(player_id)
+            self._games = np.append(self._games, 0.0)
+            self._wins = np.append(self._wins, 0.0)
+            self._win_rate_percentiles = np.append(self._win_rate_percentiles, np.nan)
+        self._games[slot] = player_stats.get('games_played', 0)
+        self._wins[slot] = player_stats.get('wins', 0)
+        return self._apply(player_id, old, player_stats)
+
+    def remove(self, player_id: str) -> Set[str]:
+        """Drop a player; returns the IDs of remaining players whose DQ changed"""
+        old = self.players.pop(player_id, None)
+        if old is None:
+            return set()
+        self.dominance_quotients.pop(player_id, None)
+
+        # Move the last slot into the freed one
+        slot, last = self._slots.pop(player_id), len(self._slot_ids) - 1
+        moved_id = self._slot_ids.pop()
+        if slot != last:
+            self._slot_ids[slot] = moved_id
+            self._slots[moved_id] = slot
+            for array in (self._games, self._wins, self._win_rate_percentiles):
+                array[slot] = array[last]
+        self._games, self._wins = self._games[:last], self._wins[:last]
+        self._win_rate_percentiles = self._win_rate_percentiles[:last]
+        return self._apply(player_id, old, None) - {player_id}
+
+    def _apply(self, player_id: str, old: Optional[Dict], new: Optional[Dict]) -> Set[str]:
+        candidates = {player_id} if new is not None else set()
+        everyone = False
+        for column in self.columns.values():
+            affected = column.replace(player_id, old, new)
+            if affected is None:
+                everyone = True
+            else:
+                candidates |= affected
+        candidates |= self._refresh_win_rates()
+        if everyone:
+            candidates = set(self.players)
+        return self._rescore(candidates)
+
+    def _refresh_win_rates(self) -> Set[str]:
+        """Re-rank every win rate (the league average moves with any game); returns the players whose rank moved"""
+        context = LeagueContext(self._games, self._wins, self.calculator.tournament_config['confidence_games'])
+        percentiles = context.win_rate_percentiles(self._games, self._wins)
+        moved = np.flatnonzero(percentiles != self._win_rate_percentiles)
+        self._win_rate_percentiles = percentiles
+        return {self._slot_ids[slot] for slot in moved.tolist()}
+
+    def _rescore(self, candidates: Set[str]) -> Set[str]:
+        changed = set()
+        for player_id in candidates:
+            player_stats = self.players.get(player_id)
+            if player_stats is None:
+                continue
+            percentiles = {stat_key: column.percentile(player_stats.get(stat_key, 0))
+                           for stat_key, column in self.columns.items()}
+            percentiles['win_rate'] = float(self._win_rate_percentiles[self._slots[player_id]])
+            dominance_quotient = self.calculator.score_from_percentiles(player_stats, percentiles)
+            if self.dominance_quotients.get(player_id) != dominance_quotient:
+                self.dominance_quotients[player_id] = dominance_quotient
+                changed.add(player_id)
+        return changed
@@ -0,0 +1,168 @@
+# File: discord_bot/utils/dq_uncertainty.py
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .dominance_quotient import DataDrivenDominanceQuotientCalculator
+from .rating_kernel import as_float_array
+
+logger = logging.getLogger(__name__)
+
+# Per-game counts, resampled as Poisson draws over the player's games
+COUNT_STATS = ('goals_per_game', 'assists_per_game', 'saves_per_game', 'shots_per_game')
+# Spread of one game's score relative to the player's average; group stats only keep the average
+SCORE_CV = 0.35
+DEFAULT_RESAMPLES = 1000
+DEFAULT_LEVEL = 0.90
+CHUNK_CELLS = 2_000_000  # resamples x players held in memory at once
+
+
+def _stat_array(players: List[Dict], stat_key: str) -> np.ndarray:
+    return as_float_array([p.get(stat_key, 0) for p in players])
+
+
+def count_below(values: np.ndarray, pool: np.ndarray) -> np.ndarray:
+    """For each row, how many of that row's pool entries are strictly below each value
+
+    Both are (rows x players); NaN pool entries never count. One sort of the
+    row-wise concatenation replaces a binary search per row.
+    """
+    width = values.shape[1]
+    combined = np.concatenate([values, np.where(np.isnan(pool), np.inf, pool)], axis=1)
+    is_pool = np.concatenate([np.zeros(values.shape, dtype=np.int64), np.ones(pool.shape, dtype=np.int64)], axis=1)
+    # A stable sort keeps each query ahead of pool entries equal to it: only strictly lower ones precede
+    order = np.argsort(combined, axis=1, kind='stable')
+    pool_before = np.cumsum(np.take_along_axis(is_pool, order, axis=1), axis=1)
+    counts = np.empty(combined.shape, dtype=np.int64)
+    np.put_along_axis(counts, order, pool_before, axis=1)
+    return counts[:, :width]
+
+
+def batch_percentiles(values: np.ndarray, in_pool: np.ndarray) -> np.ndarray:
+    """calculate_percentile for every player of every resampled league (rows)
+
+    in_pool marks the players whose stat is recorded (not None); NaN values are
+    in the pool count but beat nobody and are beaten by nobody, as in calculate_percentile.
+    """
+    pool = np.where(in_pool, values, np.nan)
+    pool_size = (~np.isnan(pool)).sum(axis=1, keepdims=True)
+    if in_pool.sum() <= 1:
+        return np.full(values.shape, 50.0)
+    percentiles = count_below(values, pool) / np.maximum(pool_size, 1) * 100
+    percentiles = np.where(np.isnan(values), 0.0, percentiles)
+    return np.where(pool_size == 0, 50.0, percentiles)
+
+
+class DQIntervals:
+    """Bootstrap DQ intervals for one data generation"""
+
+    def __init__(self, bounds: Dict[str, Tuple[float, float]], level: float, resamples: int,
+                 generation: Optional[int] = None):
+        self.bounds = bounds
+        self.level = level
+        self.resamples = resamples
+        self.generation = generation
+
+    def get(self, player_id: str) -> Optional[Tuple[float, float]]:
+        return self.bounds.get(player_id)
+
+    def describe(self, player_id: str) -> str:
+        """e.g. "90% CI 61.2-74.8", or "" for a player without an interval"""
+        bounds = self.get(player_id)
+        if bounds is None:
+            return ""
+        return f"{self.level * 100:.0f}% CI {bounds[0]:.1f}-{bounds[1]:.1f}"
+
+
+class DQBootstrap:
+    """DQ uncertainty from resampling each player's games, every resample at once
+
+    Per-game values aren't stored, so each player's games are redrawn from their
+    averages: counting stats as Poisson, score as Gamma with SCORE_CV spread,
+    wins as Binomial. The whole league is resampled together and re-rated with
+    the calculator's weights, so a player's interval reflects both their own
+    sample size and the uncertainty of everyone they're ranked against.
+    """
+
+    def __init__(self, calculator: Optional[DataDrivenDominanceQuotientCalculator] = None,
+                 resamples: int = DEFAULT_RESAMPLES, level: float = DEFAULT_LEVEL, seed: int = 0):
+        self.calculator = calculator or DataDrivenDominanceQuotientCalculator()
+        self.resamples = resamples
+        self.level = level
+        self.seed = seed
+
+    def resample(self, players: List[Dict], size: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """(size x players) draws of each resampled stat; other stats are tiled unchanged"""
+        games = _stat_array(players, 'games_played')
+        played = games > 0
+        per_game = np.where(played, games, 1)
+        samples = {}
+
+        for stat_key in COUNT_STATS:
+            mean = _stat_array(players, stat_key)
+            ok = played & (mean >= 0)  # False for NaN too
+            draws = rng.poisson(np.where(ok, mean * games, 0), size=(size, len(players))) / per_game
+            samples[stat_key] = np.where(ok, draws, mean)
+
+        avg_score = _stat_array(players, 'avg_score')
+        ok = played & (avg_score > 0)
+        # The mean of n per-game Gamma(1/cv^2, mean*cv^2) scores
+        shape = np.where(ok, games / SCORE_CV ** 2, 1)
+        scale = np.where(ok, avg_score * SCORE_CV ** 2 / per_game, 1)
+        samples['avg_score'] = np.where(ok, rng.gamma(shape, scale, size=(size, len(players))), avg_score)
+
+        wins = _stat_array(players, 'wins')
+        win_rate = np.clip(np.nan_to_num(wins / per_game), 0, 1)
+        samples['wins'] = np.where(played, rng.binomial(games.astype(np.int64), win_rate, size=(size, len(players))),
+                                   wins)
+        return samples
+
+    def dominance_quotients(self, players: List[Dict], samples: Dict[str, np.ndarray]) -> np.ndarray:
+        """DQ of every player in every resampled league: (resamples x players)"""
+        calculator = self.calculator
+        weights = calculator.weights
+        size = next(iter(samples.values())).shape[0] if samples else 1
+
+        def stat(stat_key):
+            if stat_key in samples:
+                return samples[stat_key]
+            return np.broadcast_to(_stat_array(players, stat_key), (size, len(players)))
+
+        games = _stat_array(players, 'games_played')
+        wins = stat('wins')
+        confidence = np.minimum(games / calculator.tournament_config['confidence_games'], 1.0)
+        league_avg_win_rate = wins.sum(axis=1, keepdims=True) / max(float(games.sum()), 1)
+        adjusted = confidence * (wins / np.maximum(games, 1)) + (1 - confidence) * league_avg_win_rate
+
+        base = np.zeros((size, len(players)))
+        for stat_key, weight in zip(weights.stat_keys, weights.vector):
+            if stat_key == 'win_rate':
+                percentiles = batch_percentiles(adjusted, np.ones(len(players), dtype=bool))
+            else:
+                in_pool = np.array([p.get(stat_key) is not None for p in players])
+                percentiles = batch_percentiles(stat(stat_key), in_pool) if in_pool.any() else 50.0
+            base = base + percentiles * weight
+
+        tournament_factor, _ = calculator.adjustment_factors(players)
+        bonus_stats = {stat_key: stat(stat_key) for stat_key in ['avg_score'] + [k for k, _ in weights.specialties]}
+        final = base * tournament_factor * calculator.consistency_bonuses(bonus_stats)
+        return np.clip(final, 0, 100)
+
+    def intervals(self, players: List[Dict], generation: Optional[int] = None) -> DQIntervals:
+        """Central level intervals of every player's DQ over the resamples"""
+        if not players:
+            return DQIntervals({}, self.level, self.resamples, generation)
+
+        rng = np.random.default_rng(self.seed)
+        chunk = max(1, CHUNK_CELLS // len(players))
+        dominance_quotients = np.vstack([
+            self.dominance_quotients(players, self.resample(players, min(chunk, self.resamples - start), rng))
+            for start in range(0, self.resamples, chunk)
+        ])
+        tail = (1 - self.level) / 2
+        low, high = np.quantile(dominance_quotients, [tail, 1 - tail], axis=0)
+        bounds = {p['player_id']: (float(lo), float(hi)) for p, lo, hi in zip(players, low, high)}
+        logger.info(f"Bootstrapped DQ intervals for {len(players)} players ({self.resamples} resamples)")
+        return DQIntervals(bounds, self.level, self.resamples, generation)
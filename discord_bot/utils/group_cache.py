@@ -0,0 +1,275 @@
+# File: discord_bot/utils/group_cache.py
+
+import json
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, FrozenSet, Iterable, Iterator, Optional, Sequence, Tuple
+
+import requests
+
+from utils.group_stream import CHUNK_SIZE, GROUP_FIELDS, GroupColumns, GroupStreamParser, parse_group_stream
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://ballchasing.com/api"
+
+
+class GroupCache:
+    """On-disk cache of ballchasing /groups/{id} payloads and their HTTP validators"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir or os.getenv('BALLCHASING_CACHE_DIR', 'data/cache/ballchasing'))
+        # Parsed payloads already seen by this process, so a 304 costs no JSON parsing
+        self._parsed: Dict[str, Dict[str, Any]] = {}
+        # Stream-parsed columns of cached bodies, per (group_id, selected fields); shared, so read-only
+        self._columns: Dict[Tuple[str, FrozenSet], GroupColumns] = {}
+        self._lock = threading.Lock()
+
+    def _body_path(self, group_id: str) -> Path:
+        return self.cache_dir / f"{group_id}.json"
+
+    def _meta_path(self, group_id: str) -> Path:
+        return self.cache_dir / f"{group_id}.meta.json"
+
+    @staticmethod
+    def _columns_key(group_id: str, fields: Dict[str, Sequence[str]]) -> Tuple[str, FrozenSet]:
+        return group_id, frozenset((array, tuple(paths)) for array, paths in fields.items())
+
+    def _forget(self, group_id: str):
+        """Drop every parsed copy of a group's body, once a new body replaces it"""
+        with self._lock:
+            self._parsed.pop(group_id, None)
+            for key in [key for key in self._columns if key[0] == group_id]:
+                del self._columns[key]
+
+    def _load_meta(self, group_id: str) -> Dict[str, str]:
+        try:
+            with open(self._meta_path(group_id), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def conditional_headers(self, group_id: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a cached group, if any"""
+        if not self._body_path(group_id).exists():
+            return {}
+
+        meta = self._load_meta(group_id)
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def load(self, group_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a group, or None if nothing is cached"""
+        with self._lock:
+            if group_id in self._parsed:
+                return self._parsed[group_id]
+
+        try:
+            with open(self._body_path(group_id), 'rb') as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cached payload for group {group_id} unreadable: {e}")
+            return None
+
+        with self._lock:
+            self._parsed[group_id] = data
+        return data
+
+    def store(self, group_id: str, body: bytes, headers) -> Dict[str, Any]:
+        """Persist a fresh 200 response and return its parsed payload"""
+        data = json.loads(body)
+        meta = {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+        }
+
+        # Only responses carrying validators can ever be revalidated
+        if meta['etag'] or meta['last_modified']:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                self._write_atomic(self._body_path(group_id), body)
+                self._write_atomic(self._meta_path(group_id), json.dumps(meta).encode())
+            except OSError as e:
+                logger.warning(f"Could not write cache for group {group_id}: {e}")
+
+        self._forget(group_id)
+        with self._lock:
+            self._parsed[group_id] = data
+        return data
+
+    def iter_body(self, group_id: str, chunk_size: int = CHUNK_SIZE) -> Optional[Iterator[bytes]]:
+        """Stream the cached body in chunks, or None if nothing is cached"""
+        try:
+            f = open(self._body_path(group_id), 'rb')
+        except OSError:
+            return None
+
+        def chunks():
+            with f:
+                while chunk := f.read(chunk_size):
+                    yield chunk
+        return chunks()
+
+    def load_columns(self, group_id: str,
+                     fields: Dict[str, Sequence[str]] = GROUP_FIELDS) -> Optional[GroupColumns]:
+        """Stream-parse selected field paths from the cached body, or None if nothing is cached
+
+        Parsed once per body and set of fields; later calls (every 304) reuse that parse.
+        """
+        key = self._columns_key(group_id, fields)
+        with self._lock:
+            if key in self._columns:
+                return self._columns[key]
+
+        chunks = self.iter_body(group_id)
+        if chunks is None:
+            return None
+        try:
+            columns = parse_group_stream(chunks, fields)
+        except ValueError as e:
+            logger.warning(f"Cached payload for group {group_id} unreadable: {e}")
+            return None
+
+        self.remember_columns(group_id, fields, columns)
+        return columns
+
+    def remember_columns(self, group_id: str, fields: Dict[str, Sequence[str]], columns: GroupColumns):
+        """Keep columns parsed from the cached body, so a 304 can return them without reading it"""
+        with self._lock:
+            self._columns[self._columns_key(group_id, fields)] = columns
+
+    def begin_store(self, group_id: str, headers) -> Optional['PendingBody']:
+        """Start writing a fresh 200 body chunk by chunk; None if it can't be revalidated later"""
+        meta = {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+        }
+        if not (meta['etag'] or meta['last_modified']):
+            return None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            return PendingBody(self, group_id, meta)
+        except OSError as e:
+            logger.warning(f"Could not write cache for group {group_id}: {e}")
+            return None
+
+    def _write_atomic(self, path: Path, content: bytes):
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+class PendingBody:
+    """A group body being written to the cache; replaces the cached copy only on commit"""
+
+    def __init__(self, cache: GroupCache, group_id: str, meta: Dict[str, Optional[str]]):
+        self.cache = cache
+        self.group_id = group_id
+        self.meta = meta
+        self._path = cache._body_path(group_id)
+        self._tmp_path = self._path.with_suffix(self._path.suffix + '.tmp')
+        self._file = open(self._tmp_path, 'wb')
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+
+    def commit(self):
+        try:
+            self._file.close()
+            os.replace(self._tmp_path, self._path)
+            self.cache._write_atomic(self.cache._meta_path(self.group_id), json.dumps(self.meta).encode())
+        except OSError as e:
+            logger.warning(f"Could not write cache for group {self.group_id}: {e}")
+        # Any parsed copy held in memory is now stale
+        self.cache._forget(self.group_id)
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+
+# Global cache instance
+group_cache = None
+
+def get_group_cache() -> GroupCache:
+    """Get the process-wide group cache"""
+    global group_cache
+    if group_cache is None:
+        group_cache = GroupCache()
+    return group_cache
+
+
+def fetch_group_payload(group_id: str, token: str, base_url: Optional[str] = None,
+                        cache: Optional[GroupCache] = None) -> Dict[str, Any]:
+    """Fetch a /groups/{id} payload, revalidating against the on-disk cache"""
+    cache = cache or get_group_cache()
+    base_url = base_url or os.getenv('BALLCHASING_BASE_URL', BASE_URL)
+    url = f"{base_url}/groups/{group_id}"
+    headers = {"Authorization": token}
+
+    response = requests.get(url, headers={**headers, **cache.conditional_headers(group_id)})
+    if response.status_code == 304:
+        cached = cache.load(group_id)
+        if cached is not None:
+            logger.info(f"Group {group_id} not modified, using cached payload")
+            return cached
+        # Validators survived but the body did not; fetch it unconditionally
+        response = requests.get(url, headers=headers)
+
+    response.raise_for_status()
+    return cache.store(group_id, response.content, response.headers)
+
+
+def _parse_and_store(cache: GroupCache, group_id: str, chunks: Iterable[bytes], headers,
+                     fields: Dict[str, Sequence[str]]) -> GroupColumns:
+    """Parse a streamed 200 body while writing it to the cache; keep it only if it parsed"""
+    pending = cache.begin_store(group_id, headers)
+    parser = GroupStreamParser(fields)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            if pending is not None:
+                pending.write(chunk)
+        columns = parser.close()
+    except BaseException:
+        if pending is not None:
+            pending.abort()
+        raise
+    if pending is not None:
+        pending.commit()
+        cache.remember_columns(group_id, fields, columns)
+    return columns
+
+
+def fetch_group_columns(group_id: str, token: str, fields: Dict[str, Sequence[str]] = GROUP_FIELDS,
+                        base_url: Optional[str] = None, cache: Optional[GroupCache] = None) -> GroupColumns:
+    """Like fetch_group_payload, but stream-parse only the given field paths"""
+    cache = cache or get_group_cache()
+    base_url = base_url or os.getenv('BALLCHASING_BASE_URL', BASE_URL)
+    url = f"{base_url}/groups/{group_id}"
+    headers = {"Authorization": token}
+
+    with requests.get(url, headers={**headers, **cache.conditional_headers(group_id)}, stream=True) as response:
+        if response.status_code == 304:
+            columns = cache.load_columns(group_id, fields)
+            if columns is not None:
+                logger.info(f"Group {group_id} not modified, using cached payload")
+                return columns
+        else:
+            response.raise_for_status()
+            return _parse_and_store(cache, group_id, response.iter_content(CHUNK_SIZE), response.headers, fields)
+
+    # Validators survived but the body did not; fetch it unconditionally
+    with requests.get(url, headers=headers, stream=True) as response:
+        response.raise_for_status()
+        return _parse_and_store(cache, group_id, response.iter_content(CHUNK_SIZE), response.headers, fields)
@@ -0,0 +1,263 @@
+# File: discord_bot/utils/group_crawler.py
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.ballchasing_api import BallchasingClient, BallchasingAPIError, get_ballchasing_client
+
+logger = logging.getLogger(__name__)
+
+PATH_SEPARATOR = ' / '
+
+
+class GroupNode:
+    """One ballchasing group found while crawling, with its position in the tree"""
+
+    def __init__(self, group_id: str, name: str, parent_id: Optional[str] = None):
+        self.id = group_id
+        self.name = name
+        # A group can be reached from several parents (or be a root and a subgroup)
+        self.parent_ids: List[str] = [parent_id] if parent_id else []
+        self.path: Tuple[str, ...] = (name,)
+        self.replay_ids: List[str] = []
+
+    @property
+    def parent_id(self) -> Optional[str]:
+        return self.parent_ids[0] if self.parent_ids else None
+
+    @property
+    def path_str(self) -> str:
+        return PATH_SEPARATOR.join(self.path)
+
+
+class CrawlResult:
+    """Every group and unique replay under a set of root groups"""
+
+    def __init__(self, root_ids: Sequence[str] = ()):
+        self.root_ids: List[str] = list(root_ids)
+        self.groups: Dict[str, GroupNode] = {}
+        self.replays: Dict[str, dict] = {}          # replay ID -> list summary
+        self.replay_groups: Dict[str, List[str]] = {}  # replay ID -> every group it appeared in
+        self.player_rows: List[dict] = []
+        self.failed_replays: List[str] = []
+
+    def add_replay(self, group: GroupNode, summary: dict) -> bool:
+        """Record a replay seen in a group; True the first time the replay is seen anywhere"""
+        replay_id = summary.get('id')
+        if not replay_id:
+            return False
+        group.replay_ids.append(replay_id)
+        first_seen = replay_id not in self.replays
+        if first_seen:
+            self.replays[replay_id] = summary
+        self.replay_groups.setdefault(replay_id, []).append(group.id)
+        return first_seen
+
+    def resolve_paths(self):
+        """Give every group its longest path from a root, so overlapping roots nest the same way every run
+
+        Links back up the tree would make paths endless, so a depth-first walk from the
+        roots drops every link to a group still being walked before paths are measured.
+        """
+        children: Dict[str, List[str]] = {group_id: [] for group_id in self.groups}
+        for group_id, node in self.groups.items():
+            for parent_id in node.parent_ids:
+                if parent_id in children:
+                    children[parent_id].append(group_id)
+
+        parents: Dict[str, List[str]] = {group_id: [] for group_id in self.groups}
+        walking, walked = set(), set()
+
+        def walk(group_id: str):
+            walking.add(group_id)
+            for child_id in sorted(children[group_id]):
+                if child_id in walking:
+                    continue
+                parents[child_id].append(group_id)
+                if child_id not in walked:
+                    walk(child_id)
+            walking.discard(group_id)
+            walked.add(group_id)
+
+        # Parentless groups first, then the crawl's roots, then whatever only hangs off a cycle
+        tops = [group_id for group_id, node in self.groups.items()
+                if not any(parent_id in self.groups for parent_id in node.parent_ids)]
+        for group_id in sorted(tops) + [r for r in self.root_ids if r in self.groups] + sorted(self.groups):
+            if group_id not in walked:
+                walk(group_id)
+
+        resolved: Dict[str, Tuple[str, ...]] = {}
+
+        def resolve(group_id: str) -> Tuple[str, ...]:
+            if group_id not in resolved:
+                best = max((resolve(parent_id) for parent_id in parents[group_id]),
+                           key=lambda path: (len(path), path), default=())
+                resolved[group_id] = best + (self.groups[group_id].name,)
+            return resolved[group_id]
+
+        for group_id, node in self.groups.items():
+            node.path = resolve(group_id)
+
+    def home_group(self, replay_id: str) -> GroupNode:
+        """The group a replay is attributed to: the deepest, then alphabetically first, path"""
+        nodes = [self.groups[group_id] for group_id in self.replay_groups[replay_id]]
+        return min(nodes, key=lambda node: (-len(node.path), node.path))
+
+    def group_frame(self):
+        import pandas as pd
+        return pd.DataFrame([{
+            'group_id': node.id,
+            'group_name': node.name,
+            'group_path': node.path_str,
+            'parent_id': node.parent_id,
+            'depth': len(node.path) - 1,
+            'direct_replays': len(node.replay_ids),
+        } for node in self.groups.values()])
+
+    def replay_frame(self):
+        import pandas as pd
+        rows = []
+        for replay_id, summary in self.replays.items():
+            home = self.home_group(replay_id)
+            rows.append({
+                'replay_id': replay_id,
+                'group_id': home.id,
+                'group_path': home.path_str,
+                'all_group_paths': ';'.join(sorted(self.groups[g].path_str for g in self.replay_groups[replay_id])),
+                'created': summary.get('created'),
+                'date': summary.get('date'),
+                'map_code': summary.get('map_code'),
+                'duration': summary.get('duration'),
+            })
+        return pd.DataFrame(rows)
+
+    def player_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.player_rows)
+
+
+def replay_player_rows(replay_id: str, details: dict, group: GroupNode) -> List[dict]:
+    """Flatten one replay's per-player stats into rows tagged with the replay's group"""
+    rows = []
+    for color, opponent in (('blue', 'orange'), ('orange', 'blue')):
+        team = details.get(color, {})
+        goals_for = team.get('stats', {}).get('core', {}).get('goals', team.get('goals', 0))
+        goals_against = details.get(opponent, {}).get('stats', {}).get('core', {}).get(
+            'goals', details.get(opponent, {}).get('goals', 0))
+
+        for player in team.get('players', []):
+            player_id = player.get('id', {})
+            stats = player.get('stats', {})
+            core = stats.get('core', {})
+            demo = stats.get('demo', {})
+            rows.append({
+                'group_id': group.id,
+                'group_path': group.path_str,
+                'replay_id': replay_id,
+                'created': details.get('created'),
+                'date': details.get('date'),
+                'map_name': details.get('map_name'),
+                'duration': details.get('duration'),
+                'color': color,
+                'team_name': team.get('name'),
+                'goals_for': goals_for,
+                'goals_against': goals_against,
+                'won': goals_for > goals_against,
+                'player_name': player.get('name'),
+                'platform': player_id.get('platform'),
+                'platform_id': player_id.get('id'),
+                'goals': core.get('goals', 0),
+                'assists': core.get('assists', 0),
+                'saves': core.get('saves', 0),
+                'shots': core.get('shots', 0),
+                'score': core.get('score', 0),
+                'demos_inflicted': demo.get('inflicted', 0),
+                'demos_taken': demo.get('taken', 0),
+                'avg_speed': stats.get('movement', {}).get('avg_speed'),
+            })
+    return rows
+
+
+class GroupCrawler:
+    """Walk ballchasing group trees concurrently and gather each unique replay once"""
+
+    def __init__(self, client: Optional[BallchasingClient] = None, api_key: Optional[str] = None,
+                 max_concurrency: int = 8, fetch_details: bool = True):
+        self.client = client or get_ballchasing_client()
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.fetch_details = fetch_details
+
+    async def crawl(self, root_ids: Sequence[str]) -> CrawlResult:
+        """Crawl every root group (and all of their subgroups) into one result"""
+        root_ids = list(dict.fromkeys(root_ids))
+        result = CrawlResult(root_ids)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        roots = await asyncio.gather(*(self._root(root_id, semaphore) for root_id in root_ids))
+        await asyncio.gather(*(self._walk(root, result, semaphore) for root in roots))
+        result.resolve_paths()
+        logger.info(f"Crawled {len(result.groups)} groups, {len(result.replays)} unique replays")
+
+        if self.fetch_details:
+            await self.fetch_replay_rows(result)
+        return result
+
+    async def _root(self, root_id: str, semaphore: asyncio.Semaphore) -> GroupNode:
+        async with semaphore:
+            # Only the group's name is needed; the stats arrays are skipped unparsed
+            columns = await self.client.get_group_columns(root_id, {}, api_key=self.api_key)
+        return GroupNode(root_id, columns.meta.get('name') or root_id)
+
+    async def _list(self, endpoint: str, params: Dict, semaphore: asyncio.Semaphore) -> List[dict]:
+        items = []
+        async with semaphore:
+            async for page in self.client.iter_pages(endpoint, params=params, api_key=self.api_key):
+                items.extend(page)
+        return items
+
+    async def _walk(self, node: GroupNode, result: CrawlResult, semaphore: asyncio.Semaphore):
+        # A group reachable from two roots (or linked twice) is only walked once
+        existing = result.groups.get(node.id)
+        if existing is not None:
+            existing.parent_ids.extend(p for p in node.parent_ids if p not in existing.parent_ids)
+            return
+        result.groups[node.id] = node
+
+        subgroups, replays = await asyncio.gather(
+            self._list('groups', {'group': node.id, 'count': 200}, semaphore),
+            self._list('replays', {'group': node.id, 'count': 200}, semaphore),
+        )
+        new_replays = sum(result.add_replay(node, summary) for summary in replays)
+        logger.info(f"{node.name} ({node.id}): {len(subgroups)} subgroups, {len(replays)} replays ({new_replays} new)")
+
+        children = [GroupNode(child['id'], child.get('name') or child['id'], node.id)
+                    for child in subgroups if child.get('id')]
+        await asyncio.gather(*(self._walk(child, result, semaphore) for child in children))
+
+    async def fetch_replay_rows(self, result: CrawlResult, replay_ids: Optional[Sequence[str]] = None):
+        """Fetch details for crawled replays (all of them by default) into result.player_rows"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        replay_ids = list(result.replays if replay_ids is None else replay_ids)
+
+        async def fetch(replay_id):
+            async with semaphore:
+                try:
+                    return replay_id, await self.client.get_json(f"replays/{replay_id}", api_key=self.api_key)
+                except (BallchasingAPIError, asyncio.TimeoutError) as e:
+                    logger.error(f"Error fetching replay {replay_id}: {e}")
+                    return replay_id, None
+
+        tasks = [asyncio.create_task(fetch(replay_id)) for replay_id in replay_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                replay_id, details = await next_done
+                if details is None:
+                    result.failed_replays.append(replay_id)
+                    continue
+                # Reduce to rows straight away; full replay documents are never kept
+                result.player_rows.extend(replay_player_rows(replay_id, details, result.home_group(replay_id)))
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,259 @@
+# File: discord_bot/utils/group_stream.py
+
+import codecs
+import json
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Field paths the player and team tables are built from (process.py, playoff_stats.py)
+PLAYER_FIELDS = (
+    "name",
+    "team",
+    "cumulative.games",
+    "game_average.core.score",
+    "game_average.core.goals",
+    "game_average.core.assists",
+    "game_average.core.saves",
+    "game_average.core.shots",
+    "game_average.core.shooting_percentage",
+    "game_average.demo.inflicted",
+    "game_average.demo.taken",
+    "game_average.boost.amount_stolen_big",
+    "game_average.boost.amount_stolen_small",
+)
+
+TEAM_FIELDS = (
+    "name",
+    "cumulative.games",
+    "cumulative.wins",
+    "cumulative.win_percentage",
+    "cumulative.core.goals",
+    "cumulative.core.goals_against",
+    "cumulative.core.shots",
+    "cumulative.core.shots_against",
+    "cumulative.demo.inflicted",
+    "cumulative.demo.taken",
+    "game_average.core.goals",
+    "game_average.core.goals_against",
+    "game_average.core.shots",
+    "game_average.core.shots_against",
+    "game_average.demo.inflicted",
+    "game_average.demo.taken",
+)
+
+GROUP_FIELDS = {"players": PLAYER_FIELDS, "teams": TEAM_FIELDS}
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# A complete string, a bracket, or the opening quote of a string cut off by the chunk boundary
+_SKIP_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]|"')
+
+
+class GroupColumns:
+    """Selected field paths of a group's arrays, one list per path"""
+
+    def __init__(self, fields: Dict[str, Sequence[str]], columns: Dict[str, Dict[str, List[Any]]],
+                 meta: Dict[str, Any]):
+        self.fields = fields
+        self.columns = columns
+        self.meta = meta  # top-level scalars (id, name, status, ...)
+
+    def __len__(self):
+        return sum(self.count(array) for array in self.columns)
+
+    def count(self, array: str) -> int:
+        columns = self.columns.get(array, {})
+        return len(next(iter(columns.values()), []))
+
+    def frame(self, array: str):
+        """DataFrame with dotted column names, like pd.json_normalize"""
+        import pandas as pd
+        return pd.DataFrame(self.columns[array], columns=list(self.fields[array]))
+
+    def records(self, array: str) -> List[Dict[str, Any]]:
+        """Rows rebuilt as nested dicts holding only the selected paths"""
+        paths = [(path, path.split('.')) for path in self.fields[array]]
+        records = []
+        for i in range(self.count(array)):
+            record = {}
+            for path, keys in paths:
+                value = self.columns[array][path][i]
+                if value is None:
+                    continue
+                node = record
+                for key in keys[:-1]:
+                    node = node.setdefault(key, {})
+                node[keys[-1]] = value
+            records.append(record)
+        return records
+
+
+class GroupStreamParser:
+    """Incremental parser for a /groups/{id} body
+
+    Array elements of the requested top-level keys are decoded one at a time
+    and reduced to the requested field paths; every other nested value is
+    skipped without being decoded. Feed it chunks as they arrive.
+    """
+
+    def __init__(self, fields: Dict[str, Sequence[str]] = GROUP_FIELDS):
+        self.fields = {array: tuple(paths) for array, paths in fields.items()}
+        self.columns = {array: {path: [] for path in paths} for array, paths in self.fields.items()}
+        self.meta: Dict[str, Any] = {}
+
+        self._compiled = {
+            array: [(tuple(path.split('.')), self.columns[array][path]) for path in paths]
+            for array, paths in self.fields.items()
+        }
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._state = 'start'
+        self._key: Optional[str] = None
+        self._skip_depth = 0
+
+    def feed(self, chunk):
+        if isinstance(chunk, bytes):
+            chunk = self._text.decode(chunk)
+        if self._pos > CHUNK_SIZE:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += chunk
+        self._advance(final=False)
+
+    def close(self) -> GroupColumns:
+        self._buf += self._text.decode(b'', final=True)
+        self._advance(final=True)
+        if self._state != 'done':
+            raise ValueError(f"Truncated group payload (stopped in state '{self._state}')")
+        return GroupColumns(self.fields, self.columns, self.meta)
+
+    def _skip_whitespace(self):
+        self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+
+    def _decode(self, final: bool):
+        """Decode one JSON value at the cursor, or return (None, False) if it isn't all here yet"""
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None, False
+        # A value ending exactly at the buffer's end may be a number cut in half
+        if end == len(self._buf) and not final:
+            return None, False
+        self._pos = end
+        return value, True
+
+    def _skip_container(self, final: bool) -> bool:
+        """Skip past a nested object/array without building it"""
+        buf = self._buf
+        while True:
+            match = _SKIP_TOKEN.search(buf, self._pos)
+            if match is None or match.group() == '"':
+                if final:
+                    raise ValueError("Truncated group payload")
+                if match is not None:
+                    self._pos = match.start()
+                else:
+                    self._pos = len(buf)
+                return False
+            token = match.group()
+            self._pos = match.end()
+            if token in '[{':
+                self._skip_depth += 1
+            elif token in ']}':
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    return True
+
+    def _extract(self, array: str, element):
+        for keys, column in self._compiled[array]:
+            value = element
+            for key in keys:
+                if not isinstance(value, dict):
+                    value = None
+                    break
+                value = value.get(key)
+            column.append(value)
+
+    def _advance(self, final: bool):
+        buf_len = len(self._buf)
+        while True:
+            self._skip_whitespace()
+            if self._pos >= buf_len and self._state != 'skip':
+                return
+
+            state = self._state
+            char = self._buf[self._pos] if self._pos < buf_len else ''
+
+            if state == 'start':
+                if char != '{':
+                    raise ValueError("Group payload is not a JSON object")
+                self._pos += 1
+                self._state = 'key'
+
+            elif state == 'key':
+                if char == ',':
+                    self._pos += 1
+                elif char == '}':
+                    self._pos += 1
+                    self._state = 'done'
+                else:
+                    key, complete = self._decode(final)
+                    if not complete:
+                        return
+                    self._key = key
+                    self._state = 'colon'
+
+            elif state == 'colon':
+                if char != ':':
+                    raise ValueError(f"Expected ':' after key {self._key!r}")
+                self._pos += 1
+                self._state = 'value'
+
+            elif state == 'value':
+                if char == '[' and self._key in self._compiled:
+                    self._pos += 1
+                    self._state = 'element'
+                elif char in '[{':
+                    self._state = 'skip'
+                else:
+                    value, complete = self._decode(final)
+                    if not complete:
+                        return
+                    self.meta[self._key] = value
+                    self._state = 'key'
+
+            elif state == 'skip':
+                if not self._skip_container(final):
+                    return
+                self._state = 'key'
+
+            elif state == 'element':
+                if char == ',':
+                    self._pos += 1
+                elif char == ']':
+                    self._pos += 1
+                    self._state = 'key'
+                else:
+                    element, complete = self._decode(final)
+                    if not complete:
+                        return
+                    self._extract(self._key, element)
+
+            elif state == 'done':
+                return
+
+
+def parse_group_stream(chunks: Iterable, fields: Dict[str, Sequence[str]] = GROUP_FIELDS) -> GroupColumns:
+    """Parse an iterable of body chunks (bytes or str) into GroupColumns"""
+    parser = GroupStreamParser(fields)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
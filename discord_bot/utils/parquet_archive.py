@@ -0,0 +1,144 @@
+# File: discord_bot/utils/parquet_archive.py
+
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Bump when the shape of an archived table changes, so every partition is rewritten once
+ARCHIVE_VERSION = 1
+MANIFEST_NAME = '_manifest.json'  # leading underscore: ignored by Parquet dataset discovery
+PART_NAME = 'part-0.parquet'
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('season', pa.string()), ('stage', pa.string()), ('table', pa.string())]),
+    flavor='hive',
+)
+
+
+def partition_slug(value) -> str:
+    """Lowercase, dash-separated form of a name, safe inside a key=value directory"""
+    slug = re.sub(r'[^a-z0-9_]+', '-', str(value).lower()).strip('-')
+    return slug or 'unknown'
+
+
+def fingerprint(parts: Iterable[str]) -> str:
+    """Stable digest of a partition's source identity (replay IDs, group payload, ...)"""
+    digest = hashlib.sha256(f"v{ARCHIVE_VERSION}".encode())
+    for part in parts:
+        digest.update(b'\0')
+        digest.update(str(part).encode())
+    return digest.hexdigest()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Digest of a DataFrame's columns and values"""
+    values = pd.util.hash_pandas_object(df, index=False).values.tobytes() if len(df) else b''
+    return fingerprint([','.join(map(str, df.columns)), hashlib.sha256(values).hexdigest()])
+
+
+class ParquetArchive:
+    """Hive-partitioned (season=/stage=/table=) zstd Parquet archive with a change manifest"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or os.getenv('BLCS_ARCHIVE_DIR', 'data/archive'))
+        self.manifest = self._load_manifest()
+
+    def _manifest_path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        try:
+            with open(self._manifest_path(), 'r') as f:
+                return json.load(f).get('partitions', {})
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._manifest_path().with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': ARCHIVE_VERSION, 'partitions': self.manifest}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._manifest_path())
+
+    @staticmethod
+    def partition_key(season: str, stage: str, table: str) -> str:
+        return f"season={partition_slug(season)}/stage={partition_slug(stage)}/table={partition_slug(table)}"
+
+    def is_current(self, season: str, stage: str, table: str, digest: Optional[str]) -> bool:
+        """True if the partition was last written from the same source data"""
+        entry = self.manifest.get(self.partition_key(season, stage, table))
+        return (digest is not None and entry is not None and entry.get('fingerprint') == digest
+                and (self.root / self.partition_key(season, stage, table) / PART_NAME).exists())
+
+    def write(self, season: str, stage: str, table: str, df: pd.DataFrame,
+              digest: Optional[str] = None, complete: bool = True, force: bool = False) -> bool:
+        """Replace one partition if its fingerprint changed; returns whether it was written
+
+        An incomplete partition (some source rows failed) is written but not
+        fingerprinted, so the next run rewrites it.
+        """
+        digest = digest or frame_fingerprint(df)
+        if complete and not force and self.is_current(season, stage, table, digest):
+            return False
+
+        key = self.partition_key(season, stage, table)
+        directory = self.root / key
+        directory.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = directory / f".{PART_NAME}.tmp"
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression='zstd')
+        os.replace(tmp_path, directory / PART_NAME)
+        for stray in directory.glob('*.parquet'):
+            if stray.name != PART_NAME:
+                stray.unlink()
+
+        self.manifest[key] = {
+            'fingerprint': digest if complete else None,
+            'rows': len(df),
+            'written_at': datetime.utcnow().isoformat(timespec='seconds'),
+        }
+        logger.info(f"Wrote {len(df)} rows to {key}")
+        return True
+
+    def partitions(self, table: str, seasons: Optional[Sequence] = None,
+                   stages: Optional[Sequence] = None) -> List[Path]:
+        """Part files of a table, optionally narrowed to some seasons/stages"""
+        season_set = {partition_slug(s) for s in seasons} if seasons else None
+        stage_set = {partition_slug(s) for s in stages} if stages else None
+        paths = []
+        for path in sorted(self.root.glob(f"season=*/stage=*/table={partition_slug(table)}/*.parquet")):
+            season = path.parts[-4].split('=', 1)[1]
+            stage = path.parts[-3].split('=', 1)[1]
+            if (season_set is None or season in season_set) and (stage_set is None or stage in stage_set):
+                paths.append(path)
+        return paths
+
+    def read(self, table: str, seasons: Optional[Sequence] = None, stages: Optional[Sequence] = None,
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Read one table across partitions; only the requested columns are decoded"""
+        paths = self.partitions(table, seasons, stages)
+        if not paths:
+            return pd.DataFrame(columns=list(columns or []))
+
+        # Partitions written at different times may type an all-null column differently
+        schema = pa.unify_schemas([pq.read_schema(path) for path in paths], promote_options='permissive')
+        for field in PARTITIONING.schema:
+            if schema.get_field_index(field.name) < 0:
+                schema = schema.append(field)
+        dataset = ds.dataset([str(path) for path in paths], schema=schema, format='parquet',
+                             partitioning=PARTITIONING, partition_base_dir=str(self.root))
+        if columns is not None:
+            columns = list(dict.fromkeys(['season', 'stage', *columns]))
+        return dataset.to_table(columns=columns).to_pandas()
@@ -0,0 +1,75 @@
+# File: discord_bot/utils/percentile_index.py
+
+import logging
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stats the cog ranks players by; anything else is indexed on first use
+INDEXED_STATS = (
+    'dominance_quotient', 'avg_score', 'goals_per_game', 'assists_per_game', 'saves_per_game',
+    'shots_per_game', 'shot_percentage', 'avg_speed', 'demos_inflicted_per_game', 'demos_taken_per_game',
+)
+
+
+def _is_missing(value) -> bool:
+    return value is None or value != value  # NaN
+
+
+class _StatColumn:
+    """One stat's values across the league, sorted once"""
+
+    def __init__(self, players: List[Dict], stat_key: str):
+        values = [p.get(stat_key, 0) for p in players if p.get(stat_key) is not None]
+        self.total = len(values)  # before NaNs are dropped, as calculate_percentile counts them
+        self.sorted_values = sorted(v for v in values if not _is_missing(v))
+
+
+class PercentileIndex:
+    """Pre-sorted stat columns answering percentile and rank queries in O(log n)
+
+    Build one per data generation (see DatabaseManager.stats_generation) and
+    reuse it until stats are re-ingested.
+    """
+
+    def __init__(self, players: List[Dict], stat_keys: Iterable[str] = INDEXED_STATS,
+                 generation: Optional[int] = None):
+        self.players = players
+        self.generation = generation
+        self.columns: Dict[str, _StatColumn] = {key: _StatColumn(players, key) for key in stat_keys}
+
+    def _column(self, stat_key: str) -> _StatColumn:
+        column = self.columns.get(stat_key)
+        if column is None:
+            column = self.columns[stat_key] = _StatColumn(self.players, stat_key)
+        return column
+
+    def size(self, stat_key: str) -> int:
+        """Number of players with a value for this stat"""
+        return self._column(stat_key).total
+
+    def percentile(self, stat_key: str, value: float, higher_is_better: bool = True) -> float:
+        """Share of the league this value beats; same result as calculate_percentile"""
+        column = self._column(stat_key)
+        if column.total <= 1 or not column.sorted_values:
+            return 50.0
+        if _is_missing(value):
+            return 0.0
+
+        if higher_is_better:
+            better_count = bisect_left(column.sorted_values, value)
+        else:
+            better_count = len(column.sorted_values) - bisect_right(column.sorted_values, value)
+        return (better_count / len(column.sorted_values)) * 100
+
+    def rank(self, stat_key: str, value: float, higher_is_better: bool = True) -> Optional[int]:
+        """1-based position of the first player with this value, or None if no player has it"""
+        values = self._column(stat_key).sorted_values
+        if _is_missing(value):
+            return None
+        lo = bisect_left(values, value)
+        hi = bisect_right(values, value)
+        if lo == hi:
+            return None
+        return len(values) - hi + 1 if higher_is_better else lo + 1
@@ -0,0 +1,146 @@
+# File: discord_bot/utils/rating_kernel.py
+
+import logging
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def as_float_array(values) -> np.ndarray:
+    """float64 array with None as NaN"""
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def percentile_ranks(values: Sequence[float], pool: Sequence[float], higher_is_better: bool = True) -> np.ndarray:
+    """Share of pool (0-100) each value beats: one sort, then a binary search per value
+
+    NaN/None pool entries are left out of the share but still count towards the
+    one-entry minimum (below it everyone gets 50); a NaN value beats nobody.
+    """
+    values = as_float_array(values)
+    if len(pool) <= 1:
+        return np.full(len(values), 50.0)
+
+    pool = as_float_array(pool)
+    pool = np.sort(pool[~np.isnan(pool)])
+    if not len(pool):
+        return np.full(len(values), 50.0)
+
+    if higher_is_better:
+        better_count = np.searchsorted(pool, values, side='left')
+    else:
+        better_count = len(pool) - np.searchsorted(pool, values, side='right')
+    better_count = np.where(np.isnan(values), 0, better_count)
+    return (better_count / len(pool)) * 100
+
+
+def minmax(matrix: np.ndarray) -> np.ndarray:
+    """Each column scaled to 0-1 between its min and max, NaNs skipped as pandas skips them"""
+    low, high = np.nanmin(matrix, axis=0), np.nanmax(matrix, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (matrix - low) / (high - low)
+
+
+def zscore(matrix: np.ndarray) -> np.ndarray:
+    """Each column as population z-scores (ddof=0), as scipy.stats.zscore computes them"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (matrix - matrix.mean(axis=0)) / matrix.std(axis=0)
+
+
+def percentile(matrix: np.ndarray) -> np.ndarray:
+    """Each entry as the share of its column it beats (0-100)"""
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.ndim == 1:
+        return percentile_ranks(matrix, matrix)
+    return np.column_stack([percentile_ranks(column, column) for column in matrix.T])
+
+
+NORMALIZERS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'minmax': minmax,
+    'zscore': zscore,
+    'percentile': percentile,
+}
+
+
+def sum_columns(contributions: np.ndarray) -> np.ndarray:
+    """Row totals, adding columns left to right
+
+    The same order as pandas' frame.sum(axis=1) and a per-player sum() over the
+    stats, so every caller lands on the same bits.
+    """
+    total = np.zeros(contributions.shape[0])
+    for column in range(contributions.shape[1]):
+        total = total + contributions[:, column]
+    return total
+
+
+class RatingKernel:
+    """Weighted sum of normalized stat columns: the shared core of every DQ/EPI variant
+
+    Works on a (players x stats) matrix with one column per weight, in weight
+    order. normalizer is one of NORMALIZERS; decimals rounds each weighted
+    column before the sum (the pipeline tables publish them rounded); offset and
+    scale map the sum onto the published scale: (sum + offset) * scale.
+    """
+
+    def __init__(self, weights: Dict[str, float], normalizer: str = 'zscore', decimals: Optional[int] = None,
+                 offset: float = 0.0, scale: float = 1.0):
+        if normalizer not in NORMALIZERS:
+            raise ValueError(f"Unknown normalizer {normalizer!r}; expected one of {', '.join(NORMALIZERS)}")
+        self.stat_keys = tuple(weights)
+        self.vector = np.array([weights[stat_key] for stat_key in self.stat_keys], dtype=float)
+        self.normalizer = normalizer
+        self.decimals = decimals
+        self.offset = offset
+        self.scale = scale
+
+    def rate(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Weighted normalized columns and each row's rating"""
+        contributions = NORMALIZERS[self.normalizer](np.asarray(matrix, dtype=float)) * self.vector
+        if self.decimals is not None:
+            contributions = np.round(contributions, self.decimals)
+        return contributions, (sum_columns(contributions) + self.offset) * self.scale
+
+    def rate_frame(self, df: pd.DataFrame, suffix: str = ' Zscore') -> Tuple[pd.DataFrame, pd.Series]:
+        """rate() over the frame's weighted columns; contribution columns are named <column><suffix>"""
+        contributions, ratings = self.rate(df[list(self.stat_keys)].to_numpy(dtype=float))
+        return (pd.DataFrame(contributions, index=df.index, columns=[f"{key}{suffix}" for key in self.stat_keys]),
+                pd.Series(ratings, index=df.index))
+
+
+# Pipeline table columns (scripts/process.py, scripts/playoff_stats.py) and the config weight each is scaled by
+PIPELINE_PLAYER_WEIGHTS = {
+    'Avg Score': 'avg_score',
+    'Goals Per Game': 'goals_per_game',
+    'Assists Per Game': 'assists_per_game',
+    'Saves Per Game': 'saves_per_game',
+    'Shots Per Game': 'shots_per_game',
+    'Demos Inf. Per Game': 'demos_per_games',
+    'Demos Taken Per Game': 'demos_taken_per_game',
+    'Big Boost Stolen': 'count_big_pads_stolen_per_game',
+    'Small Boost Stolen': 'count_small_pads_stolen_per_game',
+}
+PIPELINE_TEAM_WEIGHTS = {
+    'cumulative.win_percentage': 'win_perc_weight',
+    'Goal Diff': 'goal_diff_weight',
+    'Demo Diff': 'demo_diff_weight',
+    'Shots Diff': 'shot_diff_weight',
+}
+
+
+def pipeline_player_kernel(config, normalizer: str, negate: Sequence[str] = ()) -> RatingKernel:
+    """The pipeline tables' player DQ: (sum of 2-place weighted columns + 2) * dominance_quotient_multiplier
+
+    Columns in negate count against the player.
+    """
+    weights = {column: (-1 if column in negate else 1) * getattr(config, key)
+               for column, key in PIPELINE_PLAYER_WEIGHTS.items()}
+    return RatingKernel(weights, normalizer, decimals=2, offset=2, scale=config.dominance_quotient_multiplier)
+
+
+def pipeline_team_kernel(config) -> RatingKernel:
+    """The pipeline tables' unscaled EPI: weighted z-scores of win %, goal, demo and shot differentials"""
+    return RatingKernel({column: getattr(config, key) for column, key in PIPELINE_TEAM_WEIGHTS.items()}, 'zscore')
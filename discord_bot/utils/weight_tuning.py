@@ -0,0 +1,301 @@
+# File: discord_bot/utils/weight_tuning.py
+
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dominance_quotient import DataDrivenDominanceQuotientCalculator
+from .rating_kernel import zscore
+
+logger = logging.getLogger(__name__)
+
+# Archived tables use display column names; the calculator reads extract_player_stats keys
+ARCHIVE_PLAYER_COLUMNS = {
+    'Games': 'games_played',
+    'Avg Score': 'avg_score',
+    'Goals Per Game': 'goals_per_game',
+    'Assists Per Game': 'assists_per_game',
+    'Saves Per Game': 'saves_per_game',
+    'Shots Per Game': 'shots_per_game',
+    'Shooting %': 'shot_percentage',
+}
+# team_weights in main.yaml, in the order EPITuningData stacks their z-scores
+EPI_WEIGHT_KEYS = ('win_perc_weight', 'goal_diff_weight', 'shot_diff_weight', 'demo_diff_weight')
+MIN_OVERLAP = 3  # teams or players two tables must share before a correlation means anything
+
+
+def normalize_name(name) -> str:
+    """Player/team name with case and punctuation dropped ("BUMPING BUFORD'S" == "Bumping Bufords")"""
+    return re.sub(r'[^a-z0-9]+', '', str(name).lower())
+
+
+def _number(value) -> float:
+    """Archived cells like "72%" or "+15" as floats"""
+    if isinstance(value, str):
+        value = value.strip().rstrip('%').lstrip('+')
+    return float(value)
+
+
+def _win_fraction(value) -> float:
+    """A team's Win % as 0-1, whether stored as "72%", 72 or 0.72"""
+    win_rate = _number(value)
+    return win_rate / 100 if win_rate > 1 else win_rate
+
+
+def row_correlations(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pearson correlation of each row of a with the matching row of b (or with b if it's 1-D)
+
+    A row with no spread correlates 0 with everything.
+    """
+    a = a - a.mean(axis=-1, keepdims=True)
+    b = b - b.mean(axis=-1, keepdims=True)
+    denominator = np.sqrt((a * a).sum(axis=-1) * (b * b).sum(axis=-1))
+    numerator = (a * b).sum(axis=-1)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator > 0)
+
+
+class ArchivedSeason:
+    """One season's regular-season tables, and its playoff team results if they were archived"""
+
+    def __init__(self, name: str, players: pd.DataFrame, teams: Optional[pd.DataFrame] = None,
+                 playoff_teams: Optional[pd.DataFrame] = None):
+        self.name = name
+        self.players = players.reset_index(drop=True)
+        self.teams = teams
+        self.playoff_teams = playoff_teams
+
+    @property
+    def player_names(self) -> List[str]:
+        return [normalize_name(name) for name in self.players['Player']]
+
+    @property
+    def player_teams(self) -> Optional[List[str]]:
+        if 'Team' not in self.players:
+            return None
+        return [normalize_name(team) for team in self.players['Team']]
+
+    def player_dicts(self) -> List[Dict]:
+        """Players as calculator input; wins come from the team's Win % when the team table was kept"""
+        win_rates = {}
+        if self.teams is not None:
+            win_rates = {normalize_name(team): _win_fraction(win_rate)
+                         for team, win_rate in zip(self.teams['Team'], self.teams['Win %'])}
+        teams = self.player_teams or [None] * len(self.players)
+
+        players = []
+        for record, team in zip(self.players.to_dict('records'), teams):
+            player = {'player_id': normalize_name(record['Player'])}
+            for column, stat_key in ARCHIVE_PLAYER_COLUMNS.items():
+                if column in record and not pd.isna(record[column]):
+                    player[stat_key] = float(record[column])
+            if team in win_rates and 'games_played' in player:
+                player['wins'] = round(player['games_played'] * win_rates[team])
+            players.append(player)
+        return players
+
+
+def _season_number(path: Path) -> int:
+    return int(re.search(r'season_(\d+)', path.name).group(1))
+
+
+def load_archived_seasons(data_dir: Path) -> List[ArchivedSeason]:
+    """Archived seasons, oldest first
+
+    processed/previous_season_player_data.csv is taken as the season before the
+    earliest parquet/season_<n>_all_data.parquet. Team and playoff tables are
+    picked up by season number when present.
+    """
+    data_dir = Path(data_dir)
+    seasons = []
+    previous_season = data_dir / 'processed' / 'previous_season_player_data.csv'
+    if previous_season.exists():
+        seasons.append(ArchivedSeason('previous_season', pd.read_csv(previous_season)))
+
+    parquet_dir = data_dir / 'parquet'
+    for path in sorted(parquet_dir.glob('season_*_all_data.parquet'), key=_season_number):
+        season = _season_number(path)
+        teams = parquet_dir / f'season_{season}_team_data.parquet'
+        playoff_teams = parquet_dir / f'playoff_team_data_season_{season}.parquet'
+        seasons.append(ArchivedSeason(
+            f'season_{season}',
+            pd.read_parquet(path),
+            pd.read_parquet(teams) if teams.exists() else None,
+            pd.read_parquet(playoff_teams) if playoff_teams.exists() else None,
+        ))
+    logger.info(f"Loaded archived seasons: {', '.join(season.name for season in seasons)}")
+    return seasons
+
+
+def _playoff_target(season: ArchivedSeason, teams: Sequence[str]) -> Optional[Tuple[List[str], np.ndarray]]:
+    """Teams present in both tables and their playoff win fractions"""
+    if season.playoff_teams is None:
+        return None
+    playoff = {normalize_name(team): _win_fraction(win_rate)
+               for team, win_rate in zip(season.playoff_teams['Team'], season.playoff_teams['Win %'])}
+    shared = [team for team in dict.fromkeys(teams) if team in playoff]
+    if len(shared) < MIN_OVERLAP:
+        return None
+    return shared, np.array([playoff[team] for team in shared])
+
+
+class DQTuningData:
+    """Archived seasons reduced to what a DQ weight set is judged on
+
+    Percentiles, tournament factors and consistency bonuses don't depend on the
+    weights, so they are computed once per season; scoring K weight sets is then
+    one (K x stats) @ (stats x players) product per season. Objectives, each a
+    Pearson correlation, averaged into one score:
+
+    - playoff:<season>: team mean regular-season DQ vs the team's playoff win rate
+    - stability:<a>-><b>: a player's DQ in one season vs the next (skill should persist)
+    """
+
+    def __init__(self, seasons: List[ArchivedSeason],
+                 calculator: Optional[DataDrivenDominanceQuotientCalculator] = None):
+        self.calculator = calculator or DataDrivenDominanceQuotientCalculator()
+        self.stat_keys = self.calculator.weights.stat_keys
+        self.base_weights = self.calculator.weights.vector.copy()
+        self.season_names = []
+        self.percentiles: List[np.ndarray] = []
+        self.factors: List[np.ndarray] = []
+        self.objective_names: List[str] = []
+        self._playoff: List[Tuple[int, np.ndarray, np.ndarray]] = []   # season, membership, win rates
+        self._stability: List[Tuple[int, int, np.ndarray, np.ndarray]] = []  # seasons, matched players
+
+        for season in seasons:
+            players = season.player_dicts()
+            tournament_factor, consistency_bonus = self.calculator.adjustment_factors(players)
+            self.season_names.append(season.name)
+            self.percentiles.append(self.calculator.percentile_matrix(players))
+            self.factors.append(tournament_factor * consistency_bonus)
+
+        for index, season in enumerate(seasons):
+            teams = season.player_teams
+            target = _playoff_target(season, teams) if teams else None
+            if target is None:
+                continue
+            shared, win_rates = target
+            # Column j averages the DQs of team j's players
+            membership = np.array([[team == shared_team for shared_team in shared] for team in teams], dtype=float)
+            membership /= membership.sum(axis=0)
+            self._playoff.append((index, membership, win_rates))
+            self.objective_names.append(f'playoff:{season.name}')
+
+        for index in range(1, len(seasons)):
+            earlier = {name: row for row, name in enumerate(seasons[index - 1].player_names)}
+            pairs = [(earlier[name], row) for row, name in enumerate(seasons[index].player_names) if name in earlier]
+            if len(pairs) < MIN_OVERLAP:
+                continue
+            before, after = (np.array(rows) for rows in zip(*pairs))
+            self._stability.append((index - 1, index, before, after))
+            self.objective_names.append(f'stability:{seasons[index - 1].name}->{seasons[index].name}')
+
+        if not self.objective_names:
+            raise ValueError("No archived season has playoff results or returning players to tune against")
+        # A stat no archived player has (every percentile 50) says nothing about anyone: keep its weight
+        self.tunable = np.array([any(np.ptp(p[row]) > 0 for p in self.percentiles)
+                                 for row in range(len(self.stat_keys))])
+
+    def dominance_quotients(self, weight_sets: np.ndarray) -> List[np.ndarray]:
+        """Per season, a (K x players) array of DQs; floating-point close to calculate_all"""
+        return [np.clip((weight_sets @ percentiles) * factors, 0, 100)
+                for percentiles, factors in zip(self.percentiles, self.factors)]
+
+    def objectives(self, weight_sets: np.ndarray) -> np.ndarray:
+        """(K x objectives) correlations, in objective_names order"""
+        weight_sets = np.atleast_2d(weight_sets)
+        dqs = self.dominance_quotients(weight_sets)
+        columns = [row_correlations(dqs[season] @ membership, win_rates)
+                   for season, membership, win_rates in self._playoff]
+        columns += [row_correlations(dqs[earlier][:, before], dqs[later][:, after])
+                    for earlier, later, before, after in self._stability]
+        return np.column_stack(columns)
+
+    def score(self, weight_sets: np.ndarray) -> np.ndarray:
+        return self.objectives(weight_sets).mean(axis=1)
+
+    def as_config(self, weights: np.ndarray) -> Dict:
+        """The calculator's dominance_quotient section with these stat weights"""
+        return {'dominance_quotient': {
+            'stat_weights': {stat_key: float(weight) for stat_key, weight in zip(self.stat_keys, weights)},
+            'tournament_config': dict(self.calculator.tournament_config),
+            'performance_benchmarks': dict(self.calculator.performance_benchmarks),
+        }}
+
+
+class EPITuningData:
+    """Regular-season team tables reduced to what an EPI weight set is judged on
+
+    EPI is a weighted sum of z-scored win %, goal diff, shot diff and demo ratio
+    (see scripts/process.py); each season with playoff results contributes one
+    objective, the correlation of regular-season EPI with playoff win rate.
+    """
+
+    def __init__(self, seasons: List[ArchivedSeason], team_weights: Dict[str, float]):
+        self.stat_keys = EPI_WEIGHT_KEYS
+        self.team_weights = dict(team_weights)
+        self.base_weights = np.array([team_weights[key] for key in EPI_WEIGHT_KEYS], dtype=float)
+        self.objective_names: List[str] = []
+        self._seasons: List[Tuple[np.ndarray, np.ndarray]] = []  # z-score matrix, playoff win rates
+
+        for season in seasons:
+            if season.teams is None:
+                continue
+            teams = [normalize_name(team) for team in season.teams['Team']]
+            target = _playoff_target(season, teams)
+            if target is None:
+                continue
+            shared, win_rates = target
+            rows = [teams.index(team) for team in shared]
+            table = season.teams
+            # z-scored across the whole regular season, then restricted to playoff teams;
+            # a column with no spread scores everyone 0
+            zscores = np.nan_to_num(zscore(np.column_stack([
+                table['Win %'].map(_win_fraction).to_numpy(float),
+                table['Goal Diff'].map(_number).to_numpy(float),
+                table['Shot Diff'].map(_number).to_numpy(float),
+                table['Demos Inflicted'].to_numpy(float) / table['Demos Taken'].to_numpy(float),
+            ]))).T[:, rows]
+            self._seasons.append((zscores, win_rates))
+            self.objective_names.append(f'playoff:{season.name}')
+
+        if not self._seasons:
+            raise ValueError("No archived season has both a regular-season team table and playoff results")
+        self.tunable = np.array([any(np.ptp(z[row]) > 0 for z, _ in self._seasons)
+                                 for row in range(len(self.stat_keys))])
+
+    def objectives(self, weight_sets: np.ndarray) -> np.ndarray:
+        weight_sets = np.atleast_2d(weight_sets)
+        return np.column_stack([row_correlations(weight_sets @ zscores, win_rates)
+                                for zscores, win_rates in self._seasons])
+
+    def score(self, weight_sets: np.ndarray) -> np.ndarray:
+        return self.objectives(weight_sets).mean(axis=1)
+
+    def as_config(self, weights: np.ndarray) -> Dict:
+        """main.yaml's team_weights section with these weights (untuned keys kept)"""
+        team_weights = dict(self.team_weights)
+        team_weights.update({key: float(weight) for key, weight in zip(self.stat_keys, weights)})
+        return {'team_weights': team_weights}
+
+
+def sample_weight_sets(rng: np.random.Generator, base: np.ndarray, tunable: np.ndarray, count: int,
+                       center: Optional[np.ndarray] = None, concentration: float = 1.0) -> np.ndarray:
+    """count weight sets with the same total as base; untunable weights keep their base value
+
+    Without a center, tunable weights are spread uniformly over the simplex; with
+    one, they are drawn around it (higher concentration = closer).
+    """
+    budget = base.sum() - base[~tunable].sum()
+    if center is None:
+        alpha = np.ones(tunable.sum())
+    else:
+        alpha = concentration * center[tunable] / max(center[tunable].sum(), 1e-12) + 1e-3
+    weight_sets = np.tile(base, (count, 1))
+    weight_sets[:, tunable] = rng.dirichlet(alpha, size=count) * budget
+    return weight_sets
@@ -1,6 +1,7 @@
 package main
 
 import (
+	"context"
 	"encoding/json"
 	"fmt"
 	"io"
@@ -56,6 +57,7 @@ type Replay struct {
 type ReplayList struct {
 	List []Replay `json:"list"`
 	Count int     `json:"count"`
+	Next  string  `json:"next"`
 }
 
 // Player represents a player in a replay
@@ -109,7 +111,17 @@ func (c *Client) makeRequest(endpoint string, params url.Values) ([]byte, error)
 		reqURL += "?" + params.Encode()
 	}
 
-	req, err := http.NewRequest("GET", reqURL, nil)
+	return c.getURL(reqURL)
+}
+
+// getURL performs an authenticated GET against a fully-formed URL
+func (c *Client) getURL(reqURL string) ([]byte, error) {
+	return c.getURLContext(context.Background(), reqURL)
+}
+
+// getURLContext is getURL with a context that can abort the request in flight
+func (c *Client) getURLContext(ctx context.Context, reqURL string) ([]byte, error) {
+	req, err := http.NewRequestWithContext(ctx, "GET", reqURL, nil)
 	if err != nil {
 		return nil, fmt.Errorf("creating request: %w", err)
 	}
@@ -157,6 +169,59 @@ func (c *Client) GetReplays(params map[string]string) (*ReplayList, error) {
 	return &replays, nil
 }
 
+// StreamReplays follows the API's `next` cursor and sends each page of replays
+// on the returned channel. The next page is fetched while the caller is still
+// working on the current one; the error channel receives at most one error.
+// Cancel ctx to stop early: the goroutine stops prefetching, aborts any request
+// in flight and exits, and ctx.Err() is sent as the error.
+func (c *Client) StreamReplays(ctx context.Context, params map[string]string) (<-chan []Replay, <-chan error) {
+	pages := make(chan []Replay, 1)
+	errs := make(chan error, 1)
+
+	urlParams := url.Values{}
+	for k, v := range params {
+		urlParams.Set(k, v)
+	}
+	next := fmt.Sprintf("%s/replays?%s", BaseURL, urlParams.Encode())
+
+	go func() {
+		defer close(pages)
+		defer close(errs)
+
+		for next != "" {
+			if err := ctx.Err(); err != nil {
+				errs <- err
+				return
+			}
+
+			data, err := c.getURLContext(ctx, next)
+			if err != nil {
+				if ctx.Err() != nil {
+					// Aborted mid-request: report the cancellation, not the transport error
+					err = ctx.Err()
+				}
+				errs <- err
+				return
+			}
+			var page ReplayList
+			if err := json.Unmarshal(data, &page); err != nil {
+				errs <- fmt.Errorf("unmarshaling replays: %w", err)
+				return
+			}
+
+			select {
+			case pages <- page.List:
+			case <-ctx.Done():
+				errs <- ctx.Err()
+				return
+			}
+			next = page.Next
+		}
+	}()
+
+	return pages, errs
+}
+
 // GetReplay fetches detailed information about a specific replay
 func (c *Client) GetReplay(replayID string) (*ReplayDetails, error) {
 	endpoint := fmt.Sprintf("/replays/%s", replayID)
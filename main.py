@@ -11,9 +11,15 @@ from models.repositories import (
     TournamentRepository
 )
 from scripts.ballchasing_service import BallchasingService
+from utils.ballchasing_api import close_ballchasing_client
 
 app = FastAPI(title="Rocket League Management System")
 
+@app.on_event("shutdown")
+async def shutdown_ballchasing_client():
+    # Every request shares one pooled ballchasing session; release it on exit
+    await close_ballchasing_client()
+
 # Get repositories
 def get_player_repo():
     return PlayerRepository()
@@ -9,6 +9,12 @@ sys.path.append(os.path.abspath("../config"))
 
 from config import Config
 
+try:
+    from discord_bot.utils.group_cache import fetch_group_payload
+except ImportError:
+    # Inside the bot image discord_bot/ is the application root
+    from utils.group_cache import fetch_group_payload
+
 config = Config()
 db = Database()
 
@@ -27,13 +33,8 @@ def fetch_player_data(group_id=config.current_group_id, token=config._ballchasin
     Returns:
     pd.DataFrame: A DataFrame containing normalized player data.
     """
-    url = f"https://ballchasing.com/api/groups/{group_id}"
-    headers = {"Authorization": token}
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    
-    # Parse JSON response and normalize into a DataFrame
-    data = response.json()
+    # Revalidates against the on-disk cache, so an unchanged group is a 304
+    data = fetch_group_payload(group_id, token)
     df = pd.json_normalize(data, record_path=["players"])
     
     return df